@@ -0,0 +1,311 @@
+# -*- coding: utf-8 -*-
+"""
+BENCHMARK SUITE (Offline, repeatable timings + memory for the pipeline scripts)
+Each stage runs in a fresh interpreter against the workbooks checked into this
+repository (downloads are served from disk), so results compare across commits.
+Results are appended to benchmark_results.json under a label.
+
+Usage:
+    python benchmark.suite.english.py memory [label] [--rev <git revision>] [--trace]
+    python benchmark.suite.english.py scaling [label] [--sizes 30x20x60,120x100x250] [--charts]
+    python benchmark.suite.english.py startup [label] [--repeats 7]
+    python benchmark.suite.english.py report
+"""
+
+import io
+import os
+import re
+import sys
+import json
+import tarfile
+import tempfile
+import runpy
+import subprocess
+from datetime import datetime
+
+# --- 1. CONFIGURATION ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(SCRIPT_DIR)        # The input workbooks live in the repo root
+RESULTS_OUT = "benchmark_results.json"
+LOADER = "excel.loader.preparer.english.py"
+PLOT_MAKER = "plot.maker.2.7.english.py"
+GENERATOR = "synthetic.workbooks.english.py"
+CATALOG = "series.catalog.english.py"
+STYLE = "chart.style.english.py"
+# Loaders older than LOADER_OUTPUT_DIR hard-code their output directory on this line
+OUTPUT_DIR_RE = re.compile(r'^OUTPUT_DIR = (["\'][^"\']*["\'])', re.MULTILINE)
+STARTUP_REPEATS = 7     # Fresh interpreters per startup mode; the median is reported
+# files x series per file x dates; the largest default is ~12M cells
+SCALING_SIZES = "30x20x60,60x50x120,120x100x250,240x100x500"
+
+# Runs inside the child interpreter: serves every download from REPO_DIR,
+# runs the script as __main__ and prints one JSON line with the measurements.
+BOOTSTRAP = r'''
+import io, os, sys, json, time, runpy, urllib.parse, urllib.request
+spec = json.loads(sys.argv.pop(1))
+if spec["trace"]:
+    import tracemalloc
+    tracemalloc.start()
+
+class _LocalResponse(io.BytesIO):
+    status = 200
+    def __enter__(self): return self
+    def __exit__(self, *exc): self.close()
+
+def _local_urlopen(req, timeout=None):
+    url = getattr(req, "full_url", req)
+    name = urllib.parse.unquote(urllib.parse.urlparse(url).path.rsplit("/", 1)[-1])
+    with open(os.path.join(spec["inputs"], name), "rb") as f:
+        return _LocalResponse(f.read())
+
+urllib.request.urlopen = _local_urlopen
+os.chdir(spec["cwd"])
+sys.argv = [spec["script"]] + spec["args"]
+t0 = time.perf_counter()
+g = {}
+try:
+    g = runpy.run_path(spec["script"], run_name="__main__")
+except SystemExit:
+    pass
+result = {"wall_s": time.perf_counter() - t0, "live_blocks": sys.getallocatedblocks()}
+if g.get("PHASE_TIMES"):
+    result["phases"] = g["PHASE_TIMES"]
+try:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    result["peak_rss_mb"] = rss / 1e6 if sys.platform == "darwin" else rss / 1e3
+except ImportError:
+    pass
+if spec["trace"]:
+    snap = tracemalloc.take_snapshot()
+    result["traced_peak_mb"] = tracemalloc.get_traced_memory()[1] / 1e6
+    result["traced_blocks"] = sum(s.count for s in snap.statistics("filename"))
+print("__BENCH__" + json.dumps(result))
+'''
+
+# Chart-script startup: matplotlib import, style setup and the first draw of the
+# title/label/citation fonts. 'inline' is the per-script rcParams block with the
+# full serif chain, 'cached' goes through chart.style.english.py.
+STARTUP_PROBE = r'''
+import os, sys, time
+t0 = time.perf_counter()
+import matplotlib
+import matplotlib.pyplot as plt
+t1 = time.perf_counter()
+import runpy
+style = runpy.run_path(os.path.join(sys.argv[2], "chart.style.english.py"))
+if sys.argv[1] == "inline":
+    plt.style.use("default")
+    plt.rcParams.update(dict(style["RC_PARAMS"], **{"font.serif": style["SERIF_CHAIN"]}))
+else:
+    style["apply_style"]()
+t2 = time.perf_counter()
+fig, ax = plt.subplots(figsize=(12, 8))
+ax.plot([0, 1], [0, 1])
+ax.set_title("Title", fontsize=24, fontfamily="serif", fontweight="bold")
+ax.set_xlabel("Label", style="italic")
+fig.text(0.1, 0.17, "Source: citation", fontsize=10, fontfamily="serif")
+fig.canvas.draw()
+t3 = time.perf_counter()
+PHASE_TIMES = {"import": t1 - t0, "style": t2 - t1, "first_draw": t3 - t2}
+'''
+
+# === 2. RUNNER ===
+
+def run_stage(script, cwd, args=(), trace=False, env=None, inputs=REPO_DIR):
+    """Runs one script in a fresh interpreter and returns its measurements."""
+    spec = {"script": script, "cwd": cwd, "args": list(args), "trace": trace, "inputs": inputs}
+    child_env = dict(os.environ, MPLBACKEND="Agg", **(env or {}))
+    proc = subprocess.run([sys.executable, "-c", BOOTSTRAP, json.dumps(spec)],
+                          capture_output=True, text=True, env=child_env)
+    lines = [l for l in proc.stdout.splitlines() if l.startswith("__BENCH__")]
+    if not lines:
+        tail = "\n".join((proc.stderr or proc.stdout).splitlines()[-15:])
+        raise RuntimeError(f"{os.path.basename(script)} produced no measurements:\n{tail}")
+    return json.loads(lines[-1][len("__BENCH__"):])
+
+def scripts_at(rev, dest):
+    """
+    Exports scripts/ as of a git revision, for before/after comparisons. A loader that
+    predates LOADER_OUTPUT_DIR is patched to read it, so an old revision writes into
+    the benchmark's temp directory instead of its hard-coded OUTPUT_DIR.
+    """
+    blob = subprocess.run(["git", "-C", REPO_DIR, "archive", rev, "scripts"],
+                          capture_output=True, check=True).stdout
+    with tarfile.open(fileobj=io.BytesIO(blob)) as tar:
+        tar.extractall(dest)
+    scripts_dir = os.path.join(dest, "scripts")
+    loader = os.path.join(scripts_dir, LOADER)
+    if os.path.exists(loader):
+        with open(loader, encoding="utf-8") as f:
+            source = f.read()
+        if "LOADER_OUTPUT_DIR" not in source:
+            source, n = OUTPUT_DIR_RE.subn(r'OUTPUT_DIR = os.environ.get("LOADER_OUTPUT_DIR", \1)', source, count=1)
+            if not n:
+                raise SystemExit(f"{LOADER} at {rev} does not read LOADER_OUTPUT_DIR and has no "
+                                 f"OUTPUT_DIR line to redirect; refusing to run it.")
+            with open(loader, "w", encoding="utf-8") as f:
+                f.write(source)
+    return scripts_dir
+
+def git_rev(rev="HEAD"):
+    try:
+        out = subprocess.run(["git", "-C", REPO_DIR, "rev-parse", "--short", rev],
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+# === 3. SUITES ===
+
+def memory_suite(scripts_dir, trace=False, options=()):
+    """Full loader run on the repo inputs, then the Annual chart pack on its outputs."""
+    results = {}
+    with tempfile.TemporaryDirectory() as out_dir:
+        env = {"LOADER_OUTPUT_DIR": out_dir + os.sep}
+        for stage, script, args in [("loader", LOADER, []), ("plot_maker", PLOT_MAKER, ["Annual"])]:
+            print(f"⏱️  {stage} ...", flush=True)
+            results[stage] = run_stage(os.path.join(scripts_dir, script), out_dir, args, trace, env)
+    return results
+
+def scaling_suite(scripts_dir, trace=False, options=()):
+    """
+    Loader runs on synthetic workbook sets of growing size (and optionally the
+    series catalog renderer on each result). Stage keys are the sizes.
+    """
+    options = list(options)
+    sizes = options[options.index("--sizes") + 1] if "--sizes" in options else SCALING_SIZES
+    generator = runpy.run_path(os.path.join(SCRIPT_DIR, GENERATOR))
+    results = {}
+    for size in sizes.split(","):
+        n_files, n_series, n_dates = (int(x) for x in size.split("x"))
+        with tempfile.TemporaryDirectory() as inputs, tempfile.TemporaryDirectory() as out_dir:
+            print(f"⏱️  {size}: generating ...", flush=True)
+            generator["generate"](inputs, n_files, n_series, n_dates)
+            env = {"LOADER_OUTPUT_DIR": out_dir + os.sep, "LOADER_FILENAMES": os.path.join(inputs, "filenames.txt")}
+            print(f"⏱️  {size}: loader ...", flush=True)
+            res = run_stage(os.path.join(scripts_dir, LOADER), out_dir, [], trace, env, inputs)
+            res["cells"] = n_files * n_series * n_dates
+            results[size] = res
+            if "--charts" in options:
+                print(f"⏱️  {size}: series catalog ...", flush=True)
+                res = run_stage(os.path.join(scripts_dir, CATALOG), out_dir,
+                                ["all", "--out", os.path.join(out_dir, "catalog")], trace, env, inputs)
+                res["cells"] = n_files * n_series * n_dates
+                results[f"{size} charts"] = res
+    return results
+
+def startup_suite(scripts_dir, trace=False, options=()):
+    """
+    Median of several fresh-interpreter runs of the chart startup probe per mode.
+    The first 'cached' run refreshes the font cache, so the timed runs read it.
+    """
+    options = list(options)
+    repeats = int(options[options.index("--repeats") + 1]) if "--repeats" in options else STARTUP_REPEATS
+    if not os.path.exists(os.path.join(scripts_dir, STYLE)):
+        raise SystemExit(f"{STYLE} is not in {scripts_dir}; the startup suite needs it.")
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        probe = os.path.join(tmp, "startup_probe.py")
+        with open(probe, "w", encoding="utf-8") as f:
+            f.write(STARTUP_PROBE)
+        run_stage(probe, tmp, ["cached", scripts_dir])
+        for mode in ("inline", "cached"):
+            print(f"⏱️  startup ({mode}) x{repeats} ...", flush=True)
+            runs = [run_stage(probe, tmp, [mode, scripts_dir], trace) for _ in range(repeats)]
+            median = lambda values: sorted(values)[len(values) // 2]
+            res = {m: median([r[m] for r in runs if m in r]) for m in runs[0] if m != "phases"}
+            res["phases"] = {ph: median([r["phases"][ph] for r in runs]) for ph in runs[0]["phases"]}
+            res["wall_s"] = sum(res["phases"].values())
+            results[mode] = res
+    return results
+
+def plot_scaling(record, path="Chart_Scaling.png"):
+    # Log-log wall time per loader phase against panel cells: the steepest line is what breaks first
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    runs = [(res["cells"], res) for key, res in record["results"].items() if "charts" not in key]
+    if len(runs) < 2:
+        return None
+    runs.sort(key=lambda t: t[0])
+    cells = [c for c, _ in runs]
+    fig, ax = plt.subplots(figsize=(12, 8))
+    ax.plot(cells, [r["wall_s"] for _, r in runs], marker="o", linewidth=3, color="black", label="loader total")
+    for phase in dict.fromkeys(p for _, r in runs for p in r.get("phases", {})):
+        ax.plot(cells, [r.get("phases", {}).get(phase, float("nan")) for _, r in runs], marker="o", label=phase)
+    charts = sorted((res["cells"], res["wall_s"]) for key, res in record["results"].items() if "charts" in key)
+    if charts:
+        ax.plot(*zip(*charts), marker="s", linestyle="--", label="series catalog")
+    ax.set_xscale("log")
+    ax.set_yscale("log")
+    ax.set_xlabel("Cells (files x series x dates)")
+    ax.set_ylabel("Seconds")
+    ax.set_title(f"Pipeline scaling ({record['label']})")
+    ax.legend()
+    fig.savefig(path, dpi=150, bbox_inches="tight")
+    plt.close(fig)
+    return path
+
+SUITES = {"memory": memory_suite, "scaling": scaling_suite, "startup": startup_suite}
+
+# === 4. RESULTS ===
+
+def load_results(path=RESULTS_OUT):
+    try:
+        with open(path, encoding="utf-8") as f: return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+def save_results(records, path=RESULTS_OUT):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(records, f, ensure_ascii=False, indent=1)
+
+def report(records, suite=None):
+    # One row per label and stage; the first run of each suite (traced or not) is the reference
+    metrics = ["wall_s", "peak_rss_mb", "traced_peak_mb", "traced_blocks", "live_blocks"]
+    groups = dict.fromkeys((r["suite"], r.get("trace", False)) for r in records if suite in (None, r["suite"]))
+    for name, traced in groups:
+        rows = [r for r in records if r["suite"] == name and r.get("trace", False) == traced]
+        ref = rows[0]["results"]
+        print(f"\n=== {name}{' (traced)' if traced else ''}, reference: {rows[0]['label']} ===")
+        print(f"{'label':<16}{'stage':<18}" + "".join(f"{m:>18}" for m in metrics))
+        for r in rows:
+            for stage, res in r["results"].items():
+                cells = []
+                for m in metrics:
+                    v, base = res.get(m), ref.get(stage, {}).get(m)
+                    if v is None:
+                        cells.append(f"{'-':>18}")
+                    elif base and r is not rows[0]:
+                        cells.append(f"{v:>10.1f} ({(v / base - 1) * 100:+4.0f}%)")
+                    else:
+                        cells.append(f"{v:>18.1f}")
+                print(f"{r['label']:<16}{stage:<18}" + "".join(cells))
+
+# === 5. MAIN ===
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    cmd = args.pop(0) if args else "report"
+    trace = "--trace" in args
+    rev = args[args.index("--rev") + 1] if "--rev" in args else None
+    positional = [a for i, a in enumerate(args)
+                  if not a.startswith("--") and (i == 0 or args[i - 1] not in ("--rev", "--sizes", "--repeats"))]
+
+    if cmd == "report":
+        report(load_results())
+    elif cmd in SUITES:
+        label = positional[0] if positional else (rev or "working-tree")
+        with tempfile.TemporaryDirectory() as tmp:
+            scripts_dir = scripts_at(rev, tmp) if rev else SCRIPT_DIR
+            results = SUITES[cmd](scripts_dir, trace=trace, options=args)
+        records = load_results()
+        records.append({"suite": cmd, "label": label, "rev": git_rev(rev or "HEAD"), "trace": trace,
+                        "run": datetime.now().isoformat(timespec="seconds"), "results": results})
+        save_results(records)
+        report(records, suite=cmd)
+        if cmd == "scaling" and plot_scaling(records[-1]):
+            print("📈 Scaling curves saved: Chart_Scaling.png")
+    else:
+        sys.exit(__doc__)
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+CHART STYLE ("Classic Luxury" palette + rcParams, fonts resolved once per host)
+The serif chain is looked up against matplotlib's font list once and the result
+is cached next to matplotlib's own font cache, so chart scripts apply the style
+without probing missing families on every run. A metric-compatible Times New
+Roman substitute is used where the original is not installed, and any .ttf/.otf
+dropped into fonts/ at the repo root is registered first.
+
+Usage (from a chart script):
+    style = runpy.run_path(os.path.join(SCRIPT_DIR, "chart.style.english.py"))
+    CLASSIC_COLORS = style["apply_style"]()
+
+    python chart.style.english.py [--refresh]     # show (or re-resolve) the font set
+"""
+
+import os
+import sys
+import json
+import time
+import matplotlib
+import matplotlib.pyplot as plt
+from matplotlib import font_manager
+
+# --- 1. CONFIGURATION ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+FONT_DIR = os.path.join(os.path.dirname(SCRIPT_DIR), 'fonts')   # Optional bundled fonts
+CACHE_PATH = os.path.join(matplotlib.get_cachedir(), 'classic_style_fonts.json')
+
+SERIF_CHAIN = ['Times New Roman', 'DejaVu Serif', 'Garamond']
+# Same advance widths as Times New Roman, so wrapped citations break at the same words
+METRIC_COMPATIBLE = {'Times New Roman': ['Liberation Serif', 'TeX Gyre Termes', 'Nimbus Roman', 'Tinos']}
+
+CLASSIC_COLORS = {
+    'navy': '#002E5D',
+    'burgundy': '#800020',
+    'gold': '#C5A059',
+    'forest': '#2E4600',
+    'slate': '#4B5358',
+    'teal': '#006666',
+    'rust': '#8B3A3A',
+    'olive': '#556B2F',
+    'sand': '#E6DCC3',
+    'bg': '#FDFBF7',
+    'grid': '#DCDCDC',
+    'highlight': '#FF0000'
+}
+
+RC_PARAMS = {
+    'font.family': 'serif',
+    'font.size': 14,
+    'axes.facecolor': CLASSIC_COLORS['bg'],
+    'figure.facecolor': CLASSIC_COLORS['bg'],
+    'axes.edgecolor': 'black',
+    'axes.grid': True,
+    'grid.alpha': 0.5,
+    'grid.color': CLASSIC_COLORS['grid'],
+    'grid.linestyle': '--',
+    'axes.titlesize': 22,
+    'axes.titleweight': 'bold',
+    'axes.labelsize': 14,
+    'text.color': 'black',
+    'axes.labelcolor': 'black',
+    'xtick.color': 'black',
+    'ytick.color': 'black',
+    'lines.linewidth': 2.5
+}
+
+# === 2. FONT RESOLUTION ===
+
+def bundled_fonts():
+    if not os.path.isdir(FONT_DIR):
+        return []
+    return sorted(os.path.join(FONT_DIR, f) for f in os.listdir(FONT_DIR)
+                  if f.lower().endswith(('.ttf', '.otf')))
+
+def _cache_key(chain, bundled):
+    # Changes whenever matplotlib rebuilds its font list or the bundled set changes
+    fmcache = os.path.join(matplotlib.get_cachedir(), f"fontlist-v{font_manager.FontManager.__version__}.json")
+    stamp = os.path.getmtime(fmcache) if os.path.exists(fmcache) else None
+    return json.dumps([matplotlib.__version__, chain, stamp,
+                       [(f, os.path.getsize(f)) for f in bundled]])
+
+def _lookup(chain):
+    # Only families that exist, in order; a substitute takes the place of a missing original
+    found = {}
+    for family in chain:
+        for name in [family] + METRIC_COMPATIBLE.get(family, []):
+            try:
+                found[name] = font_manager.findfont(font_manager.FontProperties(family=name),
+                                                    fallback_to_default=False)
+                break
+            except ValueError:
+                continue
+    return found
+
+def resolve_fonts(chain=SERIF_CHAIN, refresh=False):
+    """
+    Available serif families for the chain (e.g. ['Liberation Serif', 'DejaVu Serif']),
+    read from the cache when matplotlib's font list has not changed since the last lookup.
+    """
+    bundled = bundled_fonts()
+    for path in bundled:
+        font_manager.fontManager.addfont(path)
+    key = _cache_key(chain, bundled)
+    if not refresh:
+        try:
+            with open(CACHE_PATH, encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached['key'] == key and all(os.path.exists(p) for p in cached['fonts'].values()):
+                return list(cached['fonts'])
+        except (OSError, ValueError, KeyError):
+            pass
+
+    found = _lookup(chain)
+    try:
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        with open(CACHE_PATH, 'w', encoding='utf-8') as f:
+            json.dump({'key': key, 'fonts': found}, f, ensure_ascii=False)
+    except OSError:
+        pass  # Read-only cache dir: resolve again next time
+    return list(found)
+
+# === 3. APPLY ===
+
+def apply_style(refresh=False):
+    """Resets matplotlib to defaults, applies the Classic Luxury rcParams and returns the palette."""
+    plt.style.use('default')
+    # DejaVu Serif ships with matplotlib, so the list is never empty in practice
+    serif = resolve_fonts(refresh=refresh) or ['DejaVu Serif']
+    plt.rcParams.update(dict(RC_PARAMS, **{'font.serif': serif}))
+    return dict(CLASSIC_COLORS)
+
+# === 4. MAIN ===
+
+if __name__ == "__main__":
+    refresh = '--refresh' in sys.argv
+    t0 = time.perf_counter()
+    fonts = resolve_fonts(refresh=refresh)
+    print(f"🔤 Serif set {'resolved' if refresh else 'loaded'} in {(time.perf_counter() - t0) * 1000:.1f} ms "
+          f"(cache: {CACHE_PATH})")
+    for name in fonts:
+        print(f"    {name}: {font_manager.findfont(font_manager.FontProperties(family=name))}")
+    for path in bundled_fonts():
+        print(f"    bundled: {path}")
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+CITATION (Series names and the source line printed under every chart)
+One implementation shared by the plot maker, the series catalog and the scripts
+that borrow the catalog's helpers (dashboard export, debt Monte Carlo), so a
+series is named and cited the same way on paper, in previews and in the browser.
+
+Usage (from a chart script):
+    CITATION = runpy.run_path(os.path.join(SCRIPT_DIR, "citation.english.py"))
+    text = CITATION["build_citation"]([col_debt_gdp, col_nom_gdp], note="2025-2034 simulated")
+"""
+
+import re
+
+# === 1. CLEANING & CITATION LOGIC (FIXED FOR -1 and NEGATIVE PARENS) ===
+
+def clean_series_name(name):
+    """
+    Robust cleaning for citation strings.
+    1. Removes metadata like (annual data...).
+    2. Removes artifacts like .1
+    3. Removes specific suffix '-1' if at the end or before a pipe.
+    4. Removes numeric values in parentheses (e.g., (-0.19))
+    """
+    if not name or not isinstance(name, str):
+        return ""
+
+    # 1. Normalize underscores to spaces
+    name = name.replace('_', ' ')
+    name = name.strip()
+
+    # 2. Remove Pandas duplicates (Variable.1, Variable.2) at the end
+    name = re.sub(r'\.\d+$', '', name)
+
+    # 3. Remove "annual data" metadata specific to this dataset
+    name = re.sub(r'\s*\(annual[ _]data[^)]*\)', '', name, flags=re.IGNORECASE)
+
+    # 4. Remove NUMERIC values in parentheses
+    # Matches: (123), (123.4), (-0.19), (-123.45)
+    name = re.sub(r'\s*\(\s*-?[\d.]+\s*\)', '', name)
+
+    # 5. Remove "-1" artifact
+    # Matches "-1" if it is followed by a Pipe or the End of String
+    # This handles "Direct taxes-1" AND "Category-1 | Subcategory"
+    name = re.sub(r'-1(?=\s*\||$)', '', name)
+
+    # 6. Remove trailing pipe if strictly at end
+    name = re.sub(r'\|\s*$', '', name)
+
+    # 7. Format formatting (Spaces around pipes)
+    if '|' in name:
+        name = name.replace('|', ' | ')
+
+    # 8. Final collapse of multiple spaces
+    name = re.sub(r'\s+', ' ', name).strip()
+
+    return name
+
+def build_citation(col_names, note=None) -> str:
+    """One series or a list of them (missing ones skipped); note goes before the author line."""
+    if not isinstance(col_names, list):
+        col_names = [col_names]
+
+    # Generate clean names
+    clean_names = [clean_series_name(c) for c in col_names if c]
+
+    # Remove duplicates while preserving order
+    unique_names = list(dict.fromkeys(clean_names))
+
+    series_str = ", ".join(unique_names)
+    return (f"Source: Greece in Numbers; Series: {series_str}; " + (f"{note}; " if note else "")
+            + "Author’s calculations by Theodoros Kourtalis.")
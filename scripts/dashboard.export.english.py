@@ -0,0 +1,374 @@
+# -*- coding: utf-8 -*-
+"""
+DASHBOARD EXPORT (Static HTML dashboard with lazily fetched, pre-decimated series)
+Writes the series catalog as a self-contained static site for the intranet: one
+small index.html shell + index.json (labels, units, dates), and one payload per
+source workbook that the page only fetches when that source is opened. Series are
+decimated once at export (largest-triangle-three-buckets) and packed as
+delta-encoded integers at display precision, which gzip compresses well.
+Colors come from the same CLASSIC_COLORS palette as the chart pack.
+
+Usage:
+    python dashboard.export.english.py [Annual|Quarterly|Monthly|all] [--out DIR] [--max-points 400] [--gzip]
+    python -m http.server -d dashboard      # browsers do not fetch() from file:// pages
+"""
+
+import os
+import sys
+import json
+import gzip
+import time
+import runpy
+import shutil
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+# --- 1. CONFIGURATION ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CATALOG = runpy.run_path(os.path.join(SCRIPT_DIR, "series.catalog.english.py"))   # Names, citations, file slugs
+UNIT_VIEWS = runpy.run_path(os.path.join(SCRIPT_DIR, "unit.views.english.py"))
+DECIMATE = runpy.run_path(os.path.join(SCRIPT_DIR, "decimate.english.py"))   # Same LTTB as the chart pack
+CLASSIC_COLORS = runpy.run_path(os.path.join(SCRIPT_DIR, "chart.style.english.py"))["CLASSIC_COLORS"]
+
+OUT_DIR = 'dashboard'
+DATA_DIR = 'data'        # Payloads, relative to OUT_DIR
+MAX_POINTS = 400         # Per series: more than a card is wide in pixels is never drawn
+SIG_DIGITS = 6           # Display precision (never finer than the published decimals)
+WRITE_GZIP = False       # Also write .gz siblings for servers with pre-compressed static files (nginx gzip_static)
+
+# === 2. DECIMATION ===
+
+def runs(values):
+    """(start, stop) of each run of finite values: a gap in the data is a gap in the line."""
+    ok = np.concatenate([[False], np.isfinite(values), [False]])
+    edges = np.flatnonzero(np.diff(ok.astype(int)))
+    return list(zip(edges[::2], edges[1::2]))
+
+# === 3. ENCODING ===
+
+def display_decimals(values, published):
+    # Enough digits for SIG_DIGITS significant figures at the series' largest magnitude
+    top = np.nanmax(np.abs(values))
+    digits = SIG_DIGITS - 1 - int(np.floor(np.log10(top))) if top > 0 else 0
+    return int(min(max(digits, 0), published))
+
+def encode_series(values, published, max_points=MAX_POINTS):
+    """
+    One series as {"d": decimals, "i": grid index deltas, "v": integer value deltas,
+    "b": point positions where a new run starts}. values are on the frequency's date grid.
+    """
+    spans = runs(values)
+    total = sum(stop - start for start, stop in spans)
+    d = display_decimals(values, published)
+    idx, starts = [], []
+    for start, stop in spans:
+        # Points shared out by run length, so a short early run is not flattened by a long one
+        budget = max(2, int(round(max_points * (stop - start) / total)))
+        grid = np.arange(start, stop)
+        starts.append(len(idx))
+        idx.extend(grid[DECIMATE['lttb'](grid.astype(float), values[start:stop], budget)].tolist())
+    idx = np.asarray(idx, dtype=np.int64)
+    ints = np.round(values[idx] * 10.0 ** d).astype(np.int64)
+    out = {"d": d, "i": np.diff(idx, prepend=0).tolist(), "v": np.diff(ints, prepend=0).tolist()}
+    if len(starts) > 1:
+        out["b"] = starts[1:]
+    return out
+
+def _dump(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def _write(path, payload, gz=False):
+    with open(path, 'wb') as f:
+        f.write(payload)
+    packed = gzip.compress(payload, 9, mtime=0)
+    if gz:
+        with open(path + '.gz', 'wb') as f:
+            f.write(packed)
+    return len(payload), len(packed)
+
+# === 4. EXPORT ===
+
+def export(panels, out_dir=OUT_DIR, max_points=MAX_POINTS, gz=WRITE_GZIP):
+    """
+    Writes the dashboard for {freq: Date-indexed frame}. Returns size stats:
+    {"index": (raw, gzip), "payloads": (raw, gzip), "files": n, "series": n, "largest": (name, raw, gzip)}.
+    """
+    data_dir = os.path.join(out_dir, DATA_DIR)
+    if os.path.isdir(data_dir):
+        shutil.rmtree(data_dir)  # Payload names change with the catalog: no stale files left behind
+    os.makedirs(data_dir)
+
+    index = {"created": datetime.now().isoformat(timespec="seconds"), "freqs": {}, "groups": []}
+    stats = {"payloads": [0, 0], "files": 0, "series": 0, "largest": ("", 0, 0)}
+    for freq, panel in panels.items():
+        panel = panel.sort_index()
+        values = panel.to_numpy(dtype='float64')
+        published = UNIT_VIEWS["decimals"](values)
+        index["freqs"][freq] = {"dates": pd.DatetimeIndex(panel.index).strftime('%Y-%m-%d').tolist()}
+        groups = {}
+        for j, label in enumerate(panel.columns):
+            if np.isfinite(values[:, j]).any():
+                groups.setdefault(label.split(' | ')[0], []).append(j)
+
+        for source, cols in groups.items():
+            fname = CATALOG["file_slug"](freq, source).replace('.png', '.json')
+            meta, payload = [], []
+            for j in cols:
+                label = panel.columns[j]
+                series, unit = UNIT_VIEWS["split_label"](label.split(' | ', 1)[-1])
+                valid = np.flatnonzero(np.isfinite(values[:, j]))
+                meta.append({"t": CATALOG["clean_series_name"](series), "u": unit, "n": len(valid)})
+                # Citations travel with the payload: the index stays small enough for a fast first paint
+                payload.append(dict(encode_series(values[:, j], published[j], max_points),
+                                    c=CATALOG["build_citation"](label)))
+            raw, packed = _write(os.path.join(data_dir, fname), _dump({"freq": freq, "series": payload}), gz)
+            index["groups"].append({"freq": freq, "title": CATALOG["clean_series_name"](source),
+                                    "file": f"{DATA_DIR}/{fname}", "series": meta})
+            stats["payloads"][0] += raw
+            stats["payloads"][1] += packed
+            stats["files"] += 1
+            stats["series"] += len(cols)
+            if raw > stats["largest"][1]:
+                stats["largest"] = (fname, raw, packed)
+
+    stats["index"] = _write(os.path.join(out_dir, 'index.json'), _dump(index), gz)
+    page = (PAGE.replace('__PALETTE__', json.dumps(CLASSIC_COLORS))
+                .replace('__TITLE__', "Greece in Numbers: Series Dashboard"))
+    shell = _write(os.path.join(out_dir, 'index.html'), page.encode('utf-8'), gz)
+    stats["index"] = (stats["index"][0] + shell[0], stats["index"][1] + shell[1])
+    stats["payloads"] = tuple(stats["payloads"])
+    return stats
+
+# === 5. PAGE ===
+# Plain HTML + JS, no external requests: the page must work on an intranet without a CDN.
+
+PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>__TITLE__</title>
+<style>
+  :root { --navy: #002E5D; --gold: #C5A059; --bg: #FDFBF7; --grid: #DCDCDC; --slate: #4B5358; --burgundy: #800020; }
+  body { margin: 0; background: var(--bg); color: #000; font: 15px 'Times New Roman', 'Liberation Serif', 'DejaVu Serif', Georgia, serif; }
+  header { padding: 18px 28px 10px; border-bottom: 3px solid var(--gold); position: sticky; top: 0; background: var(--bg); z-index: 2; }
+  h1 { margin: 0 0 10px; font-size: 24px; color: var(--navy); }
+  .bar { display: flex; gap: 10px; flex-wrap: wrap; align-items: center; }
+  .bar button { font: inherit; background: none; border: 1px solid var(--navy); color: var(--navy); padding: 3px 12px; cursor: pointer; }
+  .bar button.on { background: var(--navy); color: var(--bg); }
+  .bar input { font: inherit; flex: 1; min-width: 220px; padding: 4px 8px; border: 1px solid var(--slate); background: #fff; }
+  #status { color: var(--slate); font-size: 13px; }
+  main { padding: 8px 28px 40px; }
+  details { border-bottom: 1px solid var(--grid); }
+  summary { cursor: pointer; padding: 8px 0; font-size: 17px; font-weight: bold; color: var(--navy); }
+  summary span { font-weight: normal; color: var(--slate); font-size: 14px; }
+  .cards { display: grid; grid-template-columns: repeat(auto-fill, minmax(480px, 1fr)); gap: 16px; padding: 6px 0 18px; }
+  .card { background: #fff; border: 1px solid var(--grid); padding: 10px 12px 8px; position: relative; }
+  .card h3 { margin: 0 0 4px; font-size: 15px; }
+  .card .cite { font-size: 11px; color: #333; margin-top: 2px; }
+  .card svg { width: 100%; height: auto; display: block; }
+  .tip { position: absolute; pointer-events: none; background: var(--navy); color: var(--bg); font-size: 12px; padding: 2px 6px; display: none; white-space: nowrap; }
+  .hidden { display: none; }
+</style>
+</head>
+<body>
+<header>
+  <h1>__TITLE__</h1>
+  <div class="bar"><span id="freqs"></span><input id="q" type="search" placeholder="Filter series (all words must match)"><span id="status">Loading catalog...</span></div>
+</header>
+<main id="groups"></main>
+<script>
+"use strict";
+const COLORS = __PALETTE__;
+const W = 520, H = 250, M = {l: 64, r: 12, t: 10, b: 26};
+const t0 = performance.now();
+let INDEX = null, FREQ = null, LOADED = 0;
+const payloads = {};
+
+function el(tag, attrs, text) {
+  const e = document.createElement(tag);
+  for (const k in attrs || {}) e.setAttribute(k, attrs[k]);
+  if (text !== undefined) e.textContent = text;
+  return e;
+}
+function svgEl(tag, attrs) {
+  const e = document.createElementNS("http://www.w3.org/2000/svg", tag);
+  for (const k in attrs) e.setAttribute(k, attrs[k]);
+  return e;
+}
+function nice(lo, hi, n) {
+  // Round tick step (1, 2, 2.5, 5 x 10^k) for about n ticks
+  const span = hi - lo || Math.abs(hi) || 1, raw = span / n, p = Math.pow(10, Math.floor(Math.log10(raw)));
+  const step = [1, 2, 2.5, 5, 10].map(s => s * p).find(s => s >= raw);
+  const ticks = [];
+  for (let v = Math.ceil(lo / step) * step; v <= hi + step * 1e-9; v += step) ticks.push(+v.toPrecision(12));
+  return ticks;
+}
+function fmt(v, d) {
+  return v.toLocaleString("en-US", {minimumFractionDigits: d, maximumFractionDigits: d});
+}
+function decode(s) {
+  // Running sums undo the delta encoding; "b" marks where a line starts again after a gap
+  const n = s.i.length, idx = new Int32Array(n), val = new Float64Array(n), scale = Math.pow(10, s.d);
+  let i = 0, v = 0;
+  for (let k = 0; k < n; k++) { i += s.i[k]; v += s.v[k]; idx[k] = i; val[k] = v / scale; }
+  return {idx, val, breaks: new Set(s.b || []), d: s.d};
+}
+function years(dates) {
+  return dates.map(d => +d.slice(0, 4) + (+d.slice(5, 7) - 1) / 12);
+}
+
+function chart(meta, series, dates, xs) {
+  const card = el("div", {class: "card"});
+  card.appendChild(el("h3", {}, meta.t + (meta.u ? " (" + meta.u + ")" : "")));
+  const {idx, val, breaks, d} = decode(series);
+  const x0 = xs[idx[0]], x1 = xs[idx[idx.length - 1]];
+  let lo = Infinity, hi = -Infinity;
+  for (const v of val) { if (v < lo) lo = v; if (v > hi) hi = v; }
+  const yt = nice(lo, hi, 5);
+  lo = Math.min(lo, yt[0]); hi = Math.max(hi, yt[yt.length - 1]);
+  const sx = x => M.l + (x1 > x0 ? (x - x0) / (x1 - x0) : 0.5) * (W - M.l - M.r);
+  const sy = y => H - M.b - (hi > lo ? (y - lo) / (hi - lo) : 0.5) * (H - M.t - M.b);
+  const svg = svgEl("svg", {viewBox: `0 0 ${W} ${H}`, role: "img"});
+  for (const t of yt) {
+    svg.appendChild(svgEl("line", {x1: M.l, x2: W - M.r, y1: sy(t), y2: sy(t), stroke: COLORS.grid, "stroke-dasharray": "2 3"}));
+    const lab = svgEl("text", {x: M.l - 6, y: sy(t) + 4, "text-anchor": "end", "font-size": 11});
+    lab.textContent = fmt(t, Math.max(0, -Math.floor(Math.log10(Math.abs(yt[1] - yt[0]) || 1))));
+    svg.appendChild(lab);
+  }
+  const span = Math.max(1, Math.round((x1 - x0) / 7));
+  for (let y = Math.ceil(x0 / span) * span; y <= x1; y += span) {
+    const lab = svgEl("text", {x: sx(y), y: H - 8, "text-anchor": "middle", "font-size": 11});
+    lab.textContent = y;
+    svg.appendChild(lab);
+  }
+  svg.appendChild(svgEl("path", {d: `M${M.l},${M.t}V${H - M.b}H${W - M.r}`, fill: "none", stroke: "#000", "stroke-width": 1.5}));
+  let path = "";
+  for (let k = 0; k < idx.length; k++)
+    path += (k === 0 || breaks.has(k) ? "M" : "L") + sx(xs[idx[k]]).toFixed(1) + "," + sy(val[k]).toFixed(1);
+  svg.appendChild(svgEl("path", {d: path, fill: "none", stroke: COLORS.navy, "stroke-width": 2, "stroke-linejoin": "round"}));
+  const dot = svgEl("circle", {r: 3.5, fill: COLORS.burgundy, visibility: "hidden"});
+  svg.appendChild(dot);
+  const tip = el("div", {class: "tip"});
+  svg.addEventListener("mousemove", ev => {
+    const r = svg.getBoundingClientRect(), x = (ev.clientX - r.left) * W / r.width;
+    let best = 0;
+    for (let k = 1; k < idx.length; k++) if (Math.abs(sx(xs[idx[k]]) - x) < Math.abs(sx(xs[idx[best]]) - x)) best = k;
+    dot.setAttribute("cx", sx(xs[idx[best]])); dot.setAttribute("cy", sy(val[best])); dot.setAttribute("visibility", "visible");
+    tip.textContent = dates[idx[best]] + ": " + fmt(val[best], d);
+    tip.style.display = "block";
+    tip.style.left = Math.min(ev.clientX - card.getBoundingClientRect().left + 12, card.clientWidth - tip.offsetWidth - 4) + "px";
+    tip.style.top = (sy(val[best]) * r.height / H + 18) + "px";
+  });
+  svg.addEventListener("mouseleave", () => { dot.setAttribute("visibility", "hidden"); tip.style.display = "none"; });
+  card.appendChild(svg);
+  card.appendChild(tip);
+  card.appendChild(el("div", {class: "cite"}, series.c));
+  return card;
+}
+
+async function openGroup(group, box) {
+  if (box.dataset.done) return;
+  box.dataset.done = "1";
+  box.textContent = "Loading...";
+  try {
+    if (!payloads[group.file]) payloads[group.file] = fetch(group.file).then(r => { if (!r.ok) throw new Error(r.status); return r.json(); });
+    const data = await payloads[group.file];
+    const dates = INDEX.freqs[group.freq].dates, xs = years(dates);
+    box.textContent = "";
+    data.series.forEach((s, k) => box.appendChild(chart(group.series[k], s, dates, xs)));
+  } catch (e) {
+    box.dataset.done = "";
+    box.textContent = "Could not load " + group.file + " (" + e.message + ")";
+  }
+}
+
+function render() {
+  const main = document.getElementById("groups");
+  main.textContent = "";
+  for (const g of INDEX.groups) {
+    if (g.freq !== FREQ) continue;
+    const det = el("details");
+    det.dataset.text = (g.title + " " + g.series.map(s => s.t + " " + s.u).join(" ")).toLowerCase();
+    const sum = el("summary", {}, g.title + " ");
+    sum.appendChild(el("span", {}, "(" + g.series.length + " series)"));
+    const box = el("div", {class: "cards"});
+    det.append(sum, box);
+    det.addEventListener("toggle", () => { if (det.open) openGroup(g, box); });
+    main.appendChild(det);
+  }
+  filter();
+}
+
+function filter() {
+  const words = document.getElementById("q").value.toLowerCase().split(/\\s+/).filter(Boolean);
+  let shown = 0;
+  for (const det of document.querySelectorAll("#groups details")) {
+    const hit = words.every(w => det.dataset.text.includes(w));
+    det.classList.toggle("hidden", !hit);
+    shown += hit;
+  }
+  const n = INDEX.groups.filter(g => g.freq === FREQ).reduce((a, g) => a + g.series.length, 0);
+  document.getElementById("status").textContent =
+    `${shown} sources, ${n} ${FREQ.toLowerCase()} series - catalog built ${INDEX.created}, loaded in ${LOADED} ms`;
+}
+
+fetch("index.json").then(r => r.json()).then(index => {
+  INDEX = index;
+  LOADED = Math.round(performance.now() - t0);
+  const bar = document.getElementById("freqs");
+  for (const f of Object.keys(index.freqs)) {
+    const b = el("button", {}, f);
+    b.addEventListener("click", () => {
+      FREQ = f;
+      bar.querySelectorAll("button").forEach(x => x.classList.toggle("on", x === b));
+      render();
+    });
+    bar.appendChild(b);
+  }
+  bar.querySelector("button").click();
+  document.getElementById("q").addEventListener("input", filter);
+}).catch(e => {
+  document.getElementById("status").textContent = "Could not load index.json (" + e.message + "). Serve this folder over HTTP.";
+});
+</script>
+</body>
+</html>
+"""
+
+# === 6. DATA LOADING ===
+
+def load_panels(freqs):
+    # Same sources as the series catalog (bundle first, then the workbook), indexed by Date
+    panels = CATALOG["load_panels"](freqs)
+    out = {}
+    for freq, df in panels.items():
+        if 'Date' in df.columns:
+            df['Date'] = pd.to_datetime(df['Date'])
+            out[freq] = df.sort_values('Date').set_index('Date')
+    return out
+
+# === 7. MAIN ===
+
+def _opt(args, name, default):
+    return type(default)(args[args.index(name) + 1]) if name in args else default
+
+def report(stats, out_dir, seconds):
+    kb = lambda pair: f"{pair[0] / 1e3:.0f} KB ({pair[1] / 1e3:.0f} KB gzip)"
+    name, raw, packed = stats["largest"]
+    print(f"🌐 Dashboard: {stats['series']} series in {stats['files']} payloads in {seconds:.2f}s -> {out_dir}/index.html")
+    print(f"    page + index {kb(stats['index'])}; payloads {kb(stats['payloads'])}, "
+          f"largest {name} {kb((raw, packed))}")
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    freq_arg = args[0] if args and not args[0].startswith('--') else 'all'
+    out_dir = _opt(args, '--out', OUT_DIR)
+    max_points = _opt(args, '--max-points', MAX_POINTS)
+
+    t0 = time.perf_counter()
+    panels = load_panels(None if freq_arg == 'all' else [freq_arg])
+    os.makedirs(out_dir, exist_ok=True)
+    stats = export(panels, out_dir, max_points, '--gzip' in args or WRITE_GZIP)
+    report(stats, out_dir, time.perf_counter() - t0)
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+MONTE CARLO DEBT SUSTAINABILITY (Vectorized r-g / primary balance projections)
+Reads the Annual wide panel, estimates the joint distribution of nominal growth,
+effective interest rate and primary balance from history, and projects tens of
+thousands of debt-to-GDP paths at once as NumPy arrays.
+
+    d_t = d_{t-1} * (1 + i_t) / (1 + g_t) - pb_t
+
+Usage:
+    python debt.sustainability.montecarlo.english.py [n_sims] [horizon]
+"""
+
+import os
+import sys
+import time
+import textwrap
+import runpy
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+
+# -----------------------------------------------------------------------------
+# 1. SETUP & STYLE: "CLASSIC LUXURY" (same palette as the plot maker)
+# -----------------------------------------------------------------------------
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Palette + rcParams live in chart.style.english.py; the serif set is resolved once per host
+CLASSIC_COLORS = runpy.run_path(os.path.join(SCRIPT_DIR, "chart.style.english.py"))["apply_style"]()
+CATALOG = runpy.run_path(os.path.join(SCRIPT_DIR, "series.catalog.english.py"))   # Names and citations
+
+GITHUB_URL = "https://github.com/TheodorosKourtalis/public.debt.excels.english/raw/main/combined_wide_by_freq.xlsx"
+FILE_NAME = 'combined_wide_by_freq.xlsx'
+
+N_SIMS = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+HORIZON = int(sys.argv[2]) if len(sys.argv) > 2 else 10  # Years
+BASELINE_WINDOW = 10      # Baseline = mean of the last N years of history
+SHOCKS = 'bootstrap'      # 'bootstrap' (resample historical deviations) or 'normal' (multivariate normal)
+SEED = 42
+BANDS = [(5, 95), (10, 90), (25, 75)]
+
+# -----------------------------------------------------------------------------
+# 2. DATA LOADING & MAPPING
+# -----------------------------------------------------------------------------
+print("Attempting to load data...")
+try:
+    source = FILE_NAME if os.path.exists(FILE_NAME) else GITHUB_URL
+    df = pd.read_excel(source, sheet_name='Annual', engine='openpyxl')
+except Exception as e:
+    sys.exit(f"CRITICAL ERROR: {e}")
+
+df['Date'] = pd.to_datetime(df['Date'])
+df = df.sort_values('Date').reset_index(drop=True)
+cols = df.columns.tolist()
+
+def get_col(keywords):
+    matches = [c for c in cols if all(k.lower() in c.lower() for k in keywords)]
+    return matches[0] if matches else None
+
+col_debt_gdp = get_col(['General Government Consolidated Debt', 'GDP share'])
+if not col_debt_gdp: col_debt_gdp = get_col(['General government', 'GDP share', 'debt'])
+col_int_pay_gdp = get_col(['Government_expenditures_by_use', 'Interest payments', 'GDP share'])
+if not col_int_pay_gdp: col_int_pay_gdp = get_col(['Interest payments', 'GDP share'])
+col_prim_bal_gdp = get_col(['Primary budget balance', 'GDP share'])
+col_budget_bal_gdp = get_col(['Budget balance', 'GDP share'])
+col_nom_gdp = get_col(['Nominal Gross Domestic Product'])
+
+if not (col_debt_gdp and col_int_pay_gdp and col_nom_gdp and (col_prim_bal_gdp or col_budget_bal_gdp)):
+    sys.exit("Error: debt, interest, nominal GDP or balance series not found in the panel.")
+
+# -----------------------------------------------------------------------------
+# 3. HISTORICAL DRIVERS (all in fractions, not %)
+# -----------------------------------------------------------------------------
+debt = df[col_debt_gdp] / 100
+interest = df[col_int_pay_gdp].abs() / 100  # Some sources book interest as a negative flow
+g = df[col_nom_gdp].pct_change()
+if col_prim_bal_gdp:
+    pb = df[col_prim_bal_gdp] / 100
+else:
+    pb = (df[col_budget_bal_gdp] / 100) + interest
+# Interest_t / Y_t = i_t * D_{t-1} / Y_t  ->  i_t = interest share * (1 + g_t) / d_{t-1}
+i_eff = interest * (1 + g) / debt.shift(1)
+
+hist = pd.DataFrame({'Date': df['Date'], 'g': g, 'i': i_eff, 'pb': pb}).dropna()
+if len(hist) < 5:
+    sys.exit("Error: not enough overlapping history to estimate shocks.")
+
+drivers = hist[['g', 'i', 'pb']].to_numpy()
+baseline = drivers[-BASELINE_WINDOW:].mean(axis=0)
+deviations = drivers - drivers.mean(axis=0)
+
+last_obs = debt.dropna()
+d0 = last_obs.iloc[-1]
+start_year = df.loc[last_obs.index[-1], 'Date'].year
+
+print(f"History: {len(hist)} years. Baseline g={baseline[0]:.2%}, i={baseline[1]:.2%}, pb={baseline[2]:.2%}. "
+      f"Start debt {d0:.1%} ({start_year}).")
+
+# -----------------------------------------------------------------------------
+# 4. SIMULATION (vectorized across paths; only the horizon is looped)
+# -----------------------------------------------------------------------------
+t0 = time.perf_counter()
+rng = np.random.default_rng(SEED)
+
+if SHOCKS == 'normal':
+    shocks = rng.multivariate_normal(np.zeros(3), np.cov(deviations, rowvar=False), size=(N_SIMS, HORIZON))
+else:
+    # Whole historical rows keep the joint (fat-tailed) co-movement of g, i and pb
+    shocks = deviations[rng.integers(0, len(deviations), size=(N_SIMS, HORIZON))]
+
+paths_g = baseline[0] + shocks[..., 0]
+paths_i = np.maximum(baseline[1] + shocks[..., 1], 0.0)
+paths_pb = baseline[2] + shocks[..., 2]
+growth_factor = (1 + paths_i) / np.maximum(1 + paths_g, 1e-6)
+
+paths = np.empty((N_SIMS, HORIZON + 1))
+paths[:, 0] = d0
+for t in range(HORIZON):
+    paths[:, t + 1] = paths[:, t] * growth_factor[:, t] - paths_pb[:, t]
+
+elapsed = time.perf_counter() - t0
+pct = np.percentile(paths, [5, 10, 25, 50, 75, 90, 95], axis=0) * 100
+pct = dict(zip([5, 10, 25, 50, 75, 90, 95], pct))
+p_up = (paths[:, -1] > d0).mean()
+print(f"Simulated {N_SIMS:,} paths x {HORIZON} years in {elapsed:.2f}s")
+print(f"Debt in {start_year + HORIZON}: median {pct[50][-1]:.1f}% GDP, 90% band "
+      f"[{pct[5][-1]:.1f}%, {pct[95][-1]:.1f}%], P(higher than today) = {p_up:.1%}")
+
+# -----------------------------------------------------------------------------
+# 5. FAN CHART
+# -----------------------------------------------------------------------------
+years = np.arange(start_year, start_year + HORIZON + 1)
+fig, ax = plt.subplots(figsize=(12, 8))
+
+hist_mask = df[col_debt_gdp].notna()
+ax.plot(df.loc[hist_mask, 'Date'].dt.year, df.loc[hist_mask, col_debt_gdp],
+        color=CLASSIC_COLORS['navy'], linewidth=3, label='Debt (History)')
+
+for (lo, hi), alpha in zip(BANDS, [0.15, 0.25, 0.4]):
+    ax.fill_between(years, pct[lo], pct[hi], color=CLASSIC_COLORS['burgundy'], alpha=alpha,
+                    edgecolor='none', label=f'{lo}th-{hi}th percentile')
+ax.plot(years, pct[50], color=CLASSIC_COLORS['burgundy'], linewidth=3, linestyle='--', label='Median Projection')
+ax.axvline(start_year, color=CLASSIC_COLORS['slate'], linestyle=':', linewidth=1.5, alpha=0.7)
+
+ax.set_title('Debt Sustainability: Monte Carlo Fan Chart', fontsize=24, fontfamily='serif',
+             fontweight='bold', pad=30, color='black')
+ax.set_ylabel('% of GDP', fontsize=14, style='italic', labelpad=10)
+ax.spines['top'].set_visible(False)
+ax.spines['right'].set_visible(False)
+ax.spines['bottom'].set_linewidth(1.5)
+ax.spines['left'].set_linewidth(1.5)
+ax.grid(axis='y', visible=True, linestyle=':', alpha=0.7)
+ax.legend(loc='upper left', frameon=True, facecolor='white', framealpha=0.95, fontsize=11)
+
+citation = CATALOG["build_citation"]([col_debt_gdp, col_int_pay_gdp, col_prim_bal_gdp or col_budget_bal_gdp, col_nom_gdp],
+                                    note=f"{N_SIMS:,} simulated paths ({SHOCKS} shocks)")
+fig.text(0.1, 0.17, "\n".join(textwrap.wrap(citation, width=130)), ha="left", va="top", fontsize=10,
+         color='#333333', fontfamily='serif')
+
+plt.subplots_adjust(bottom=0.25)
+plt.savefig('Chart_DSA_Fan.png', dpi=300, bbox_inches='tight')
+print("Fan chart saved: Chart_DSA_Fan.png")
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+DECIMATE (Shape-preserving point thinning for long series)
+One implementation shared by the chart pack and the dashboard export, so a line
+drawn on paper and the same line drawn in the browser keep the same points.
+
+Usage (from a chart script):
+    DECIMATE = runpy.run_path(os.path.join(SCRIPT_DIR, "decimate.english.py"))
+    keep = DECIMATE["lttb"](x, y, 400)          # or DECIMATE["minmax"](y, 400)
+"""
+
+import numpy as np
+
+# === 1. DECIMATION ===
+
+def lttb(x, y, n):
+    """
+    Positions of the n finite points (first and last included) that keep the shape
+    of y(x): largest-triangle-three-buckets. Missing values are never picked, and
+    series with n finite points or fewer are kept whole.
+    """
+    valid = np.flatnonzero(np.isfinite(y))
+    if len(valid) <= n or n < 3:
+        return valid
+    x, y = x[valid], y[valid]
+    m = len(x)
+    edges = np.linspace(1, m - 1, n - 1).astype(int)
+    keep = np.empty(n, dtype=int)
+    keep[0], keep[-1] = 0, m - 1
+    a = 0
+    for k in range(n - 2):
+        lo, hi = edges[k], edges[k + 1]
+        # Next bucket's average is the third corner (the last point for the final bucket)
+        nxt = slice(edges[k + 1], edges[k + 2] if k + 2 < len(edges) else m)
+        cx, cy = x[nxt].mean(), y[nxt].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[k + 1] = a
+    return valid[keep]
+
+def minmax(y, n):
+    """Positions of the min and max of each of n/2 buckets (plus both ends): spikes survive."""
+    m = len(y)
+    size = int(np.ceil(m / max(n // 2, 1)))
+    blocks = np.concatenate([y, np.full((-m) % size, np.nan)]).reshape(-1, size)
+    base = np.arange(blocks.shape[0]) * size
+    lo = np.where(np.isnan(blocks), np.inf, blocks).argmin(axis=1)
+    hi = np.where(np.isnan(blocks), -np.inf, blocks).argmax(axis=1)
+    idx = np.concatenate([[0, m - 1], base + lo, base + hi])
+    return np.unique(idx[idx < m])
@@ -6,16 +6,31 @@ Output Directory: /Users/thodoreskourtales/dyn.macro/project.1/
 
 import urllib.parse
 import urllib.request
+import urllib.error
 import pandas as pd
+import numpy as np
 import io
 import time
 import os
+import sys
 import re
 import hashlib
+import json
+import runpy
+import zipfile
+import multiprocessing
+import xml.etree.ElementTree as ET
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+import unicodedata
 from datetime import datetime
 
+# Copy-on-Write: slices and derived frames share buffers until written (always on from pandas 3)
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
 # --- 1. SETUP OUTPUT DIRECTORY ---
-OUTPUT_DIR = "/Users/thodoreskourtales/dyn.macro/project.1/"
+OUTPUT_DIR = os.environ.get("LOADER_OUTPUT_DIR", "/Users/thodoreskourtales/dyn.macro/project.1/")
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 print(f"📂 Output directory set to: {OUTPUT_DIR}")
 
@@ -30,11 +45,50 @@ RETRIES = 3
 WRITE_COMBINED = True
 WRITE_WIDE = True
 WRITE_WIDE_BY_FREQ = True
+COMPACT_PANEL = True      # After the Excel save, keep only an id-keyed value store + label catalog in memory
+VALUE_DTYPE = "float64"   # Set to "float32" to halve the value store
+PERIOD_INDEX = False      # True: PeriodIndex ('Y'/'Q'/'M') instead of a normalized DatetimeIndex
+DERIVED_VIEWS = True      # Levels stored once: verified GDP shares + duplicate columns become views (store + bundle)
+WRITE_VINTAGE = True      # Record this release (changed cells only) in the vintage store
+EXCEL_ENGINE = "xlsxwriter"  # Streams rows in constant_memory mode; "openpyxl" for the old object-tree writer
+SKIP_EXCEL = False        # Build the panels in memory only (no .xlsx outputs)
+WRITE_BUNDLE = True       # One zstd Arrow IPC file with every frequency + an embedded JSON catalog
+WRITE_SEASONAL = True     # Batch seasonal adjustment of the NSA quarterly series (+ comparison with official SA)
+WRITE_UNIFIED_QUARTERLY = True  # Annual series disaggregated to quarters (Chow-Lin / Denton) next to the quarterly ones
+VALIDATE_PANELS = True    # Accounting identities, SA vs NSA annual sums and duplicate-date conflicts
+
+# Parse limits: one pathological workbook must not stall the nightly run
+ISOLATE_PARSE = True      # Parse each workbook in a forked worker under the budgets below (in-process where fork is unavailable)
+PARSE_TIMEOUT = 120       # Wall-clock seconds per workbook before its worker is killed
+PARSE_MEMORY_MB = 2048    # Extra address space per worker on top of the loader's own (enforced on Linux)
+MAX_SHEET_CELLS = 5_000_000   # Declared used range (rows x columns) above which a sheet is not read
+MAX_SHARED_STRINGS_MB = 64    # Uncompressed shared-strings table
+MAX_UNPACKED_MB = 512         # Uncompressed size of the whole workbook (zip bombs)
+
+# Command line: --resume skips workbooks already checkpointed as done,
+# --retry-failed re-runs only the workbooks whose last attempt failed.
+RESUME = "--resume" in sys.argv
+RETRY_FAILED = "--retry-failed" in sys.argv
+# --defer-writes: Excel + bundle writes are queued in DEFERRED_WRITES for the caller
+# (pipeline.english.py runs them on a background thread while the charts render).
+DEFER_WRITES = "--defer-writes" in sys.argv
 
 # Output Paths
 COMBINED_OUT = os.path.join(OUTPUT_DIR, "combined_cleaned.xlsx")
 WIDE_OUT = os.path.join(OUTPUT_DIR, "combined_wide.xlsx")
 WIDE_BY_FREQ_OUT = os.path.join(OUTPUT_DIR, "combined_wide_by_freq.xlsx")
+DATE_FORMATS_OUT = os.path.join(OUTPUT_DIR, "date_formats.json")
+SHEET_LAYOUTS_OUT = os.path.join(OUTPUT_DIR, "sheet_layouts.json")
+VINTAGE_DIR = os.path.join(OUTPUT_DIR, "vintages")
+CHECKPOINT_DIR = os.path.join(OUTPUT_DIR, "checkpoints")
+DATA_BUNDLE_OUT = os.path.join(OUTPUT_DIR, "combined_bundle.arrow")
+BUNDLE_CATALOG_OUT = os.path.join(OUTPUT_DIR, "combined_bundle.catalog.json")
+SEASONAL_OUT = os.path.join(OUTPUT_DIR, "seasonally_adjusted.xlsx")
+SEASONAL_CACHE = os.path.join(OUTPUT_DIR, "seasonal_cache.json")
+UNIFIED_QUARTERLY_OUT = os.path.join(OUTPUT_DIR, "quarterly_unified.xlsx")
+VALIDATION_OUT = os.path.join(OUTPUT_DIR, "validation_report.csv")
+QUARANTINE_DIR = os.path.join(OUTPUT_DIR, "quarantine")  # Workbooks that failed to parse + why
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # --- 3. URLS ---
 REPO_BASE = "https://github.com/TheodorosKourtalis/public.debt.excels.english/blob/main/"
@@ -100,6 +154,10 @@ FILENAMES = [
     "Social_contributions_by_contributor.xlsx",
     "Social_contributions_by_type_of_contribution.xlsx"
 ]
+# LOADER_FILENAMES: optional text file with one workbook name per line (e.g. a synthetic stress set)
+if os.environ.get("LOADER_FILENAMES"):
+    with open(os.environ["LOADER_FILENAMES"], encoding="utf-8") as f:
+        FILENAMES = [line.strip() for line in f if line.strip()]
 URLS = [REPO_BASE + f for f in FILENAMES]
 
 # === 4. HELPERS ===
@@ -115,15 +173,18 @@ def check_url(url: str) -> int:
     try:
         req = urllib.request.Request(url, method="HEAD", headers={"User-Agent": USER_AGENT})
         with urllib.request.urlopen(req, timeout=10) as resp: return resp.status
-    except: return 200 
+    except (urllib.error.URLError, OSError, ValueError): return 200 
 
 def fetch_bytes(url: str) -> bytes:
+    last_err = None
     for _ in range(RETRIES):
         try:
             req = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
             with urllib.request.urlopen(req, timeout=30) as resp: return resp.read()
-        except: time.sleep(1)
-    raise RuntimeError("Download failed")
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            last_err = e
+            time.sleep(1)
+    raise RuntimeError(f"Download failed after {RETRIES} attempts: {last_err}")
 
 # === 5. EXCEL PARSING LOGIC ===
 
@@ -136,30 +197,107 @@ POSSIBLE_DATE_COLS = ["Date", "Year", "Quarter", "Ημερομηνία", "Έτο
 def _clean_txt(x):
     return re.sub(r"\s+", " ", str(x).strip()) if pd.notna(x) else ""
 
-def _parse_date_col(df):
-    df = df.copy()
-    found_col = None
-    
+# Greek month stems (accents stripped, lowercase). Longer stems first so Ιουν/Ιουλ don't collide.
+GREEK_MONTHS = {
+    "ιουν": 6, "ιουλ": 7, "ιαν": 1, "φεβ": 2, "μαρ": 3, "απρ": 4, "μαι": 5,
+    "αυγ": 8, "σεπ": 9, "οκτ": 10, "νοε": 11, "δεκ": 12,
+}
+QUARTER_RE = r"^(?:(?P<y1>\d{4})\s*[-/ ]?\s*[QqΤτ](?P<q1>[1-4])|[QqΤτ](?P<q2>[1-4])\s*[-/ ]?\s*(?P<y2>\d{4}))$"
+GREEK_MONTH_RE = r"^(?P<m>[^\d\s./-]+)\.?\s*[-/ ]?\s*(?P<y>\d{4})$"
+
+# Ordered: the first format matching the sample wins
+DATE_FORMATS = [
+    ("%Y", r"^\d{4}(?:\.0)?$"),
+    ("%Y-%m", r"^\d{4}-\d{2}$"),
+    ("%Y-%m-%d", r"^\d{4}-\d{2}-\d{2}(?: 00:00:00)?$"),
+    ("%d/%m/%Y", r"^\d{1,2}/\d{1,2}/\d{4}$"),
+    ("quarter", QUARTER_RE),
+    ("greek_month", GREEK_MONTH_RE),
+]
+
+# Per source file + sheet + column. Persisted so repeat runs skip detection.
+try:
+    with open(DATE_FORMATS_OUT, encoding="utf-8") as f: DATE_FORMAT_CACHE = json.load(f)
+except (OSError, ValueError):
+    DATE_FORMAT_CACHE = {}
+
+def _greek_month(word):
+    w = "".join(ch for ch in unicodedata.normalize("NFD", str(word).lower()) if unicodedata.category(ch) != "Mn")
+    return next((m for stem, m in GREEK_MONTHS.items() if w.startswith(stem)), None)
+
+def _detect_date_format(vals, sample_size=20):
+    sample = vals.dropna().head(sample_size)
+    if sample.empty: return None
+    for fmt, pattern in DATE_FORMATS:
+        hits = sample.str.match(pattern)
+        if fmt == "greek_month" and hits.any():
+            hits &= sample.str.extract(GREEK_MONTH_RE)["m"].map(_greek_month).notna()
+        # Allow stray header rows ("Date", "Metric") in the sample
+        if hits.mean() >= 0.5: return fmt
+    return None
+
+def _to_dates(vals, fmt):
+    if fmt in ("%Y", "%Y-%m", "%Y-%m-%d", "%d/%m/%Y"):
+        if fmt == "%Y": vals = vals.str.extract(r"^(\d{4})(?:\.0)?$")[0]
+        elif fmt == "%Y-%m-%d": vals = vals.str.slice(0, 10)
+        return pd.to_datetime(vals, format=fmt, errors="coerce")
+    if fmt == "quarter":
+        # Quarters land on their last month, matching the "YYYY-03/06/09/12" quarterly sources
+        parts = vals.str.extract(QUARTER_RE)
+        year = pd.to_numeric(parts["y1"].fillna(parts["y2"]), errors="coerce")
+        month = pd.to_numeric(parts["q1"].fillna(parts["q2"]), errors="coerce") * 3
+        return pd.to_datetime(pd.DataFrame({"year": year, "month": month, "day": 1}), errors="coerce")
+    if fmt == "greek_month":
+        parts = vals.str.extract(GREEK_MONTH_RE)
+        words = parts["m"].dropna().unique()
+        month = parts["m"].map({w: _greek_month(w) for w in words})
+        year = pd.to_numeric(parts["y"], errors="coerce")
+        return pd.to_datetime(pd.DataFrame({"year": year, "month": month, "day": 1}), errors="coerce")
+    # Unknown layout: legacy per-element inference
+    return pd.to_datetime(vals, errors="coerce")
+
+def _find_date_col(df):
     for col in df.columns:
         if str(col).strip() in POSSIBLE_DATE_COLS:
-            found_col = col
-            break
-            
-    if not found_col and len(df.columns) > 0:
+            return col
+    if len(df.columns) > 0:
         first_col = df.columns[0]
         sample = df[first_col].dropna().head(5).astype(str)
-        if sample.str.match(r'^\d{4}$').all() or sample.str.match(r'^\d{4}-\d{2}$').all():
-            found_col = first_col
+        fmt = _detect_date_format(sample)
+        if fmt and sample.str.match(dict(DATE_FORMATS)[fmt]).all():
+            return first_col
+    return None
+
+def _parse_date_col(df, cache_key=None, found_col=None):
+    # Works in place on the freshly read frame: no defensive copy
+    if found_col not in df.columns:
+        found_col = _find_date_col(df)
 
     if found_col:
         df.rename(columns={found_col: "Date"}, inplace=True)
+        if pd.api.types.is_datetime64_any_dtype(df["Date"]):
+            return df[~df["Date"].isna()]
         try:
-            date_vals = df["Date"].astype(str)
-            df["Date"] = pd.to_datetime(date_vals, errors='coerce')
-        except: pass
+            date_vals = df["Date"].astype(str).str.strip().where(df["Date"].notna())
+            key = f"{cache_key}::{found_col}" if cache_key else None
+            fmt = DATE_FORMAT_CACHE.get(key) if key else None
+            parsed = _to_dates(date_vals, fmt) if fmt else None
+            if parsed is None or parsed.isna().all():
+                # Cache miss or the layout changed since the cached run
+                fmt = _detect_date_format(date_vals)
+                parsed = _to_dates(date_vals, fmt)
+                if key and fmt: DATE_FORMAT_CACHE[key] = fmt
+            df["Date"] = parsed
+        except Exception as e:
+            print(f"    ⚠️  Date parsing failed ({cache_key}): {e}")
+            return df.iloc[0:0]
         return df[~df["Date"].isna()]
     return df
 
+def save_date_formats():
+    with open(DATE_FORMATS_OUT, "w", encoding="utf-8") as f:
+        json.dump(DATE_FORMAT_CACHE, f, ensure_ascii=False, indent=1, sort_keys=True)
+
 def _coerce_numeric(df):
     for c in df.columns:
         if c == "Date": continue
@@ -173,118 +311,612 @@ def _coerce_numeric(df):
         df[c] = pd.to_numeric(s, errors='coerce')
     return df
 
-def flatten_excel(xl, sheet_name, fname):
-    try:
-        df = pd.read_excel(xl, sheet_name=sheet_name, header=[0, 1])
-        new_cols = []
-        for cat, unit in df.columns:
-            c_txt = _clean_txt(cat)
-            u_txt = _clean_txt(unit)
-            if c_txt in KNOWN_PLACEHOLDERS or "Unnamed" in c_txt:
-                if "Date" in u_txt or "Year" in u_txt: new_cols.append("Date")
-                elif u_txt: new_cols.append(f"{fname} | {u_txt}")
-                else: new_cols.append(f"{fname} | {c_txt}")
-            else:
-                new_cols.append(f"{fname} | {c_txt} ({u_txt})")
-        df.columns = new_cols
+PARSE_ERRORS = {}  # "fname::sheet" -> why every layout attempt failed
+PARSE_NOTES = {}   # "fname::sheet" -> errors recovered from (stale layout, unreadable header rows)
+
+# Header layouts keyed by a fingerprint of each sheet's first rows. A known
+# fingerprint goes straight to one targeted read; new ones are detected and flagged.
+FINGERPRINT_ROWS = 4
+try:
+    with open(SHEET_LAYOUTS_OUT, encoding="utf-8") as f: LAYOUT_CACHE = json.load(f)
+except (OSError, ValueError):
+    LAYOUT_CACHE = {}
+NEW_LAYOUTS = {}  # "fname::sheet" -> fingerprint detected this run (review these)
+
+def _cell_kind(x):
+    if pd.isna(x): return "-"
+    if isinstance(x, (int, float, np.number)): return "n"
+    if isinstance(x, (datetime, pd.Timestamp)): return "d"
+    return "h" if ("Date" in str(x) or "Year" in str(x)) else "s"
+
+def sheet_fingerprint(xl, sheet_name):
+    # Header rows verbatim, data rows by cell kind only, so new observations keep the fingerprint
+    head = pd.read_excel(xl, sheet_name=sheet_name, header=None, nrows=FINGERPRINT_ROWS)
+    rows = [[_clean_txt(x) for x in row] for row in head.iloc[:2].itertuples(index=False)]
+    rows += ["".join(_cell_kind(x) for x in row) for row in head.iloc[2:].itertuples(index=False)]
+    return hashlib.md5(json.dumps(rows, ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+
+def _read_two_row(xl, sheet_name, fname, skip=None):
+    df = pd.read_excel(xl, sheet_name=sheet_name, header=[0, 1])
+    new_cols = []
+    for cat, unit in df.columns:
+        c_txt = _clean_txt(cat)
+        u_txt = _clean_txt(unit)
+        if c_txt in KNOWN_PLACEHOLDERS or "Unnamed" in c_txt:
+            if "Date" in u_txt or "Year" in u_txt: new_cols.append("Date")
+            elif u_txt: new_cols.append(f"{fname} | {u_txt}")
+            else: new_cols.append(f"{fname} | {c_txt}")
+        else:
+            new_cols.append(f"{fname} | {c_txt} ({u_txt})")
+    df.columns = new_cols
+    if skip is None:
+        skip = 0
         if len(df) > 0:
             first_val = str(df.iloc[0,0])
-            if "Date" in first_val or "Year" in first_val: df = df.iloc[1:]
-            elif first_val == "nan" and len(df) > 1 and ("Date" in str(df.iloc[1,0]) or str(df.iloc[1,0]).isdigit()): df = df.iloc[1:]
-        return _coerce_numeric(_parse_date_col(df))
-    except: pass
+            if "Date" in first_val or "Year" in first_val: skip = 1
+            elif first_val == "nan" and len(df) > 1 and ("Date" in str(df.iloc[1,0]) or str(df.iloc[1,0]).isdigit()): skip = 1
+    return (df.iloc[skip:] if skip else df), skip
+
+def _read_layout(xl, sheet_name, fname, layout):
+    """One targeted read with a known layout. Returns None when the sheet no longer fits it."""
+    cache_key = f"{fname}::{sheet_name}"
+    if layout["header"] == 2:
+        df, _ = _read_two_row(xl, sheet_name, fname, skip=layout["skip"])
+        return _coerce_numeric(_parse_date_col(df, cache_key, layout.get("date_col")))
+    df = pd.read_excel(xl, sheet_name=sheet_name, header=0)
+    df = _parse_date_col(df, cache_key, layout.get("date_col"))
+    if "Date" not in df.columns:
+        return None
+    df.rename(columns={c: f"{fname} | {c}" for c in df.columns if c != "Date"}, inplace=True)
+    return _coerce_numeric(df)
+
+def _detect_layout(xl, sheet_name, fname):
+    # Trial and error: two-row header first, then a single header row
+    errors = []
+    try:
+        df, skip = _read_two_row(xl, sheet_name, fname)
+        date_col = _find_date_col(df)
+        df = _coerce_numeric(_parse_date_col(df, f"{fname}::{sheet_name}", date_col))
+        return df, {"header": 2, "skip": skip, "date_col": date_col}
+    except MemoryError:
+        raise  # A blown memory budget is the workbook's failure, not a layout mismatch
+    except Exception as e:
+        errors.append(f"two-row header: {type(e).__name__}: {e}")
 
     try:
         df = pd.read_excel(xl, sheet_name=sheet_name, header=0)
-        df = _parse_date_col(df)
+        date_col = _find_date_col(df)
+        df = _parse_date_col(df, f"{fname}::{sheet_name}", date_col)
         if "Date" in df.columns:
             non_date = [c for c in df.columns if c != "Date"]
             mapper = {c: f"{fname} | {c}" for c in non_date}
             df.rename(columns=mapper, inplace=True)
-            return _coerce_numeric(df)
-    except: pass
-    return None
+            return _coerce_numeric(df), {"header": 1, "skip": 0, "date_col": date_col}
+        errors.append("single header: no date column found")
+    except MemoryError:
+        raise
+    except Exception as e:
+        errors.append(f"single header: {type(e).__name__}: {e}")
+    PARSE_ERRORS[f"{fname}::{sheet_name}"] = "; ".join(errors)
+    return None, None
+
+def flatten_excel(xl, sheet_name, fname):
+    key = f"{fname}::{sheet_name}"
+    notes = []
+    try:
+        fp = sheet_fingerprint(xl, sheet_name)
+    except MemoryError:
+        raise
+    except Exception as e:
+        fp = None
+        notes.append(f"fingerprint: {type(e).__name__}: {e}")
+
+    layout = LAYOUT_CACHE.get(fp)
+    if layout:
+        try:
+            df = _read_layout(xl, sheet_name, fname, layout)
+            if df is not None:
+                return df
+            notes.append(f"cached layout {fp}: no date column")
+        except MemoryError:
+            raise
+        except Exception as e:
+            # Same first rows but a different body: detect again below
+            notes.append(f"cached layout {fp}: {type(e).__name__}: {e}")
+
+    df, layout = _detect_layout(xl, sheet_name, fname)
+    if notes:
+        PARSE_NOTES[key] = "; ".join(notes)
+        if key in PARSE_ERRORS:
+            PARSE_ERRORS[key] = f"{PARSE_NOTES[key]}; {PARSE_ERRORS[key]}"
+    if fp and layout:
+        LAYOUT_CACHE[fp] = dict(layout, sheet=key, detected=datetime.now().isoformat(timespec="seconds"))
+        NEW_LAYOUTS[key] = fp
+    return df
 
-# === 6. MAIN EXECUTION + DEDUPLICATION ===
+def save_sheet_layouts():
+    with open(SHEET_LAYOUTS_OUT, "w", encoding="utf-8") as f:
+        json.dump(LAYOUT_CACHE, f, ensure_ascii=False, indent=1, sort_keys=True, default=str)
+
+# --- Workbook limits: pre-check from the zip metadata, then parse in an isolated worker ---
+
+SKIP_SHEET_WORDS = ["info", "meta", "title", "back"]
+
+def _cell_ref(ref):
+    # "XFD1048576" -> (1048576, 16384); None for anything else
+    m = re.match(r"^\$?([A-Z]{1,3})\$?(\d+)$", ref.strip().upper())
+    if not m:
+        return None
+    col = 0
+    for ch in m.group(1):
+        col = col * 26 + ord(ch) - 64
+    return int(m.group(2)), col
+
+def sheet_dimensions(zf):
+    """
+    {sheet name: (rows, columns)} from each worksheet's <dimension> tag, read from the
+    first bytes of the sheet XML only. None for sheets without the tag.
+    """
+    book = ET.fromstring(zf.read("xl/workbook.xml"))
+    rels = ET.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    targets = {r.get("Id"): r.get("Target") for r in rels.findall("{*}Relationship")}
+    dims = {}
+    for sheet in book.findall(".//{*}sheet"):
+        rid = next((v for k, v in sheet.attrib.items() if k.endswith("}id")), None)
+        target = targets.get(rid)
+        dims[sheet.get("name")] = None
+        if not target:
+            continue
+        path = target.lstrip("/") if target.startswith("/") else "xl/" + target
+        try:
+            with zf.open(path) as f:
+                head = f.read(4096).decode("utf-8", "ignore")
+        except KeyError:
+            continue
+        m = re.search(r'<(?:\w+:)?dimension ref="([^"]+)"', head)
+        if m:
+            first, _, last = m.group(1).partition(":")
+            start, end = _cell_ref(first), _cell_ref(last or first)
+            if start and end:
+                dims[sheet.get("name")] = (end[0] - start[0] + 1, end[1] - start[1] + 1)
+    return dims
+
+def precheck_workbook(blob):
+    """
+    Cheap checks before any cell is parsed. Returns (problem, oversized): a reason to
+    quarantine the whole workbook (or None) and {sheet: reason} for sheets not to read.
+    """
+    try:
+        zf = zipfile.ZipFile(io.BytesIO(blob))
+    except zipfile.BadZipFile as e:
+        return f"corrupt workbook (not a valid zip: {e})", {}
+    with zf:
+        members = {i.filename: i.file_size for i in zf.infolist()}
+        unpacked = sum(members.values()) / 1e6
+        if unpacked > MAX_UNPACKED_MB:
+            return f"{unpacked:.0f} MB uncompressed (limit {MAX_UNPACKED_MB} MB)", {}
+        strings = members.get("xl/sharedStrings.xml", 0) / 1e6
+        if strings > MAX_SHARED_STRINGS_MB:
+            return f"shared-strings table of {strings:.0f} MB (limit {MAX_SHARED_STRINGS_MB} MB)", {}
+        try:
+            dims = sheet_dimensions(zf)
+        except Exception as e:  # Missing parts, broken XML, bad deflate streams: all mean a corrupt file
+            return f"corrupt workbook ({type(e).__name__}: {e})", {}
+    oversized = {sheet: f"declared range of {dim[0]:,} rows x {dim[1]:,} columns (limit {MAX_SHEET_CELLS:,} cells)"
+                 for sheet, dim in dims.items() if dim and dim[0] * dim[1] > MAX_SHEET_CELLS}
+    data_sheets = [sheet for sheet in dims if not any(x in sheet.lower() for x in SKIP_SHEET_WORDS)]
+    if data_sheets and all(sheet in oversized for sheet in data_sheets):
+        return "every data sheet is oversized: " + "; ".join(f"{s}: {oversized[s]}" for s in data_sheets), oversized
+    return None, oversized
+
+def parse_workbook(blob, fname, skip=None):
+    """
+    Parses every data sheet of one workbook. Returns the per-sheet events in sheet order
+    ("ok", sheet, df, hash, recovered errors) / ("warn", sheet, reason) plus the cache entries this parse
+    added, so a worker process can hand everything back to the loader.
+    """
+    skip = skip or {}
+    formats_before, layouts_before = dict(DATE_FORMAT_CACHE), set(LAYOUT_CACHE)
+    xl = pd.ExcelFile(io.BytesIO(blob), engine="openpyxl")
+    events = []
+    for sheet in xl.sheet_names:
+        if any(x in sheet.lower() for x in SKIP_SHEET_WORDS): continue
+        if sheet in skip:
+            events.append(("warn", sheet, f"not read: {skip[sheet]}"))
+            continue
+
+        df = flatten_excel(xl, sheet, fname)
+        key = f"{fname}::{sheet}"
+        if df is not None and not df.empty and "Date" in df.columns:
+            events.append(("ok", sheet, df, content_hash(df), PARSE_NOTES.get(key)))
+        else:
+            events.append(("warn", sheet, PARSE_ERRORS.get(key, "no rows with a valid date")))
+    return {
+        "events": events,
+        "date_formats": {k: v for k, v in DATE_FORMAT_CACHE.items() if formats_before.get(k) != v},
+        "layouts": {fp: LAYOUT_CACHE[fp] for fp in set(LAYOUT_CACHE) - layouts_before},
+        "new_layouts": {k: fp for k, fp in NEW_LAYOUTS.items() if k.startswith(f"{fname}::")},
+    }
+
+def _limit_memory(budget_mb):
+    # Address-space cap relative to what the forked worker already maps (Linux; a no-op elsewhere)
+    try:
+        import resource
+        with open("/proc/self/statm") as f:
+            mapped = int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+        limit = mapped + budget_mb * 2**20
+        resource.setrlimit(resource.RLIMIT_AS, (limit, resource.getrlimit(resource.RLIMIT_AS)[1]))
+    except (ImportError, OSError, ValueError):
+        pass
+
+def warm_reader():
+    # Import + first-use costs of the Excel reader, paid once here instead of in every forked worker
+    import openpyxl
+    buf = io.BytesIO()
+    wb = openpyxl.Workbook()
+    wb.active.append(["Date", "x"])
+    wb.active.append([2000, 1.0])
+    wb.save(buf)
+    pd.read_excel(io.BytesIO(buf.getvalue()), engine="openpyxl")
+
+class ParseWorker:
+    """
+    A forked worker that runs func(*args) for one workbook at a time under a wall-clock
+    and memory budget. The worker is killed on timeout and replaced after any failure,
+    so a bad workbook never leaves state behind for the next one; between good ones it
+    stays warm, which saves a fork per workbook.
+    """
+    def __init__(self, func, timeout=PARSE_TIMEOUT, memory_mb=PARSE_MEMORY_MB):
+        self.func, self.timeout, self.memory_mb = func, timeout, memory_mb
+        self.proc = self.conn = self.exitcode = None
+
+    def _start(self):
+        ctx = multiprocessing.get_context("fork")
+        self.conn, child = ctx.Pipe()
+
+        def _serve():
+            self.conn.close()
+            _limit_memory(self.memory_mb)
+            while True:
+                try:
+                    args = child.recv()
+                except EOFError:
+                    return
+                try:
+                    out = ("ok", self.func(*args))
+                except MemoryError:
+                    out = ("error", f"memory budget exceeded ({self.memory_mb} MB)")
+                except Exception as e:
+                    out = ("error", f"{type(e).__name__}: {e}")
+                try:
+                    child.send(out)
+                except MemoryError:
+                    child.send(("error", f"memory budget exceeded ({self.memory_mb} MB) sending the result"))
+
+        # Buffered output would otherwise be printed a second time by the worker
+        sys.stdout.flush()
+        sys.stderr.flush()
+        self.proc = ctx.Process(target=_serve, daemon=True)
+        self.proc.start()
+        child.close()
+
+    def run(self, *args):
+        """Returns (result, None) or (None, reason)."""
+        if self.proc is None or not self.proc.is_alive():
+            self._start()
+        try:
+            self.conn.send(args)
+            if not self.conn.poll(self.timeout):
+                self.stop()
+                return None, f"parse timed out after {self.timeout}s"
+            status, payload = self.conn.recv()
+        except (EOFError, OSError):
+            self.stop()
+            return None, f"parse worker died (exit code {self.exitcode})"
+        if status != "ok":
+            self.stop()
+            return None, payload
+        return payload, None
+
+    def stop(self):
+        if self.proc is not None:
+            self.proc.kill()
+            self.proc.join()
+            self.exitcode = self.proc.exitcode
+            self.conn.close()
+        self.proc = self.conn = None
+
+def quarantine(fname, blob, reason):
+    # The workbook as downloaded + why it was set aside, for a look before the next run
+    os.makedirs(QUARANTINE_DIR, exist_ok=True)
+    path = os.path.join(QUARANTINE_DIR, f"{fname}.xlsx")
+    with open(path, "wb") as f: f.write(blob)
+    with open(os.path.join(QUARANTINE_DIR, f"{fname}.json"), "w", encoding="utf-8") as f:
+        json.dump({"workbook": fname, "reason": reason, "bytes": len(blob),
+                   "quarantined": datetime.now().isoformat(timespec="seconds")}, f, ensure_ascii=False, indent=1)
+    return path
+
+def release_quarantine(fname):
+    for ext in (".xlsx", ".json"):
+        path = os.path.join(QUARANTINE_DIR, fname + ext)
+        if os.path.exists(path):
+            os.remove(path)
+
+# === 6. EXCEL WRITING ===
+
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
+def peak_rss_mb():
+    # Process high-water mark; ru_maxrss is bytes on macOS and KB on Linux
+    try:
+        import resource
+    except ImportError:
+        return float("nan")
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1e6 if sys.platform == "darwin" else rss / 1e3
+
+def _stream_xlsx(path, sheets):
+    # Row-by-row in constant_memory mode: each row is flushed to disk once the next one starts
+    wb = xlsxwriter.Workbook(path, {"constant_memory": True})
+    date_fmt = wb.add_format({"num_format": "yyyy-mm-dd"})
+    for name, panel in sheets.items():
+        ws = wb.add_worksheet(name)
+        ws.write_row(0, 0, ["Date"] + [str(c) for c in panel.columns])
+        vals = panel.to_numpy(dtype="float64")
+        finite = np.isfinite(vals)
+        for r, (date, row, ok) in enumerate(zip(panel.index, vals, finite), start=1):
+            ws.write_datetime(r, 0, pd.Timestamp(date).to_pydatetime(), date_fmt)
+            for c in np.flatnonzero(ok):
+                ws.write_number(r, int(c) + 1, row[c])
+    wb.close()
+
+def write_workbook(path, sheets):
+    """Writes {sheet name: frame indexed by Date} to one workbook. Returns seconds spent."""
+    t0 = time.perf_counter()
+    if EXCEL_ENGINE == "xlsxwriter" and xlsxwriter is not None:
+        _stream_xlsx(path, sheets)
+    else:
+        with pd.ExcelWriter(path, engine="openpyxl") as writer:
+            for name, panel in sheets.items():
+                panel.reset_index().to_excel(writer, sheet_name=name, index=False)
+    return time.perf_counter() - t0
+
+def write_workbooks(jobs):
+    """
+    Writes independent workbooks on a thread pool, one thread per workbook. The
+    per-cell writes hold the GIL, so in practice only each workbook's final zip
+    compression (zlib releases the GIL) overlaps; the Annual and Quarterly sheets
+    of one workbook are written one after the other. Processes would need the
+    writer outside this file, which runs top-level code a spawned worker would
+    re-execute, and separate per-frequency workbooks would break every reader of
+    the by-frequency file.
+    """
+    rss_before = peak_rss_mb()
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, len(jobs))) as pool:
+        timings = dict(zip(jobs, pool.map(lambda p: write_workbook(p, jobs[p]), jobs)))
+    engine = EXCEL_ENGINE if xlsxwriter is not None else "openpyxl"
+    for path, secs in timings.items():
+        rows = ", ".join(f"{n} ({len(df)} rows)" for n, df in jobs[path].items())
+        print(f"✅ Saved: {path} [{rows}] in {secs:.2f}s")
+    print(f"⏱️  Excel save ({engine}): {time.perf_counter() - t0:.2f}s wall, "
+          f"peak RSS {rss_before:.0f} MB -> {peak_rss_mb():.0f} MB")
+
+# === 7. CHECKPOINTS ===
+
+CHECKPOINT_STATUS = os.path.join(CHECKPOINT_DIR, "status.json")
+os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+
+def _checkpoint_path(fname):
+    return os.path.join(CHECKPOINT_DIR, f"{fname}.pkl")
+
+def _atomic(path, write):
+    # Write to a temp file and swap it in, so a crash never leaves a half-written checkpoint
+    tmp = path + ".tmp"
+    write(tmp)
+    os.replace(tmp, path)
+
+def load_status():
+    try:
+        with open(CHECKPOINT_STATUS, encoding="utf-8") as f: return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_status(status):
+    def _write(tmp):
+        with open(tmp, "w", encoding="utf-8") as f: json.dump(status, f, ensure_ascii=False, indent=1)
+    _atomic(CHECKPOINT_STATUS, _write)
+
+def save_checkpoint(fname, kept):
+    _atomic(_checkpoint_path(fname), lambda tmp: pd.to_pickle(kept, tmp))
+
+def load_checkpoint(fname):
+    return pd.read_pickle(_checkpoint_path(fname))
+
+def content_hash(df):
+    # We hash the data content (excluding the filename part of columns)
+    # to detect if the *numbers* are identical to a previous file.
+    df_hash = df.sort_values("Date", ignore_index=True)
+    # Remove filename prefix from columns for pure content comparison
+    df_hash.columns = [c.split('|')[-1].strip() if '|' in c else c for c in df_hash.columns]
+    # Convert to string and hash
+    return hashlib.md5(df_hash.to_string().encode('utf-8')).hexdigest()
+
+# === 8. MAIN EXECUTION + DEDUPLICATION ===
 
 print("=== PROCESSING FILES ===")
 BOOKS = {}
 seen_hashes = set() # To store data hashes
+SHEET_HASHES = {}   # "fname::sheet" -> content hash, reused by the vintage store
+STATUS = load_status() if (RESUME or RETRY_FAILED) else {}
+RUN_STATS = {"parsed": 0, "reused": 0, "failed": 0, "quarantined": 0, "skipped": 0}
+PARSER = None
+if ISOLATE_PARSE and "fork" in multiprocessing.get_all_start_methods():
+    warm_reader()
+    PARSER = ParseWorker(parse_workbook)
+PHASE_TIMES = {}    # Seconds per pipeline phase, read by the benchmark suite
+_phase_start = time.perf_counter()
+
+def mark_phase(name):
+    global _phase_start
+    now = time.perf_counter()
+    PHASE_TIMES[name] = PHASE_TIMES.get(name, 0.0) + now - _phase_start
+    _phase_start = now
+
+def keep_sheet(fname, sheet, df, data_hash):
+    # --- DEDUPLICATION LOGIC ---
+    if data_hash in seen_hashes:
+        print(f"    🗑️  Duplicate data found in sheet '{sheet}'. Skipping.")
+        return False
+    seen_hashes.add(data_hash)
+    SHEET_HASHES[f"{fname}::{sheet}"] = data_hash
+    BOOKS[fname][sheet] = df
+    return True
 
 for i, raw in enumerate(URLS, start=1):
     fname = raw.split('/')[-1].replace(".xlsx", "")
     normalized = normalize_url(raw)
+    prev = STATUS.get(fname, {})
+    reuse = (RESUME or RETRY_FAILED) and prev.get("status") == "done" and os.path.exists(_checkpoint_path(fname))
+
+    if reuse:
+        print(f"\n[{i}] ♻️  {fname} (checkpoint)")
+        BOOKS[fname] = {}
+        for sheet, (data_hash, df) in load_checkpoint(fname).items():
+            keep_sheet(fname, sheet, df, data_hash)
+        RUN_STATS["reused"] += 1
+        continue
+    if RETRY_FAILED and prev.get("status") != "failed":
+        print(f"\n[{i}] ⏭️  {fname}: not attempted yet (use --resume to continue the batch)")
+        RUN_STATS["skipped"] += 1
+        continue
     
     print(f"\n[{i}] 📥 {fname}")
     
     try:
         blob = fetch_bytes(normalized)
-        xl = pd.ExcelFile(io.BytesIO(blob), engine="openpyxl")
-        
-        BOOKS[fname] = {}
-        
-        for sheet in xl.sheet_names:
-            if any(x in sheet.lower() for x in ["info", "meta", "title", "back"]): continue
-            
-            df = flatten_excel(xl, sheet, fname)
-            
-            if df is not None and not df.empty and "Date" in df.columns:
-                # --- DEDUPLICATION LOGIC ---
-                # We hash the data content (excluding the filename part of columns)
-                # to detect if the *numbers* are identical to a previous file.
-                
-                # Create a standardized version for hashing
-                df_hash = df.copy().sort_values("Date").reset_index(drop=True)
-                # Remove filename prefix from columns for pure content comparison
-                df_hash.columns = [c.split('|')[-1].strip() if '|' in c else c for c in df_hash.columns]
-                
-                # Convert to string and hash
-                data_str = df_hash.to_string()
-                data_hash = hashlib.md5(data_str.encode('utf-8')).hexdigest()
-                
-                if data_hash in seen_hashes:
-                    print(f"    🗑️  Duplicate data found in sheet '{sheet}'. Skipping.")
-                    continue
-                
-                seen_hashes.add(data_hash)
-                BOOKS[fname][sheet] = df
-                
-                cols = len(df.columns) - 1
-                dates = df["Date"].sort_values()
-                rng = f"{dates.iloc[0].date()} to {dates.iloc[-1].date()}"
-                print(f"    ✅ Sheet '{sheet}': {rng}, {cols} metrics")
-            else:
-                if "info" not in sheet.lower():
-                    print(f"    ⚠️  Sheet '{sheet}': Could not extract data.")
-
     except Exception as e:
         print(f"    ❌ Error: {e}")
+        STATUS[fname] = {"status": "failed", "error": f"{type(e).__name__}: {e}",
+                         "finished": datetime.now().isoformat(timespec="seconds")}
+        RUN_STATS["failed"] += 1
+        save_status(STATUS)
+        continue
 
-# === 7. SAVING ===
+    t_book = time.perf_counter()
+    problem, oversized = precheck_workbook(blob)
+    parsed = None
+    if problem is None:
+        if PARSER is not None:
+            parsed, problem = PARSER.run(blob, fname, oversized)
+        else:
+            try:
+                parsed = parse_workbook(blob, fname, oversized)
+            except Exception as e:
+                problem = f"{type(e).__name__}: {e}"
+
+    if parsed is None:
+        path = quarantine(fname, blob, problem)
+        print(f"    ☣️  Quarantined after {time.perf_counter() - t_book:.1f}s: {problem} -> {path}")
+        STATUS[fname] = {"status": "failed", "error": problem, "quarantine": path,
+                         "finished": datetime.now().isoformat(timespec="seconds")}
+        RUN_STATS["failed"] += 1
+        RUN_STATS["quarantined"] += 1
+        save_status(STATUS)
+        continue
+
+    # What the worker learned about date formats and layouts is kept for the next run
+    DATE_FORMAT_CACHE.update(parsed["date_formats"])
+    LAYOUT_CACHE.update(parsed["layouts"])
+    NEW_LAYOUTS.update(parsed["new_layouts"])
+    release_quarantine(fname)
+
+    BOOKS[fname] = {}
+    kept, warnings = {}, []
+    for event in parsed["events"]:
+        if event[0] == "warn":
+            _, sheet, reason = event
+            warnings.append(f"{sheet}: {reason}")
+            print(f"    ⚠️  Sheet '{sheet}': Could not extract data ({reason}).")
+            continue
+        _, sheet, df, data_hash, note = event
+        if note:
+            warnings.append(f"{sheet}: recovered from {note}")
+            print(f"    ↪️  Sheet '{sheet}': recovered from {note}")
+        if not keep_sheet(fname, sheet, df, data_hash):
+            continue
+        kept[sheet] = (data_hash, df)
+
+        cols = len(df.columns) - 1
+        dates = df["Date"].sort_values()
+        rng = f"{dates.iloc[0].date()} to {dates.iloc[-1].date()}"
+        print(f"    ✅ Sheet '{sheet}': {rng}, {cols} metrics")
+
+    save_checkpoint(fname, kept)
+    STATUS[fname] = {"status": "done", "sheets": list(kept), "warnings": warnings,
+                     "finished": datetime.now().isoformat(timespec="seconds")}
+    RUN_STATS["parsed"] += 1
+
+    save_status(STATUS)
+
+if PARSER is not None:
+    PARSER.stop()
+
+failed = {f: st["error"] for f, st in STATUS.items() if st.get("status") == "failed"}
+print(f"\n📋 Batch: {RUN_STATS['parsed']} parsed, {RUN_STATS['reused']} from checkpoint, "
+      f"{RUN_STATS['failed']} failed ({RUN_STATS['quarantined']} quarantined), {RUN_STATS['skipped']} skipped")
+for f, err in failed.items():
+    print(f"    ❌ {f}: {err}")
+if failed:
+    print("    ↻ Re-run with --retry-failed to retry only these workbooks.")
+
+save_date_formats()
+print(f"\n📅 Date formats cached: {len(DATE_FORMAT_CACHE)} -> {DATE_FORMATS_OUT}")
+save_sheet_layouts()
+print(f"🧭 Sheet layouts cached: {len(LAYOUT_CACHE)} -> {SHEET_LAYOUTS_OUT}")
+if NEW_LAYOUTS:
+    print(f"    🔎 {len(NEW_LAYOUTS)} new layout(s) detected this run; review them in {SHEET_LAYOUTS_OUT}:")
+    for key, fp in NEW_LAYOUTS.items():
+        print(f"       {fp}  {key}")
+
+mark_phase("parse")
+
+# === 9. ASSEMBLY + SAVING ===
+
+EXCEL_JOBS = {}
+DEFERRED_WRITES = []  # (label, callable) when DEFER_WRITES is set
+GROUPED = {}  # "fname::sheet" -> Date-indexed mean, computed once for both wide layouts
+
+def grouped_by_date(fname, sheet, df):
+    key = f"{fname}::{sheet}"
+    if key not in GROUPED:
+        GROUPED[key] = df.groupby("Date").mean(numeric_only=True)
+    return GROUPED[key]
 
 if WRITE_WIDE:
-    print("\n💾 Saving Wide Format...")
+    print("\n💾 Assembling Wide Format...")
     all_dfs = []
     for fname, sheets in BOOKS.items():
         for sheet, df in sheets.items():
             if df is not None and "Date" in df.columns:
-                df_grouped = df.groupby("Date").mean(numeric_only=True).reset_index()
-                all_dfs.append(df_grouped.set_index("Date"))
+                all_dfs.append(grouped_by_date(fname, sheet, df))
     
     if all_dfs:
-        wide_df = pd.concat(all_dfs, axis=1, join="outer").sort_index().reset_index()
-        wide_df.to_excel(WIDE_OUT, index=False)
-        print(f"✅ Saved: {WIDE_OUT}")
+        WIDE_PANEL = pd.concat(all_dfs, axis=1, join="outer").sort_index()
+        EXCEL_JOBS[WIDE_OUT] = {"Sheet1": WIDE_PANEL}
 
 if WRITE_WIDE_BY_FREQ:
-    print("\n💾 Saving Wide Format By Frequency...")
+    print("\n💾 Assembling Wide Format By Frequency...")
     freq_buckets = {"Annual": [], "Quarterly": [], "Monthly": [], "Other": []}
+    SHEET_FREQ = {}  # "file::sheet" -> bucket, for the bundle catalog
     
     for fname, sheets in BOOKS.items():
         for sheet, df in sheets.items():
             if df is not None and "Date" in df.columns and len(df) > 3:
-                df = df.sort_values("Date")
-                dates = df["Date"]
+                dates = df["Date"].sort_values()  # Only the dates need ordering here
                 delta = (dates.iloc[1] - dates.iloc[0]).days
                 
                 if 360 <= delta <= 366: key = "Annual"
@@ -292,16 +924,273 @@ if WRITE_WIDE_BY_FREQ:
                 elif 28 <= delta <= 31: key = "Monthly"
                 else: key = "Other"
                 
-                df_grouped = df.groupby("Date").mean(numeric_only=True).reset_index().set_index("Date")
-                freq_buckets[key].append(df_grouped)
-
-    if any(freq_buckets.values()):
-        with pd.ExcelWriter(WIDE_BY_FREQ_OUT, engine="openpyxl") as writer:
-            for freq, dfs in freq_buckets.items():
-                if dfs:
-                    combined = pd.concat(dfs, axis=1, join="outer").sort_index().reset_index()
-                    combined.to_excel(writer, sheet_name=freq, index=False)
-                    print(f"   Saved sheet: {freq} ({len(combined)} rows)")
-        print(f"✅ Saved: {WIDE_BY_FREQ_OUT}")
+                freq_buckets[key].append(grouped_by_date(fname, sheet, df))
+                SHEET_FREQ[f"{fname}::{sheet}"] = key
+
+    FREQ_PANELS = {
+        freq: pd.concat(dfs, axis=1, join="outer").sort_index()
+        for freq, dfs in freq_buckets.items() if dfs
+    }
+    if FREQ_PANELS:
+        EXCEL_JOBS[WIDE_BY_FREQ_OUT] = FREQ_PANELS
+
+# concat copied them: the per-sheet pieces are not needed past assembly
+GROUPED.clear()
+all_dfs = freq_buckets = None
+mark_phase("assembly")
+
+if EXCEL_JOBS and SKIP_EXCEL:
+    print("⏭️  SKIP_EXCEL set: panels kept in memory only.")
+    EXCEL_JOBS.clear()
+elif EXCEL_JOBS and DEFER_WRITES:
+    # Cleared once written: with COMPACT_PANEL the queued jobs are the last reference to the labeled frames
+    DEFERRED_WRITES.append(("excel", lambda: (write_workbooks(EXCEL_JOBS), EXCEL_JOBS.clear())))
+elif EXCEL_JOBS:
+    write_workbooks(EXCEL_JOBS)
+    EXCEL_JOBS.clear()
+mark_phase("excel")
+
+# === 10. COMPACT PANEL ===
+
+PERIOD_FREQ = {"Annual": "Y", "Quarterly": "Q", "Monthly": "M"}
+LABEL_RE = re.compile(r"^(?P<source>.*?) \| (?P<series>.*?)(?: \((?P<unit>[^()]*)\))?$")
+
+def _frame_bytes(df):
+    # Values + index + the (often huge) column label strings
+    return int(df.memory_usage(deep=True).sum() + df.columns.memory_usage(deep=True))
+
+def _split_label(label):
+    m = LABEL_RE.match(str(label))
+    if not m: return "", str(label), ""
+    return m.group("source"), m.group("series"), m.group("unit") or ""
+
+def _normalize_index(index, freq):
+    idx = pd.DatetimeIndex(index).normalize()
+    if PERIOD_INDEX and freq in PERIOD_FREQ:
+        return idx.to_period(PERIOD_FREQ[freq])
+    return idx.rename("Date")
+
+def compact_panels(panels, value_dtype=VALUE_DTYPE, views=None):
+    """
+    Splits each wide frame into an integer-keyed value store and one shared catalog.
+    Catalog text fields are categoricals, so every label string is stored once.
+    With views ({freq: find_views spec}), derived series keep their catalog row
+    (kind + the label they come from) but no column in the value store.
+    """
+    values, rows, next_id = {}, [], 0
+    for freq, df in panels.items():
+        derived = (views or {}).get(freq, {}).get("views", {})
+        stored = [c for c in df.columns if c not in derived]
+        ids = np.arange(next_id, next_id + df.shape[1], dtype="int32")
+        next_id += df.shape[1]
+        sid_of = dict(zip(df.columns, ids))
+        # copy=False: a float64 store shares the panel's buffer instead of duplicating it
+        block = (df if len(stored) == df.shape[1] else df[stored]).to_numpy(dtype=value_dtype)
+        values[freq] = pd.DataFrame(block, index=_normalize_index(df.index, freq),
+                                    columns=[sid_of[c] for c in stored], copy=False)
+        for sid, label in zip(ids, df.columns):
+            view = derived.get(label, {})
+            rows.append((sid, freq, label) + _split_label(label) +
+                        (view.get("kind", ""), view.get("level", view.get("of", ""))))
+
+    catalog = pd.DataFrame(rows, columns=["series_id", "freq", "label", "source", "series", "unit", "derived", "base"])
+    catalog["series_id"] = catalog["series_id"].astype("int32")
+    for c in ["freq", "source", "series", "unit", "derived", "base"]:
+        catalog[c] = catalog[c].astype("category")
+    return values, catalog.set_index("series_id")
+
+def expand_panel(values, catalog, spec=None):
+    # Inverse of compact_panels for one frequency: labeled float64 frame indexed by Date, views included
+    out = values.astype("float64")
+    out.columns = catalog.loc[values.columns, "label"].tolist()
+    if isinstance(out.index, pd.PeriodIndex):
+        out.index = out.index.to_timestamp().rename("Date")
+    if spec and spec["views"]:
+        freq = catalog.loc[values.columns[0], "freq"] if len(values.columns) else None
+        labels = catalog.loc[catalog["freq"] == freq, "label"].tolist()
+        out = UNIT_VIEWS["expand"](out, spec, labels)
+    return out
+
+class CompactPanels(Mapping):
+    """
+    Read-only {freq: wide frame} over the compact store. Each access rebuilds the
+    labeled float64 frame (views included), so only the store stays resident and
+    the later stages (vintage, bundle, seasonal, validation, charts) read through it.
+    """
+    def __init__(self, values, catalog, views=None):
+        self.values, self.catalog, self.views = values, catalog, views or {}
+
+    def __getitem__(self, freq):
+        return expand_panel(self.values[freq], self.catalog, self.views.get(freq))
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __len__(self):
+        return len(self.values)
+
+PANEL_VIEWS = {}  # {freq: {"views": ..., "denominators": ...}} from unit.views.english.py
+if DERIVED_VIEWS and WRITE_WIDE_BY_FREQ and FREQ_PANELS:
+    UNIT_VIEWS = runpy.run_path(os.path.join(SCRIPT_DIR, "unit.views.english.py"))
+    PANEL_VIEWS = {freq: UNIT_VIEWS["find_views"](panel, freq) for freq, panel in FREQ_PANELS.items()}
+
+if COMPACT_PANEL and WRITE_WIDE_BY_FREQ and FREQ_PANELS:
+    before = sum(_frame_bytes(p) for p in FREQ_PANELS.values())
+    PANEL_VALUES, PANEL_CATALOG = compact_panels(FREQ_PANELS, views=PANEL_VIEWS)
+    after = sum(_frame_bytes(v) for v in PANEL_VALUES.values()) + _frame_bytes(PANEL_CATALOG)
+    n_views = sum(len(v["views"]) for v in PANEL_VIEWS.values())
+    print(f"\n🗜️  Compact panel ({VALUE_DTYPE}): {before / 1e6:.2f} MB -> {after / 1e6:.2f} MB "
+          f"({len(PANEL_CATALOG)} series in catalog, {n_views} derived on demand)")
+    # From here on the store is the panel: the labeled frames go once the Excel jobs release them
+    FREQ_PANELS = CompactPanels(PANEL_VALUES, PANEL_CATALOG, PANEL_VIEWS)
+
+mark_phase("compact")
+
+# === 11. VINTAGE STORE ===
+
+if WRITE_VINTAGE and WRITE_WIDE_BY_FREQ and FREQ_PANELS:
+    vintages = runpy.run_path(os.path.join(SCRIPT_DIR, "vintage.store.english.py"))
+    sheet_columns = {
+        f"{fname}::{sheet}": [c for c in df.columns if c != "Date"]
+        for fname, sheets in BOOKS.items() for sheet, df in sheets.items()
+    }
+    entry = vintages["record_vintage"](FREQ_PANELS, SHEET_HASHES, sheet_columns, store_dir=VINTAGE_DIR)
+    if entry:
+        print(f"\n🗂️  Vintage {entry['released']}: {entry['kind']} with {entry['cells']} cells -> {VINTAGE_DIR}")
+    else:
+        print("\n🗂️  Vintage store: no changed cells since the last release.")
+
+mark_phase("vintage")
+
+# === 12. DATA BUNDLE ===
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+def _sheet_catalog(fname, sheet, df):
+    key = f"{fname}::{sheet}"
+    dates = df["Date"].dropna() if "Date" in df.columns else pd.Series(dtype="datetime64[ns]")
+    return {
+        "file": fname,
+        "sheet": sheet,
+        "hash": SHEET_HASHES.get(key),
+        "freq": SHEET_FREQ.get(key),
+        "rows": int(len(df)),
+        "first": dates.min().strftime("%Y-%m-%d") if len(dates) else None,
+        "last": dates.max().strftime("%Y-%m-%d") if len(dates) else None,
+        "columns": [c for c in df.columns if c != "Date"],
+    }
+
+def write_bundle(path, panels, catalog_path=None, views=None):
+    """
+    Stacks every frequency panel into one Arrow table (one record batch per
+    frequency, union of columns, null where a series does not exist) and writes
+    it as a zstd-compressed IPC file. The catalog travels in the schema metadata,
+    so readers can plan a selective column read from the footer alone.
+    Views ({freq: find_views spec}) are not written: their recipe is in the catalog
+    and unit.views.english.py's read_bundle fills them in.
+    """
+    views = views or {}
+    derived = {freq: views.get(freq, {}).get("views", {}) for freq in panels}
+    stored = {freq: [c for c in wide.columns if c not in derived[freq]] for freq, wide in panels.items()}
+    columns = list(dict.fromkeys(c for cols in stored.values() for c in cols))
+    schema = pa.schema([("Date", pa.timestamp("ns"))] + [(c, pa.float64()) for c in columns])
+    catalog = {
+        "format": 2 if any(derived.values()) else 1,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "freqs": {},
+        "sheets": [_sheet_catalog(fname, sheet, df)
+                   for fname, sheets in BOOKS.items() for sheet, df in sheets.items()],
+    }
+    offset = 0
+    for freq, wide in panels.items():
+        catalog["freqs"][freq] = {"offset": offset, "rows": len(wide), "columns": stored[freq]}
+        if derived[freq]:
+            catalog["freqs"][freq].update(labels=list(wide.columns), views=derived[freq],
+                                          denominators=views[freq]["denominators"])
+        offset += len(wide)
+    schema = schema.with_metadata({"catalog": json.dumps(catalog, ensure_ascii=False)})
+
+    def _write(tmp):
+        options = pa.ipc.IpcWriteOptions(compression="zstd")
+        with pa.ipc.new_file(tmp, schema, options=options) as writer:
+            for freq, wide in panels.items():
+                # Column by column from the panel itself: no reindexed union copy per frequency
+                present = set(stored[freq])
+                writer.write_batch(pa.RecordBatch.from_arrays(
+                    [pa.array(pd.DatetimeIndex(wide.index).as_unit("ns"))] +
+                    [pa.array(wide[c].to_numpy(dtype="float64"), from_pandas=True) if c in present
+                     else pa.nulls(len(wide), pa.float64()) for c in columns],
+                    schema=schema))
+    _atomic(path, _write)
+
+    if catalog_path:
+        def _write_catalog(tmp):
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(catalog, f, ensure_ascii=False, indent=1)
+        _atomic(catalog_path, _write_catalog)
+    return catalog
+
+if WRITE_BUNDLE and WRITE_WIDE_BY_FREQ and FREQ_PANELS:
+    if pa is None:
+        print("⚠️  pyarrow not installed: data bundle skipped.")
+    else:
+        def save_bundle():
+            t0 = time.perf_counter()
+            bundle = write_bundle(DATA_BUNDLE_OUT, FREQ_PANELS, BUNDLE_CATALOG_OUT, PANEL_VIEWS)
+            print(f"\n📦 Bundle: {len(bundle['sheets'])} sheets across {len(bundle['freqs'])} frequencies "
+                  f"({os.path.getsize(DATA_BUNDLE_OUT) / 1e6:.2f} MB) in {time.perf_counter() - t0:.2f}s -> {DATA_BUNDLE_OUT}")
+        if DEFER_WRITES:
+            DEFERRED_WRITES.append(("bundle", save_bundle))
+        else:
+            save_bundle()
+
+mark_phase("bundle")
+
+# === 13. SEASONAL ADJUSTMENT ===
+
+if WRITE_SEASONAL and WRITE_WIDE_BY_FREQ and "Quarterly" in FREQ_PANELS:
+    seasonal = runpy.run_path(os.path.join(SCRIPT_DIR, "seasonal.adjustment.english.py"))
+    t0 = time.perf_counter()
+    SA_PANEL, sa_stats = seasonal["adjust_panel"](FREQ_PANELS["Quarterly"], cache_path=SEASONAL_CACHE)
+    sa_report = seasonal["compare_official"](FREQ_PANELS["Quarterly"], SA_PANEL)
+    seasonal["save_outputs"](SA_PANEL, sa_report, SEASONAL_OUT)
+    print(f"\n🌦️  Seasonal adjustment: {sa_stats['series']} NSA series, {sa_stats['computed']} computed, "
+          f"{sa_stats['cached']} cached in {time.perf_counter() - t0:.2f}s -> {SEASONAL_OUT}")
+    print(f"    {seasonal['summarize'](sa_report)}")
+
+mark_phase("seasonal")
+
+# === 14. UNIFIED QUARTERLY PANEL ===
+
+if WRITE_UNIFIED_QUARTERLY and WRITE_WIDE_BY_FREQ and {"Annual", "Quarterly"} <= set(FREQ_PANELS):
+    disagg = runpy.run_path(os.path.join(SCRIPT_DIR, "temporal.disaggregation.english.py"))
+    t0 = time.perf_counter()
+    UNIFIED_QUARTERLY, disagg_report = disagg["disaggregate"](FREQ_PANELS["Annual"], FREQ_PANELS["Quarterly"])
+    elapsed = time.perf_counter() - t0
+    disagg["save_outputs"](UNIFIED_QUARTERLY, disagg_report, UNIFIED_QUARTERLY_OUT)
+    methods = disagg_report["method"].value_counts().to_dict()
+    print(f"\n🧩 Unified quarterly panel: {len(disagg_report)} annual series disaggregated "
+          f"({methods.get('chow-lin', 0)} Chow-Lin, {methods.get('denton', 0)} Denton) in {elapsed:.2f}s, "
+          f"{UNIFIED_QUARTERLY.shape[1]} series in total -> {UNIFIED_QUARTERLY_OUT}")
+    off_scale = disagg["scale_check"](disagg_report)
+    for r in off_scale.itertuples():
+        print(f"    ⚠️  Off its quarterly twin's scale ({r.twin_ratio:.2f}x {r.twin}): {r.series}")
+
+mark_phase("disaggregation")
+
+# === 15. VALIDATION ===
+
+if VALIDATE_PANELS and WRITE_WIDE_BY_FREQ and FREQ_PANELS:
+    validation = runpy.run_path(os.path.join(SCRIPT_DIR, "panel.validation.english.py"))
+    t0 = time.perf_counter()
+    VALIDATION_REPORT = validation["validate"](FREQ_PANELS, BOOKS)
+    VALIDATION_REPORT.to_csv(VALIDATION_OUT, index=False)
+    print(f"\n🔍 Validation: {validation['summarize'](VALIDATION_REPORT)} "
+          f"in {(time.perf_counter() - t0) * 1000:.0f} ms -> {VALIDATION_OUT}")
+
+mark_phase("validation")
 
 print("\n=== DONE ===")
@@ -0,0 +1,313 @@
+# -*- coding: utf-8 -*-
+"""
+LEAD/LAG ENGINE (Which series move first: lagged correlations across the whole panel)
+Growth rates of every series are correlated with every other series at each lag,
+NaN-aware, as blocks of matrix products instead of per-pair corr() calls. The
+best lag per pair is kept, the strongest pairs get rolling-window correlations,
+and the result is cached per panel version. The plot maker charts the top pairs
+from leadlag_top.json in its own style.
+Quarterly and monthly growth is year on year, so the seasonal cycle of NSA series
+does not pass for a lead at lags 4/8. Derived views (duplicates, GDP shares) and
+share-unit variants are ranked through their level, and series that move together
+at lag 0 (one identity restated across workbooks, an SA/NSA twin) are kept once.
+
+Usage:
+    python lead.lag.english.py [Annual|Quarterly] [--target "Gross Domestic Product" "Constant prices" GDP_seasonally] [--top 20]
+"""
+
+import os
+import sys
+import json
+import time
+import runpy
+import hashlib
+import numpy as np
+import pandas as pd
+
+# --- 1. CONFIGURATION ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+GITHUB_URL = "https://github.com/TheodorosKourtalis/public.debt.excels.english/raw/main/combined_wide_by_freq.xlsx"
+FILE_NAME = 'combined_wide_by_freq.xlsx'
+BUNDLE_NAME = 'combined_bundle.arrow'
+OUT_NAME = 'leadlag_top.json'     # Read by the plot maker
+CACHE_DIR = 'leadlag_cache'
+
+MAX_LAG = {'Annual': 3, 'Quarterly': 8, 'Monthly': 12}
+WINDOW = {'Annual': 10, 'Quarterly': 20, 'Monthly': 36}   # Rolling-correlation window (periods)
+MIN_OVERLAP = 12      # Fewer common observations than this and a correlation is not reported
+TOP_K = 20
+BLOCK = 512           # Columns per block: bounds memory at BLOCK x BLOCK per matrix product
+SKIP_SAME_SOURCE = True  # Series of one workbook (levels vs shares of the same thing) are not "leads"
+SEASON = {'Quarterly': 4, 'Monthly': 12}   # Growth over this many periods (year on year): NSA and SA series alike
+RATE_SOURCES = ["Growth_rate", "Contribution_to"]   # Already rates of change: correlated as published
+SAME_SERIES_CORR = 0.98  # |corr| at lag 0 at or above this: one series published twice, ranked once
+UNIT_VIEWS = runpy.run_path(os.path.join(SCRIPT_DIR, "unit.views.english.py"))
+IS_NSA = runpy.run_path(os.path.join(SCRIPT_DIR, "seasonal.adjustment.english.py"))["is_nsa"]
+
+# === 2. TRANSFORM ===
+
+def growth(values, periods=1, rates=None):
+    """
+    Log-growth (%) over `periods` rows for strictly positive columns, differences
+    otherwise; the first rows are NaN. Columns flagged in `rates` are kept as they are.
+    """
+    positive = np.all((values > 0) | np.isnan(values), axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        logs = np.where(positive, np.log(values), values)
+    out = np.full_like(values, np.nan)
+    out[periods:] = (logs[periods:] - logs[:-periods]) * np.where(positive, 100.0, 1.0)
+    if rates is not None:
+        out[:, rates] = values[:, rates]
+    return out
+
+def is_rate(label):
+    return any(s.lower() in label.lower() for s in RATE_SOURCES)
+
+def _is_share(label):
+    unit = UNIT_VIEWS["split_label"](label)[1].lower()
+    return 'share' in unit or '%' in unit
+
+def find_target(labels, keywords):
+    """
+    Labels a --target names: the first keyword must be in the category (not the source
+    or the unit, where "GDP" is everywhere), the others anywhere in the label. A
+    category equal to the first keyword wins over one that merely contains it.
+    """
+    category = lambda c: UNIT_VIEWS["split_label"](c)[0].partition(' | ')[2].strip().lower()
+    first, rest = keywords[0].lower(), [w.lower() for w in keywords[1:]]
+    matches = [c for c in labels if first in category(c) and all(w in c.lower() for w in rest)]
+    exact = [c for c in matches if category(c) == first]
+    return exact or matches
+
+def level_columns(labels, keep=None):
+    """Labels minus share-unit variants ("Share of total", "GDP share") of a category also published as a level."""
+    levels = {UNIT_VIEWS["split_label"](c)[0] for c in labels if not _is_share(c)}
+    return [c for c in labels if c == keep or not (_is_share(c) and UNIT_VIEWS["split_label"](c)[0] in levels)]
+
+# === 3. CORRELATION KERNELS ===
+
+def lagged_corr(x, y, lag):
+    """
+    corr(x[t], y[t + lag]) for every column pair, over rows where both are finite.
+    Returns (corr, n) as (x columns x y columns) arrays.
+    """
+    if lag:
+        x, y = x[:-lag], y[lag:]
+    mx, my = np.isfinite(x).astype(float), np.isfinite(y).astype(float)
+    x0, y0 = np.nan_to_num(x), np.nan_to_num(y)
+    n = mx.T @ my
+    sx, sy = x0.T @ my, mx.T @ y0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = x0.T @ y0 - sx * sy / n
+        vx = (x0 ** 2).T @ my - sx ** 2 / n
+        vy = mx.T @ (y0 ** 2) - sy ** 2 / n
+        corr = cov / np.sqrt(vx * vy)
+    corr[(n < MIN_OVERLAP) | ~np.isfinite(corr)] = np.nan
+    return np.clip(corr, -1.0, 1.0), n
+
+def best_lag(x, y, lags):
+    """Per pair: the lag with the largest |corr|. Returns (corr, lag, n)."""
+    best = np.full((x.shape[1], y.shape[1]), np.nan)
+    best_lag_ = np.zeros(best.shape, dtype=int)
+    best_n = np.zeros(best.shape)
+    for lag in lags:
+        corr, n = lagged_corr(x, y, lag)
+        better = np.abs(corr) > np.nan_to_num(np.abs(best), nan=-1.0)
+        best = np.where(better, corr, best)
+        best_lag_ = np.where(better, lag, best_lag_)
+        best_n = np.where(better, n, best_n)
+    return best, best_lag_, best_n
+
+def rolling_corr(x, y, window):
+    """Rolling correlation of the columns of x with the same columns of y (NaN-aware, via cumulative sums)."""
+    ok = np.isfinite(x) & np.isfinite(y)
+    x0, y0 = np.where(ok, x, 0.0), np.where(ok, y, 0.0)
+    def roll(a):
+        c = np.vstack([np.zeros((1, a.shape[1])), np.cumsum(a, axis=0)])
+        out = np.full(a.shape, np.nan)
+        out[window - 1:] = c[window:] - c[:-window]
+        return out
+    n = roll(ok.astype(float))
+    sx, sy = roll(x0), roll(y0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = roll(x0 * y0) - sx * sy / n
+        vx = roll(x0 ** 2) - sx ** 2 / n
+        vy = roll(y0 ** 2) - sy ** 2 / n
+        corr = cov / np.sqrt(vx * vy)
+    corr[(n < max(window // 2, 3)) | ~np.isfinite(corr)] = np.nan
+    return np.clip(corr, -1.0, 1.0)
+
+# === 4. TOP PAIRS ===
+
+def _source(label):
+    return label.split(' | ')[0]
+
+def distinct_columns(z, labels, first=None):
+    """
+    Positions of the columns worth ranking. Of columns whose growth moves together
+    at lag 0 (|corr| >= SAME_SERIES_CORR), only the first in preference order is kept:
+    `first`, then seasonally adjusted before NSA, levels before shares, panel order.
+    """
+    order = np.array(sorted(range(len(labels)), key=lambda i: (i != first, IS_NSA(labels[i]), _is_share(labels[i]), i)))
+    zo = z[:, order]
+    same = []
+    for i0 in range(0, len(order), BLOCK):
+        rows = np.arange(i0, min(i0 + BLOCK, len(order)))
+        for j0 in range(i0, len(order), BLOCK):
+            cols = np.arange(j0, min(j0 + BLOCK, len(order)))
+            corr, _ = lagged_corr(zo[:, rows], zo[:, cols], 0)
+            r, c = np.nonzero((np.abs(np.nan_to_num(corr)) >= SAME_SERIES_CORR) & (rows[:, None] < cols[None, :]))
+            same += zip(rows[r].tolist(), cols[c].tolist())
+    keep = np.ones(len(order), dtype=bool)
+    for i, j in sorted(same):
+        # Pairs come in order of i, so keep[i] is already final here
+        if keep[i]:
+            keep[j] = False
+    return np.sort(order[keep])
+
+def top_pairs(z, labels, lags, k=TOP_K, target=None):
+    """
+    Strongest (leader, follower, lag) triples: leader at t vs follower at t + lag.
+    A pair only leads if its best lag beats the contemporaneous |corr|: otherwise
+    the "lead" is the series' own persistence (overlapping year-on-year rates).
+    With a target column only pairs that have it as follower are ranked.
+    Blocks of BLOCK columns keep memory flat; only each block's top k survive.
+    """
+    sources = np.array([_source(c) for c in labels])
+    followers = [target] if target is not None else range(0, z.shape[1], BLOCK)
+    cand = []
+    for i0 in range(0, z.shape[1], BLOCK):
+        rows = np.arange(i0, min(i0 + BLOCK, z.shape[1]))
+        for j0 in followers:
+            cols = np.array([j0]) if target is not None else np.arange(j0, min(j0 + BLOCK, z.shape[1]))
+            corr, lag, n = best_lag(z[:, rows], z[:, cols], lags)
+            score = np.abs(corr)
+            score[rows[:, None] == cols[None, :]] = np.nan
+            score[np.abs(lagged_corr(z[:, rows], z[:, cols], 0)[0]) >= score] = np.nan
+            if SKIP_SAME_SOURCE:
+                score[sources[rows][:, None] == sources[cols][None, :]] = np.nan
+            flat = np.flatnonzero(np.isfinite(score))
+            if not len(flat):
+                continue
+            keep = flat[np.argsort(-score.ravel()[flat], kind='stable')[:k]]
+            r, c = np.unravel_index(keep, score.shape)
+            cand += [(float(score[a, b]), int(rows[a]), int(cols[b]), int(lag[a, b]), float(corr[a, b]), int(n[a, b]))
+                     for a, b in zip(r, c)]
+    cand.sort(key=lambda t: -t[0])
+    return [{"leader": labels[i], "follower": labels[j], "lag": lag, "corr": corr, "n": n}
+            for _, i, j, lag, corr, n in cand[:k]]
+
+# === 5. ENGINE + CACHE ===
+
+def panel_version(panel, params):
+    h = hashlib.md5(json.dumps(params, sort_keys=True).encode('utf-8'))
+    h.update("\x1f".join(map(str, panel.columns)).encode('utf-8'))
+    h.update(pd.DatetimeIndex(panel.index).asi8.tobytes())
+    h.update(np.ascontiguousarray(panel.to_numpy(dtype='float64')).tobytes())
+    return h.hexdigest()
+
+def analyze(panel, freq, target=None, k=TOP_K, cache_dir=CACHE_DIR):
+    """
+    Top lead/lag pairs of a panel indexed by Date (+ rolling correlations of each).
+    Cached per panel version: an unchanged panel is answered from disk.
+    """
+    params = {"freq": freq, "target": target, "k": k, "max_lag": MAX_LAG.get(freq, 4),
+              "window": WINDOW.get(freq, 20), "min_overlap": MIN_OVERLAP, "skip_same_source": SKIP_SAME_SOURCE,
+              "season": SEASON.get(freq, 1), "same_series_corr": SAME_SERIES_CORR, "levels_only": True,
+              "beats_lag0": True, "rate_sources": RATE_SOURCES}
+    version = panel_version(panel, params)
+    cache_path = os.path.join(cache_dir, f"{version}.json") if cache_dir else None
+    if cache_path and os.path.exists(cache_path):
+        with open(cache_path, encoding='utf-8') as f:
+            return json.load(f), True
+
+    panel = panel.sort_index()
+    # A view (duplicate column or GDP share) or share variant is ranked through its level
+    views = UNIT_VIEWS["find_views"](panel, freq)["views"]
+    panel = panel[level_columns([c for c in panel.columns if c == target or c not in views], target)]
+    labels = list(panel.columns)
+    z = growth(panel.to_numpy(dtype='float64'), params["season"], np.array([is_rate(c) for c in labels], dtype=bool))
+    keep = distinct_columns(z, labels, labels.index(target) if target is not None else None)
+    z, labels = z[:, keep], [labels[i] for i in keep]
+    target_j = labels.index(target) if target is not None else None
+    pairs = top_pairs(z, labels, range(1, params["max_lag"] + 1), k, target_j)
+
+    window = params["window"]
+    dates = pd.DatetimeIndex(panel.index)
+    if pairs:
+        lead = np.stack([z[:, labels.index(p["leader"])] for p in pairs], axis=1)
+        follow = np.stack([z[:, labels.index(p["follower"])] for p in pairs], axis=1)
+        # Align leader at t with follower at t + lag, indexed by the follower's date
+        shifted = np.full_like(lead, np.nan)
+        for m, p in enumerate(pairs):
+            shifted[p["lag"]:, m] = lead[:len(lead) - p["lag"], m]
+        rolling = rolling_corr(shifted, follow, window)
+        for m, p in enumerate(pairs):
+            p["rolling"] = [None if np.isnan(v) else round(float(v), 4) for v in rolling[:, m]]
+
+    result = {"version": version, "freq": freq, "target": target, "transform": "growth" if params["season"] == 1 else "year-on-year growth", "window": window,
+              "dates": [d.strftime('%Y-%m-%d') for d in dates], "pairs": pairs}
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False)
+    return result, False
+
+def save_top(result, path=OUT_NAME):
+    # One entry per frequency, so Annual and Quarterly runs sit side by side for the plot maker
+    try:
+        with open(path, encoding='utf-8') as f:
+            top = json.load(f)
+    except (OSError, ValueError):
+        top = {}
+    top[result["freq"]] = result
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(top, f, ensure_ascii=False)
+
+# === 6. DATA LOADING ===
+
+def load_panel(freq):
+    if os.path.exists(BUNDLE_NAME):
+        try:
+            read_bundle = runpy.run_path(os.path.join(SCRIPT_DIR, "unit.views.english.py"))["read_bundle"]
+            return read_bundle(BUNDLE_NAME, [freq])[freq]
+        except ImportError:
+            pass
+    source = FILE_NAME if os.path.exists(FILE_NAME) else GITHUB_URL
+    df = pd.read_excel(source, sheet_name=freq, engine='openpyxl')
+    df['Date'] = pd.to_datetime(df['Date'])
+    return df.sort_values('Date').set_index('Date')
+
+# === 7. MAIN ===
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    freq = args[0] if args and not args[0].startswith('--') else 'Annual'
+    k = int(args[args.index('--top') + 1]) if '--top' in args else TOP_K
+    keywords = []
+    if '--target' in args:
+        for a in args[args.index('--target') + 1:]:
+            if a.startswith('--'):
+                break
+            keywords.append(a)
+
+    panel = load_panel(freq)
+    target = None
+    if keywords:
+        matches = find_target(panel.columns, keywords)
+        if not matches:
+            sys.exit(f"No {freq} series matches {keywords}.")
+        if len(matches) > 1:
+            sys.exit(f"{len(matches)} {freq} series match {keywords}; add a keyword to pick one:\n    "
+                     + "\n    ".join(matches))
+        target = matches[0]
+
+    t0 = time.perf_counter()
+    result, cached = analyze(panel, freq, target, k)
+    save_top(result)
+    n = panel.shape[1]
+    scope = f"vs {target}" if target else f"{n * (n - 1)} ordered pairs"
+    print(f"🔗 {freq}: {scope}, lags 1-{MAX_LAG.get(freq, 4)} "
+          f"{'from cache' if cached else 'computed'} in {time.perf_counter() - t0:.2f}s -> {OUT_NAME}")
+    for p in result["pairs"][:10]:
+        print(f"    {p['corr']:+.3f}  lag {p['lag']}  {p['leader']}  ->  {p['follower']}")
@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+"""
+PANEL VALIDATION (Accounting identities checked across the whole panel at once)
+Every identity (component sums vs totals, budget balance, cross-workbook totals)
+is one row of a coefficient matrix, so a frequency is checked with a single
+matrix product. Seasonally adjusted series are checked against the annual sums
+of their unadjusted counterparts, and the loader adds duplicate-date conflicts
+found before its groupby("Date").mean(). Writes one compact CSV report.
+
+Usage:
+    python panel.validation.english.py [--out validation_report.csv]
+"""
+
+import os
+import re
+import sys
+import time
+import runpy
+import numpy as np
+import pandas as pd
+
+# --- 1. CONFIGURATION ---
+GITHUB_URL = "https://github.com/TheodorosKourtalis/public.debt.excels.english/raw/main/combined_wide_by_freq.xlsx"
+FILE_NAME = 'combined_wide_by_freq.xlsx'
+BUNDLE_NAME = 'combined_bundle.arrow'
+OUT_NAME = 'validation_report.csv'
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Label parsing and published-precision inference shared with the unit views
+VIEWS = runpy.run_path(os.path.join(SCRIPT_DIR, "unit.views.english.py"))
+
+REL_TOL = 0.001       # Gap allowed relative to the sum of |terms|, on top of the rounding slack
+SA_TOL = 0.01         # Annual SA vs NSA sums: calendar effects leave small differences
+DUP_TOL = 1e-9        # Duplicate dates whose values differ by more than this are conflicts
+
+# Categories that are the total of every other category of the same source and unit
+TOTAL_NAMES = ["General Government Consolidated Debt"]
+# Chain-linked volumes do not add up across components
+NON_ADDITIVE_UNITS = ["constant prices"]
+# Explicit identities: (name, total, [(sign, component), ...]) on "source | category" with the
+# data-frequency tag and -1/_ suffixes dropped from the source. Checked in every unit and
+# frequency where all the terms exist. The fiscal workbooks publish expenditures as negatives.
+FISCAL = "Government_Expenditures_Revenues_and_Budget_Balance"
+IDENTITIES = [
+    ("Budget balance = revenues - expenditures", f"{FISCAL} | Budget balance",
+     [(1, f"{FISCAL} | Revenues"), (1, f"{FISCAL} | Expenditures")]),
+    ("Revenues by source total = revenues", "Government_revenues_by_source | Total",
+     [(1, f"{FISCAL} | Revenues")]),
+    ("Expenditures by use total = expenditures", "Government_expenditures_by_use | Total",
+     [(-1, f"{FISCAL} | Expenditures")]),
+    ("COFOG total = expenditures", "Government_expenditures_by_function | Total",
+     [(-1, f"{FISCAL} | Expenditures")]),
+    ("Direct taxes = direct taxes by source", "Government_revenues_by_source | Direct taxes",
+     [(1, "Direct_taxes_by_source | Total direct taxes")]),
+    ("Indirect taxes = indirect taxes by source", "Government_revenues_by_source | Indirect taxes",
+     [(1, "Indirect_taxes_by_source | Total indirect taxes")]),
+    ("Social contributions = by contributor", "Government_revenues_by_source | Social contributions",
+     [(1, "Social_contributions_by_contributor | Total social contributions")]),
+    ("Social contributions by contributor = by type", "Social_contributions_by_contributor | Total social contributions",
+     [(1, "Social_contributions_by_type_of_contribution | Total social contributions")]),
+]
+
+REPORT_COLUMNS = ["check", "freq", "name", "unit", "points", "violations", "max_gap_pct", "first", "last"]
+
+# === 2. LABELS ===
+
+def split_label(label):
+    """'Source_(annual_data_...)-1 | Category (Unit (2020))' -> (source key, category, unit)."""
+    stem, unit = VIEWS["split_label"](label)
+    source, _, category = stem.partition(' | ')
+    source = re.sub(r'_?\((annual|quarterly)_data[^)]*\)', '', source.strip())
+    source = re.sub(r'(-\d+|_)+$', '', source)
+    return source, category.strip(), unit
+
+# === 3. IDENTITY MATRIX ===
+
+def identity_rows(columns):
+    """
+    [(name, unit, {column position: coefficient})]: residual = total - sum(components).
+    Auto "Total ..." identities per source and unit, plus the explicit IDENTITIES.
+    """
+    index = {}
+    groups = {}
+    for j, c in enumerate(columns):
+        source, category, unit = split_label(c)
+        index.setdefault((f"{source} | {category}".lower(), unit), j)
+        groups.setdefault((source, unit), []).append((category, j))
+
+    rows = []
+    additive = lambda unit: not any(w in unit.lower() for w in NON_ADDITIVE_UNITS)
+    for (source, unit), members in groups.items():
+        totals = [(cat, j) for cat, j in members
+                  if cat.lower().startswith("total") or cat in TOTAL_NAMES]
+        if len(totals) == 1 and len(members) > 2 and additive(unit):
+            total_cat, total_j = totals[0]
+            coef = {total_j: 1.0}
+            coef.update({j: -1.0 for cat, j in members if j != total_j})
+            rows.append((f"{source} | {total_cat} = sum of components", unit, coef))
+
+    units = {unit for _, unit in index if additive(unit)}
+    for name, total, components in IDENTITIES:
+        for unit in units:
+            terms = [(1, total)] + [(-sign, comp) for sign, comp in components]
+            keys = [(label.lower(), unit) for _, label in terms]
+            if all(k in index for k in keys):
+                coef = {}
+                for (sign, _), k in zip(terms, keys):
+                    coef[index[k]] = coef.get(index[k], 0.0) + sign
+                rows.append((name, unit, coef))
+    return rows
+
+def check_identities(panel, freq):
+    """
+    All identities of one frequency panel (indexed by Date) as matrix products. A point
+    violates an identity when the residual exceeds both the rounding slack of its terms
+    (half a unit in the last published decimal each) and REL_TOL of the sum of |terms|.
+    """
+    rows = identity_rows(list(panel.columns))
+    if not rows:
+        return pd.DataFrame(columns=REPORT_COLUMNS)
+    A = np.zeros((len(rows), panel.shape[1]))
+    for i, (_, _, coef) in enumerate(rows):
+        A[i, list(coef)] = list(coef.values())
+    values = panel.to_numpy(dtype='float64')
+    missing = np.isnan(values)
+    filled = np.where(missing, 0.0, values)
+
+    residual = filled @ A.T
+    scale = np.abs(filled) @ np.abs(A).T
+    slack = (0.5 * 10.0 ** -VIEWS["decimals"](values)) @ np.abs(A).T
+    incomplete = missing.astype(float) @ (A != 0).T > 0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        gap = np.where(incomplete | (scale == 0), np.nan, np.abs(residual) / scale)
+    bad = (np.abs(residual) > slack) & (gap > REL_TOL)
+    return _summarize("identity", freq, [r[0] for r in rows], [r[1] for r in rows],
+                      gap, bad, pd.DatetimeIndex(panel.index))
+
+def _summarize(check, freq, names, units, gap, bad, dates):
+    # One report row per identity / pair: gap is (dates x checks) with NaN where not checkable
+    checked = np.isfinite(gap)
+    bad = checked & bad
+    first = np.where(bad.any(axis=0), bad.argmax(axis=0), -1)
+    last = np.where(bad.any(axis=0), len(bad) - 1 - bad[::-1].argmax(axis=0), -1)
+    with np.errstate(invalid='ignore'):
+        worst = np.where(checked.any(axis=0), np.nanmax(np.where(checked, gap, -np.inf), axis=0), np.nan)
+    day = lambda i: dates[i].strftime('%Y-%m-%d') if i >= 0 else None
+    return pd.DataFrame({
+        "check": check, "freq": freq, "name": names, "unit": units,
+        "points": checked.sum(axis=0), "violations": bad.sum(axis=0),
+        "max_gap_pct": worst * 100,
+        "first": [day(i) for i in first], "last": [day(i) for i in last],
+    }, columns=REPORT_COLUMNS)
+
+# === 4. SA vs NSA ANNUAL SUMS ===
+
+def check_sa_sums(quarterly):
+    """Annual sums of each official SA flow series vs its NSA counterpart (complete years only)."""
+    seasonal = runpy.run_path(os.path.join(SCRIPT_DIR, "seasonal.adjustment.english.py"))
+    pairs = {nsa: sa for nsa, sa in seasonal["official_pairs"](list(quarterly.columns)).items()
+             if re.search(r'prices|euros', split_label(nsa)[2], re.IGNORECASE)}
+    if not pairs:
+        return pd.DataFrame(columns=REPORT_COLUMNS)
+    years = pd.DatetimeIndex(quarterly.index).year
+    nsa = quarterly[list(pairs)].groupby(years).sum(min_count=4)
+    sa = quarterly[list(pairs.values())].groupby(years).sum(min_count=4)
+    # Relative to the gross annual flow, so series that change sign (inventories) stay comparable
+    gross = quarterly[list(pairs)].abs().groupby(years).sum(min_count=4).to_numpy()
+    counts = quarterly[list(pairs)].notna().groupby(years).sum().to_numpy()
+    with np.errstate(invalid='ignore', divide='ignore'):
+        gap = np.abs(sa.to_numpy() - nsa.to_numpy()) / gross
+    gap[counts < 4] = np.nan
+    dates = pd.to_datetime([f"{y}-01-01" for y in nsa.index])
+    parts = [split_label(c) for c in pairs.values()]
+    return _summarize("sa_vs_nsa", "Quarterly", [f"{src} | {cat}" for src, cat, _ in parts],
+                      [unit for _, _, unit in parts], gap, gap > SA_TOL, dates)
+
+# === 5. DUPLICATE DATES ===
+
+def check_duplicates(books):
+    """
+    {fname: {sheet: long frame with Date}} -> conflicts among rows sharing a Date
+    (the loader averages them). Only sheets that have duplicates are inspected.
+    """
+    out = []
+    for fname, sheets in books.items():
+        for sheet, df in sheets.items():
+            if df is None or "Date" not in df.columns:
+                continue
+            dup = df["Date"].duplicated(keep=False)
+            if not dup.any():
+                continue
+            g = df.loc[dup].groupby("Date").agg(['min', 'max'])
+            hi, lo = g.xs('max', axis=1, level=1), g.xs('min', axis=1, level=1)
+            spread = (hi - lo).abs()
+            bad = (spread > DUP_TOL).any(axis=1)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                worst = np.nanmax((spread / ((hi + lo).abs() / 2)).to_numpy(), initial=0.0)
+            out.append({"check": "duplicate_dates", "freq": None, "name": f"{fname}::{sheet}", "unit": None,
+                        "points": int(dup.sum()), "violations": int(bad.sum()),
+                        "max_gap_pct": float(worst * 100),
+                        "first": bad[bad].index.min().strftime('%Y-%m-%d') if bad.any() else None,
+                        "last": bad[bad].index.max().strftime('%Y-%m-%d') if bad.any() else None})
+    return pd.DataFrame(out, columns=REPORT_COLUMNS)
+
+# === 6. STAGE ===
+
+def validate(panels, books=None):
+    """Full report for {freq: panel indexed by Date} (+ the loader's per-sheet frames)."""
+    parts = [check_identities(panel, freq) for freq, panel in panels.items()]
+    if "Quarterly" in panels:
+        parts.append(check_sa_sums(panels["Quarterly"]))
+    if books:
+        parts.append(check_duplicates(books))
+    parts = [p for p in parts if len(p)]
+    if not parts:
+        return pd.DataFrame(columns=REPORT_COLUMNS)
+    return pd.concat(parts, ignore_index=True)
+
+def summarize(report):
+    bad = report[report["violations"] > 0]
+    return f"{len(report)} checks, {len(bad)} with violations ({int(bad['violations'].sum())} points)"
+
+# === 7. DATA LOADING ===
+
+def load_panels():
+    if os.path.exists(BUNDLE_NAME):
+        try:
+            return VIEWS["read_bundle"](BUNDLE_NAME)
+        except ImportError:
+            pass
+    source = FILE_NAME if os.path.exists(FILE_NAME) else GITHUB_URL
+    sheets = pd.read_excel(source, sheet_name=None, engine='openpyxl')
+    panels = {}
+    for freq, df in sheets.items():
+        if 'Date' in df.columns:
+            df['Date'] = pd.to_datetime(df['Date'])
+            panels[freq] = df.sort_values('Date').set_index('Date')
+    return panels
+
+# === 8. MAIN ===
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    out_path = args[args.index('--out') + 1] if '--out' in args else OUT_NAME
+
+    panels = load_panels()
+    t0 = time.perf_counter()
+    report = validate(panels)
+    elapsed = time.perf_counter() - t0
+    report.to_csv(out_path, index=False)
+    print(f"🔍 {summarize(report)} in {elapsed * 1000:.0f} ms -> {out_path}")
+    worst = report[report["violations"] > 0].sort_values("max_gap_pct", ascending=False)
+    for _, r in worst.head(10).iterrows():
+        print(f"    {r['violations']:>4}/{r['points']:<4} {r['max_gap_pct']:8.2f}%  {r['freq']}  {r['name']} ({r['unit']})")
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+ONE-SHOT PIPELINE (Loader -> chart packs in one process, no Excel round-trip)
+Runs the loader, hands its per-frequency panels straight to the plot maker and
+writes the Excel workbooks + data bundle on a background thread meanwhile.
+
+Usage:
+    python pipeline.english.py [Annual Quarterly ...] [--resume] [--retry-failed] [--dashboard]
+"""
+
+import os
+import sys
+import time
+import runpy
+import threading
+
+# --- 1. CONFIGURATION ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+LOADER = os.path.join(SCRIPT_DIR, "excel.loader.preparer.english.py")
+PLOT_MAKER = os.path.join(SCRIPT_DIR, "plot.maker.2.7.english.py")
+DASHBOARD = os.path.join(SCRIPT_DIR, "dashboard.export.english.py")
+DEFAULT_FREQS = ["Annual"]
+
+# === 2. BACKGROUND PERSISTENCE ===
+
+class Persister(threading.Thread):
+    """Runs the loader's deferred writes in order; errors are kept for the final report."""
+    def __init__(self, writes):
+        super().__init__(name="persist", daemon=False)
+        self.writes = writes
+        self.errors = {}
+        self.times = {}
+
+    def run(self):
+        for label, write in self.writes:
+            t0 = time.perf_counter()
+            try:
+                write()
+            except Exception as e:
+                self.errors[label] = f"{type(e).__name__}: {e}"
+            self.times[label] = time.perf_counter() - t0
+
+# === 3. MAIN ===
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    freqs = [a for a in args if not a.startswith("--")] or DEFAULT_FREQS
+    flags = [a for a in args if a.startswith("--")]
+    t0 = time.perf_counter()
+
+    sys.argv = [LOADER, "--defer-writes"] + flags
+    loader = runpy.run_path(LOADER, run_name="__main__")
+    panels = loader.get("FREQ_PANELS") or {}
+    t_loaded = time.perf_counter()
+
+    persister = Persister(loader.get("DEFERRED_WRITES", []))
+    persister.start()
+
+    for freq in freqs:
+        if freq not in panels:
+            print(f"⚠️  No {freq} panel in this run. Skipping its chart pack.")
+            continue
+        sys.argv = [PLOT_MAKER, freq]
+        try:
+            runpy.run_path(PLOT_MAKER, run_name="__main__", init_globals={"IN_MEMORY_PANELS": panels})
+        except SystemExit as e:
+            print(f"❌ Chart pack {freq} stopped: {e}")
+    if "--dashboard" in flags and panels:
+        # Every frequency, straight from memory: the static site covers the whole catalog
+        dashboard = runpy.run_path(DASHBOARD)
+        t_dash = time.perf_counter()
+        dashboard["report"](dashboard["export"](panels), dashboard["OUT_DIR"], time.perf_counter() - t_dash)
+    t_charts = time.perf_counter()
+
+    persister.join()
+    print(f"\n⏱️  Loader {t_loaded - t0:.1f}s, charts {t_charts - t_loaded:.1f}s, "
+          f"waited {time.perf_counter() - t_charts:.1f}s for background writes")
+    for label, secs in persister.times.items():
+        status = f"❌ {persister.errors[label]}" if label in persister.errors else "✅"
+        print(f"    💾 {label}: {secs:.1f}s {status}")
+    print("\n=== PIPELINE DONE ===")
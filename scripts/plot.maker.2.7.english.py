@@ -3,88 +3,125 @@ import numpy as np
 import matplotlib.pyplot as plt
 import textwrap
 import sys
-import re  # Imported for cleaning text
 import matplotlib.patheffects as pe  # Import for the white halo effect
 import os
+import io
+import json
+import urllib.request
+import runpy
+
+# Copy-on-Write: column selections and row filters below are views until written (always on from pandas 3)
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
 
 # -----------------------------------------------------------------------------
 # 1. SETUP & STYLE: "CLASSIC LUXURY"
 # -----------------------------------------------------------------------------
-plt.style.use('default')
-
-CLASSIC_COLORS = {
-    'navy': '#002E5D',
-    'burgundy': '#800020',
-    'gold': '#C5A059',
-    'forest': '#2E4600',
-    'slate': '#4B5358',
-    'teal': '#006666',
-    'rust': '#8B3A3A',
-    'olive': '#556B2F',
-    'sand': '#E6DCC3',
-    'bg': '#FDFBF7',
-    'grid': '#DCDCDC',
-    'highlight': '#FF0000'
-}
-
-plt.rcParams.update({
-    'font.family': 'serif',
-    'font.serif': ['Times New Roman', 'DejaVu Serif', 'Garamond'],
-    'font.size': 14,
-    'axes.facecolor': CLASSIC_COLORS['bg'],
-    'figure.facecolor': CLASSIC_COLORS['bg'],
-    'axes.edgecolor': 'black',
-    'axes.grid': True,
-    'grid.alpha': 0.5,
-    'grid.color': CLASSIC_COLORS['grid'],
-    'grid.linestyle': '--',
-    'axes.titlesize': 22,
-    'axes.titleweight': 'bold',
-    'axes.labelsize': 14,
-    'text.color': 'black',
-    'axes.labelcolor': 'black',
-    'xtick.color': 'black',
-    'ytick.color': 'black',
-    'lines.linewidth': 2.5
-})
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Palette + rcParams live in chart.style.english.py; the serif set is resolved once per host
+CLASSIC_COLORS = runpy.run_path(os.path.join(SCRIPT_DIR, "chart.style.english.py"))["apply_style"]()
+DECIMATE = runpy.run_path(os.path.join(SCRIPT_DIR, "decimate.english.py"))   # LTTB / min-max thinning, shared with the dashboard
 
 # -----------------------------------------------------------------------------
 # 2. DATA LOADING
 # -----------------------------------------------------------------------------
 GITHUB_URL = "https://github.com/TheodorosKourtalis/public.debt.excels.english/raw/main/combined_wide_by_freq.xlsx"
 FILE_NAME = 'combined_wide_by_freq.xlsx'
+BUNDLE_URL = "https://github.com/TheodorosKourtalis/public.debt.excels.english/raw/main/combined_bundle.arrow"
+BUNDLE_NAME = 'combined_bundle.arrow'  # Written by the loader; preferred over the Excel file
+UNIT_VIEWS = runpy.run_path(os.path.join(SCRIPT_DIR, "unit.views.english.py"))  # Bundle reads with views filled in
+# {freq: wide frame indexed by Date}, injected by pipeline.english.py (runpy init_globals)
+IN_MEMORY_PANELS = globals().get('IN_MEMORY_PANELS')
+
+# Chart pack frequency: python plot.maker.2.7.english.py [Annual|Quarterly|Monthly]
+FREQ = sys.argv[1] if len(sys.argv) > 1 else 'Annual'
+BAR_WIDTH = {'Annual': 300, 'Quarterly': 75, 'Monthly': 25}.get(FREQ, 300)  # In days
+CONTRIB_SOURCE = {'Annual': 'Contribution_to_real_annual_growth',
+                  'Quarterly': 'Contribution_to_real_quarterly_growth'}.get(FREQ, 'Contribution_to_real')
+
+# Long series are thinned before line plotting ('lttb', 'minmax' or None)
+DOWNSAMPLE = 'lttb'
+MAX_PLOT_POINTS = 1500
+PHASE_ARROW_LIMIT = 200  # Above this, the phase path is drawn as one LineCollection
+LEADLAG_FILE = 'leadlag_top.json'  # Written by lead.lag.english.py; charted if present
+
+def chart_path(name):
+    return name if FREQ == 'Annual' else name.replace('.png', f'_{FREQ}.png')
+
+def _bundle_catalog(source):
+    import pyarrow as pa
+    src = source if isinstance(source, str) else pa.BufferReader(source)
+    return json.loads(pa.ipc.open_file(src).schema.metadata[b'catalog'])
+
+def load_bundle(source, freq, columns=None):
+    """
+    One read of the Arrow bundle. The catalog comes from the file footer, then only
+    the stored inputs of the requested columns of this frequency are decoded
+    (memory-mapped when local); GDP shares kept as views are derived from their levels.
+    """
+    frame = UNIT_VIEWS["read_bundle"](source, [freq], [c for c in (columns or []) if c != 'Date'] or None)[freq]
+    frame = frame.rename_axis('Date').reset_index()
+    frame.attrs['catalog'] = _bundle_catalog(source)
+    return frame
+
+def _fetch(url):
+    with urllib.request.urlopen(url, timeout=30) as resp:
+        return resp.read()
+
+# Each opener returns (header, reader): the header comes without decoding any values,
+# and reader(columns) decodes only the columns the charts below map with get_col.
+def _open_bundle(source):
+    info = _bundle_catalog(source)['freqs'][FREQ]
+    header = ['Date'] + info.get('labels', info['columns'])  # Stored columns + views
+    return header, lambda columns: load_bundle(source, FREQ, columns)
+
+def _open_memory(panels):
+    panel = panels[FREQ]
+    header = ['Date'] + list(panel.columns)
+    # Under Copy-on-Write the selection is a lazy view; chart-side edits never reach the loader's panel
+    return header, lambda columns: panel[[c for c in columns if c != 'Date']].rename_axis('Date').reset_index()
+
+def _open_excel(source):
+    src = (lambda: source) if isinstance(source, str) else (lambda: io.BytesIO(source))
+    header = pd.read_excel(src(), sheet_name=FREQ, engine='openpyxl', nrows=0).columns.tolist()
+    return header, lambda columns: pd.read_excel(src(), sheet_name=FREQ, engine='openpyxl', usecols=columns)
+
+SOURCES = [
+    ("In-memory panel", lambda: _open_memory(IN_MEMORY_PANELS) if IN_MEMORY_PANELS else None),
+    ("Local bundle", lambda: _open_bundle(BUNDLE_NAME) if os.path.exists(BUNDLE_NAME) else None),
+    ("Local data", lambda: _open_excel(FILE_NAME) if os.path.exists(FILE_NAME) else None),
+    ("GitHub bundle", lambda: _open_bundle(_fetch(BUNDLE_URL))),
+    ("GitHub data", lambda: _open_excel(_fetch(GITHUB_URL))),
+]
 
-print(f"Attempting to load data...")
-try:
-    if os.path.exists(FILE_NAME):
-        df = pd.read_excel(FILE_NAME, sheet_name='Annual', engine='openpyxl')
-        print("Local data loaded successfully.")
-    else:
-        raise FileNotFoundError("Local file not found.")
-except Exception:
+print(f"Attempting to load data ({FREQ})...")
+opened, last_err = None, "no data source available"
+for label, opener in SOURCES:
     try:
-        df = pd.read_excel(GITHUB_URL, sheet_name='Annual', engine='openpyxl')
-        print("Data loaded successfully from GitHub.")
+        opened = opener()
     except Exception as e:
-        print(f"CRITICAL ERROR: {e}")
-        sys.exit()
-
-if 'Date' in df.columns:
-    try:
-        df['Date'] = pd.to_datetime(df['Date'])
-    except:
-        df['Date'] = pd.to_datetime(df['Date'], format='%Y')
-    df = df.sort_values('Date')
-else:
+        last_err = e
+    if opened:
+        print(f"{label} opened successfully.")
+        break
+if not opened:
+    print(f"CRITICAL ERROR: {last_err}")
+    sys.exit()
+PANEL_COLUMNS, read_panel = opened
+
+if 'Date' not in PANEL_COLUMNS:
     sys.exit("Error: 'Date' column not found.")
 
 # -----------------------------------------------------------------------------
 # 3. MAPPING
 # -----------------------------------------------------------------------------
-cols = df.columns.tolist()
+cols = PANEL_COLUMNS
+USED_COLS = {}  # Every column a chart maps; only these are decoded below
 
 def get_col(keywords):
     matches = [c for c in cols if all(k.lower() in c.lower() for k in keywords)]
+    if matches:
+        USED_COLS[matches[0]] = True
     return matches[0] if matches else None
 
 # --- Existing Macros ---
@@ -102,18 +139,26 @@ col_tax_corp_gdp = get_col(['Taxes on corporate profits', 'GDP share'])
 col_tax_prop_gdp = get_col(['Taxes on land and buildings', 'GDP share'])
 col_soc_cont_gdp = get_col(['Total social contributions', 'GDP share'])
 if not col_soc_cont_gdp: col_soc_cont_gdp = get_col(['Social contributions', 'GDP share'])
+# Quarterly releases only split revenue by source: that breakdown stands in when the tax detail is missing
+REV_DETAIL = bool(col_tax_vat_gdp and col_tax_inc_gdp and col_tax_corp_gdp)
+if not REV_DETAIL:
+    col_rev_soc_gdp = get_col(['Government_revenues_by_source', 'Social contributions', 'GDP share'])
+    col_rev_ind_gdp = get_col(['Government_revenues_by_source', 'Indirect taxes', 'GDP share'])
+    col_rev_dir_gdp = get_col(['Government_revenues_by_source', '| Direct taxes', 'GDP share'])
+    col_rev_trans_gdp = get_col(['Government_revenues_by_source', 'Transfers', 'GDP share'])
+    col_rev_oth_gdp = get_col(['Government_revenues_by_source', 'Other', 'GDP share'])
 
 # --- Sectors ---
-col_con_ind = get_col(['Contribution_to_real_annual_growth', 'Industry (except construction)'])
-col_con_const = get_col(['Contribution_to_real_annual_growth', 'Construction'])
-col_con_trade = get_col(['Contribution_to_real_annual_growth', 'Trade'])
-col_con_fin = get_col(['Contribution_to_real_annual_growth', 'Financial services'])
-col_con_pub = get_col(['Contribution_to_real_annual_growth', 'Public administration'])
-col_con_info = get_col(['Contribution_to_real_annual_growth', 'Information'])
-col_con_real = get_col(['Contribution_to_real_annual_growth', 'Real estate'])
-col_con_prof = get_col(['Contribution_to_real_annual_growth', 'Professional services'])
-col_con_agri = get_col(['Contribution_to_real_annual_growth', 'Primary'])
-col_con_arts = get_col(['Contribution_to_real_annual_growth', 'Arts'])
+col_con_ind = get_col([CONTRIB_SOURCE, 'Industry (except construction)'])
+col_con_const = get_col([CONTRIB_SOURCE, 'Construction'])
+col_con_trade = get_col([CONTRIB_SOURCE, 'Trade'])
+col_con_fin = get_col([CONTRIB_SOURCE, 'Financial services'])
+col_con_pub = get_col([CONTRIB_SOURCE, 'Public administration'])
+col_con_info = get_col([CONTRIB_SOURCE, 'Information'])
+col_con_real = get_col([CONTRIB_SOURCE, 'Real estate'])
+col_con_prof = get_col([CONTRIB_SOURCE, 'Professional services'])
+col_con_agri = get_col([CONTRIB_SOURCE, 'Primary'])
+col_con_arts = get_col([CONTRIB_SOURCE, 'Arts'])
 
 # --- Other Existing ---
 col_int_pay_gdp = get_col(['Interest payments', 'GDP share'])
@@ -121,6 +166,9 @@ col_pub_inv_gdp = get_col(['Public investment', 'GDP share'])
 col_debt_euro = get_col(['General government', 'Euros', 'debt'])
 if not col_debt_euro: col_debt_euro = get_col(['General Government Consolidated Debt', 'Euros'])
 col_rev_total_euro = get_col(['Government_revenues', 'Total', 'Euros'])
+col_debt_loans = get_col(['General_government_debt_by_debt_instrument', 'Loans', 'GDP share'])
+col_debt_sec = get_col(['General_government_debt_by_debt_instrument', 'Debt securities', 'GDP share'])
+col_debt_curr = get_col(['General_government_debt_by_debt_instrument', 'Currency and deposits', 'GDP share'])
 
 # --- NEW MAPPINGS FOR EXPENDITURE ANALYSIS ---
 # 1. Function (COFOG)
@@ -130,6 +178,10 @@ col_cofog_gen = get_col(['Government_expenditures_by_function', 'General public
 col_cofog_edu = get_col(['Government_expenditures_by_function', 'Education', 'GDP'])
 col_cofog_def = get_col(['Government_expenditures_by_function', 'Defence', 'GDP'])
 col_cofog_eco = get_col(['Government_expenditures_by_function', 'Economic affairs', 'GDP'])
+col_cofog_order = get_col(['Government_expenditures_by_function', 'Public order', 'GDP'])
+col_cofog_env = get_col(['Government_expenditures_by_function', 'Environmental protection', 'GDP'])
+col_cofog_house = get_col(['Government_expenditures_by_function', 'Housing', 'GDP'])
+col_cofog_rec = get_col(['Government_expenditures_by_function', 'Recreation', 'GDP'])
 
 # 2. Economic Type (Rigidities)
 col_use_soc_ben = get_col(['Government_expenditures_by_use', 'Social benefits', 'GDP'])
@@ -140,76 +192,99 @@ col_use_int = get_col(['Government_expenditures_by_use', 'Interest payments', 'G
 # 3. Capital Stock
 col_cap_stock_govt = get_col(['Capital_stock_of_General_Government', 'Total fixed assets', 'GDP share'])
 
-# --- Calculations ---
-data = df.copy()
-if col_real_gdp:
-    data['GDP_Growth'] = data[col_real_gdp].pct_change() * 100
-if col_debt_euro and col_rev_total_euro:
-    data['Debt_Revenue_Ratio'] = data[col_debt_euro] / data[col_rev_total_euro]
-if col_rev_total_gdp and col_tax_vat_gdp and col_tax_inc_gdp and col_tax_corp_gdp and col_soc_cont_gdp:
-    known_taxes = data[[col_tax_vat_gdp, col_tax_inc_gdp, col_tax_corp_gdp, col_soc_cont_gdp]].sum(axis=1)
-    if col_tax_prop_gdp:
-        known_taxes += data[col_tax_prop_gdp]
-    data['Rev_Other_GDP'] = data[col_rev_total_gdp] - known_taxes
+# --- Projection: decode only the mapped columns ---
+try:
+    df = read_panel(['Date'] + list(USED_COLS))
+except Exception as e:
+    print(f"CRITICAL ERROR: {e}")
+    sys.exit()
+print(f"Decoded {len(USED_COLS)} of {len(PANEL_COLUMNS) - 1} columns.")
 
-# -----------------------------------------------------------------------------
-# 4. CLEANING & CITATION LOGIC (FIXED FOR -1 and NEGATIVE PARENS)
-# -----------------------------------------------------------------------------
+try:
+    df['Date'] = pd.to_datetime(df['Date'])
+except:
+    df['Date'] = pd.to_datetime(df['Date'], format='%Y')
+df = df.sort_values('Date')
 
-def clean_series_name(name):
+# --- Calculations ---
+class MetricEngine:
     """
-    Robust cleaning for citation strings.
-    1. Removes metadata like (annual data...).
-    2. Removes artifacts like .1 
-    3. Removes specific suffix '-1' if at the end or before a pipe.
-    4. Removes numeric values in parentheses (e.g., (-0.19))
+    Lazy dependency graph for derived series.
+    Each metric is declared once with its input columns and a vectorized function.
+    It is computed the first time a chart asks for it, memoized, and recomputed
+    only after one of its inputs has been replaced through set().
     """
-    if not name or not isinstance(name, str):
-        return ""
-    
-    # 1. Normalize underscores to spaces
-    name = name.replace('_', ' ')
-    name = name.strip()
-
-    # 2. Remove Pandas duplicates (Variable.1, Variable.2) at the end
-    name = re.sub(r'\.\d+$', '', name)
+    def __init__(self, frame):
+        self.frame = frame
+        self.rules = {}
+        self.memo = {}
+        self.versions = {}
+
+    def define(self, name, inputs, func):
+        self.rules[name] = (list(inputs), func)
+        self.memo.pop(name, None)
+
+    def available(self, name):
+        if not name: return False
+        if name in self.rules:
+            return all(self.available(i) for i in self.rules[name][0])
+        return name in self.frame.columns
+
+    def _stamp(self, name):
+        if name in self.rules:
+            return tuple(self._stamp(i) for i in self.rules[name][0])
+        return self.versions.get(name, 0)
+
+    def __getitem__(self, name):
+        if name not in self.rules:
+            return self.frame[name]
+        stamp = self._stamp(name)
+        hit = self.memo.get(name)
+        if hit is None or hit[0] != stamp:
+            inputs, func = self.rules[name]
+            hit = (stamp, func(*[self[i] for i in inputs]))
+            self.memo[name] = hit
+        return hit[1]
+
+    def set(self, name, values):
+        # Replacing an input invalidates every metric that depends on it
+        self.frame[name] = values
+        self.versions[name] = self.versions.get(name, 0) + 1
+
+    def table(self, names):
+        # Date + the requested series, raw or derived, as one small frame
+        return pd.DataFrame({'Date': self.frame['Date'], **{n: self[n] for n in names}})
+
+data = df
+metrics = MetricEngine(data)
+
+def _residual_revenue(total, vat, inc, corp, soc, prop=None):
+    known_taxes = pd.concat([vat, inc, corp, soc], axis=1).sum(axis=1)
+    if prop is not None:
+        known_taxes = known_taxes + prop
+    return total - known_taxes
+
+metrics.define('GDP_Growth', [col_real_gdp], lambda real: real.pct_change() * 100)
+metrics.define('Debt_Revenue_Ratio', [col_debt_euro, col_rev_total_euro], lambda debt, rev: debt / rev)
+metrics.define('Rev_Other_GDP',
+               [col_rev_total_gdp, col_tax_vat_gdp, col_tax_inc_gdp, col_tax_corp_gdp, col_soc_cont_gdp]
+               + ([col_tax_prop_gdp] if col_tax_prop_gdp else []),
+               _residual_revenue)
+# SCALING: Billions
+metrics.define('Nominal_GDP_Bn', [col_nom_gdp], lambda s: s / 1000)
+metrics.define('Real_GDP_Bn', [col_real_gdp], lambda s: s / 1000)
+sector_inputs = [c for c in [col_con_const, col_con_trade, col_con_ind, col_con_real,
+                             col_con_fin, col_con_pub, col_con_prof, col_con_info] if c]
+metrics.define('Sector_Net_Growth', sector_inputs,
+               lambda *cols: pd.concat(cols, axis=1).fillna(0).sum(axis=1))
 
-    # 3. Remove "annual data" metadata specific to this dataset
-    name = re.sub(r'\s*\(annual[ _]data[^)]*\)', '', name, flags=re.IGNORECASE)
-
-    # 4. Remove NUMERIC values in parentheses
-    # Matches: (123), (123.4), (-0.19), (-123.45)
-    name = re.sub(r'\s*\(\s*-?[\d.]+\s*\)', '', name)
-
-    # 5. Remove "-1" artifact
-    # Matches "-1" if it is followed by a Pipe or the End of String
-    # This handles "Direct taxes-1" AND "Category-1 | Subcategory"
-    name = re.sub(r'-1(?=\s*\||$)', '', name)
-
-    # 6. Remove trailing pipe if strictly at end
-    name = re.sub(r'\|\s*$', '', name)
-
-    # 7. Format formatting (Spaces around pipes)
-    if '|' in name:
-        name = name.replace('|', ' | ')
-    
-    # 8. Final collapse of multiple spaces
-    name = re.sub(r'\s+', ' ', name).strip()
-    
-    return name
+# -----------------------------------------------------------------------------
+# 4. CLEANING & CITATION LOGIC (FIXED FOR -1 and NEGATIVE PARENS)
+# -----------------------------------------------------------------------------
 
-def build_citation(col_names) -> str:
-    if not isinstance(col_names, list):
-        col_names = [col_names]
-    
-    # Generate clean names
-    clean_names = [clean_series_name(c) for c in col_names if c]
-    
-    # Remove duplicates while preserving order
-    unique_names = list(dict.fromkeys(clean_names))
-    
-    series_str = ", ".join(unique_names)
-    return f"Source: Greece in Numbers; Series: {series_str}; Author’s calculations by Theodoros Kourtalis."
+# Series names and the source line, shared with the series catalog
+CITATION = runpy.run_path(os.path.join(SCRIPT_DIR, "citation.english.py"))
+clean_series_name, build_citation = CITATION["clean_series_name"], CITATION["build_citation"]
 
 def place_citation(fig, wrapped_citation):
     citation_top_y = 0.17
@@ -230,6 +305,21 @@ def finalize_plot(fig, ax, title, series_names, xlabel='', ylabel=''):
     wrapped_cit = "\n".join(textwrap.wrap(full_citation, width=130))
     place_citation(fig, wrapped_cit)
 
+def thin(dates, *series):
+    """
+    Row positions worth drawing. Short series are returned whole; long ones are
+    reduced per series (LTTB or min/max buckets) and the picks are merged.
+    """
+    n = len(dates)
+    if not DOWNSAMPLE or n <= MAX_PLOT_POINTS:
+        return np.arange(n)
+    x = dates.to_numpy(dtype='datetime64[ns]').astype('int64').astype(float)
+    picks = []
+    for y in series:
+        y = np.asarray(y, dtype=float)
+        picks.append(DECIMATE['lttb'](x, y, MAX_PLOT_POINTS) if DOWNSAMPLE == 'lttb' else DECIMATE['minmax'](y, MAX_PLOT_POINTS))
+    return np.unique(np.concatenate(picks))
+
 # -----------------------------------------------------------------------------
 # 5. GENERATE PLOTS
 # -----------------------------------------------------------------------------
@@ -242,11 +332,10 @@ BOTTOM_MARGIN = 0.25
 if col_nom_gdp and col_real_gdp:
     fig, ax = plt.subplots(figsize=(12, 8))
     
-    dates = data['Date']
-    # SCALING: Billions
-    scale = 1000 
-    y_nom = data[col_nom_gdp] / scale
-    y_real = data[col_real_gdp] / scale
+    keep = thin(data['Date'], metrics['Nominal_GDP_Bn'], metrics['Real_GDP_Bn'])
+    dates = data['Date'].iloc[keep]
+    y_nom = metrics['Nominal_GDP_Bn'].iloc[keep]
+    y_real = metrics['Real_GDP_Bn'].iloc[keep]
     
     # 1. THE INFLATION WEDGE (Smart Fill)
     ax.fill_between(dates, y_nom, y_real, where=(y_nom > y_real), 
@@ -307,12 +396,12 @@ if col_nom_gdp and col_real_gdp:
 
     finalize_plot(fig, ax, 'Real vs. Nominal GDP', [col_nom_gdp, col_real_gdp], ylabel='GDP (Billions)')
     plt.subplots_adjust(bottom=BOTTOM_MARGIN)
-    plt.savefig('Chart_Output_Gap.png', dpi=300, bbox_inches='tight')
+    plt.savefig(chart_path('Chart_Output_Gap.png'), dpi=300, bbox_inches='tight')
 
 # -----------------------------------------------------------------------------
 # 2. BUDGET BALANCE (CLEAN: No Annotations, RGBA Fix)
 # -----------------------------------------------------------------------------
-from matplotlib.colors import to_rgba
+from matplotlib.colors import to_rgba_array
 
 if col_budget_bal_gdp:
     fig, ax = plt.subplots(figsize=(12, 8))
@@ -322,42 +411,20 @@ if col_budget_bal_gdp:
     
     # 1. COLOR & STYLE LOGIC
     # We maintain the visual highlighting (Dark 2009, Traffic Lights) 
-    # but remove the text labels.
-    bar_colors = []
-    edges = []
-    linewidths = []
-    
-    for i, row in data.iterrows():
-        year = row['Date'].year
-        v = row[col_budget_bal_gdp]
-        
-        # Style for 2009 (Darker & Solid)
-        if year == 2009:
-            c = '#660000'       # Dark Red
-            a = 1.0             # Solid
-            edges.append('black')
-            linewidths.append(1.5)
-        # Traffic Light Logic for others
-        elif v >= 0:
-            c = CLASSIC_COLORS['navy']
-            a = 0.85
-            edges.append('white')
-            linewidths.append(0.5)
-        elif v >= -3:
-            c = CLASSIC_COLORS['gold'] # Compliant Deficit
-            a = 0.85
-            edges.append('white')
-            linewidths.append(0.5)
-        else:
-            c = CLASSIC_COLORS['burgundy']
-            a = 0.85
-            edges.append('white')
-            linewidths.append(0.5)
-            
-        bar_colors.append(to_rgba(c, alpha=a))
+    # but remove the text labels. Vectorized: no per-row loop.
+    v = vals.to_numpy(dtype=float)
+    is_2009 = (dates.dt.year == 2009).to_numpy()
+    # Traffic Light Logic for others (gold = Compliant Deficit)
+    base = np.select([v >= 0, v >= -3], [CLASSIC_COLORS['navy'], CLASSIC_COLORS['gold']],
+                     default=CLASSIC_COLORS['burgundy'])
+    # Style for 2009 (Darker & Solid)
+    bar_colors = to_rgba_array(np.where(is_2009, '#660000', base))
+    bar_colors[:, 3] = np.where(is_2009, 1.0, 0.85)
+    edges = np.where(is_2009, 'black', 'white').tolist()
+    linewidths = np.where(is_2009, 1.5, 0.5)
             
     # 2. PLOT BARS
-    ax.bar(dates, vals, color=bar_colors, width=300, 
+    ax.bar(dates, vals, color=bar_colors, width=BAR_WIDTH, 
            edgecolor=edges, linewidth=linewidths, zorder=3)
     
     # 3. REFERENCE LINES
@@ -386,15 +453,11 @@ if col_budget_bal_gdp:
     
     finalize_plot(fig, ax, 'Fiscal Pulse: Budget Balance', [col_budget_bal_gdp], ylabel='% of GDP')
     plt.subplots_adjust(bottom=BOTTOM_MARGIN)
-    plt.savefig('Chart_Balance.png', dpi=300, bbox_inches='tight')
+    plt.savefig(chart_path('Chart_Balance.png'), dpi=300, bbox_inches='tight')
     
 # -----------------------------------------------------------------------------
 # 3. DEBT (EXTREME POLISH: Combined Annotation - Down & Left)
 # -----------------------------------------------------------------------------
-col_debt_loans = get_col(['General_government_debt_by_debt_instrument', 'Loans', 'GDP share'])
-col_debt_sec = get_col(['General_government_debt_by_debt_instrument', 'Debt securities', 'GDP share'])
-col_debt_curr = get_col(['General_government_debt_by_debt_instrument', 'Currency and deposits', 'GDP share'])
-
 if col_debt_loans and col_debt_sec and col_debt_curr:
     fig, ax = plt.subplots(figsize=(12, 8))
     
@@ -454,16 +517,17 @@ if col_debt_loans and col_debt_sec and col_debt_curr:
     finalize_plot(fig, ax, 'The Anatomy of Greek Debt', 
                   [col_debt_loans, col_debt_sec, col_debt_curr], ylabel='% of GDP')
     plt.subplots_adjust(bottom=BOTTOM_MARGIN)
-    plt.savefig('Chart_Debt.png', dpi=300, bbox_inches='tight')
+    plt.savefig(chart_path('Chart_Debt.png'), dpi=300, bbox_inches='tight')
 
 elif col_debt_gdp:
     # FALLBACK
     fig, ax = plt.subplots(figsize=(12, 8))
-    ax.fill_between(data['Date'], data[col_debt_gdp], color=CLASSIC_COLORS['slate'], alpha=0.3)
-    ax.plot(data['Date'], data[col_debt_gdp], color=CLASSIC_COLORS['slate'], linewidth=3)
+    keep = thin(data['Date'], data[col_debt_gdp])
+    ax.fill_between(data['Date'].iloc[keep], data[col_debt_gdp].iloc[keep], color=CLASSIC_COLORS['slate'], alpha=0.3)
+    ax.plot(data['Date'].iloc[keep], data[col_debt_gdp].iloc[keep], color=CLASSIC_COLORS['slate'], linewidth=3)
     finalize_plot(fig, ax, 'The Debt Mountain', [col_debt_gdp], ylabel='% GDP')
     plt.subplots_adjust(bottom=BOTTOM_MARGIN)
-    plt.savefig('Chart_Debt.png', dpi=300, bbox_inches='tight')
+    plt.savefig(chart_path('Chart_Debt.png'), dpi=300, bbox_inches='tight')
 # -----------------------------------------------------------------------------
 # 4. REVENUE DECOMPOSITION (CLEAN: Improved Structure, No Text)
 # -----------------------------------------------------------------------------
@@ -479,20 +543,33 @@ ordered_rev_setup = [
     ('Rev_Other_GDP', 'Other/Transfers', CLASSIC_COLORS['slate'])           # Residual
 ]
 
+if not REV_DETAIL:
+    ordered_rev_setup = [
+        (col_rev_soc_gdp, 'Social Contributions', CLASSIC_COLORS['burgundy']),
+        (col_rev_ind_gdp, 'Indirect Taxes', CLASSIC_COLORS['navy']),
+        (col_rev_dir_gdp, 'Direct Taxes', CLASSIC_COLORS['gold']),
+        (col_rev_trans_gdp, 'Transfers', CLASSIC_COLORS['forest']),
+        (col_rev_oth_gdp, 'Other', CLASSIC_COLORS['slate'])
+    ]
+
 # Filter for columns that actually exist
-valid_rev = [(c, l, col) for c, l, col in ordered_rev_setup if c in data.columns]
+valid_rev = [(c, l, col) for c, l, col in ordered_rev_setup if metrics.available(c)]
+# A mix missing its taxes would pass off social contributions alone as the state's revenue
+rev_complete = metrics.available(col_rev_total_gdp) and all(metrics.available(c) for c, _, _ in ordered_rev_setup[:3])
+if not rev_complete:
+    print("⏭️  Revenue decomposition skipped: tax components or total revenue not in this panel.")
 
-if valid_rev:
+if valid_rev and rev_complete:
     fig, ax = plt.subplots(figsize=(12, 8))
     
     # Data Prep
     dates = data['Date']
     bottom = np.zeros(len(dates))
-    bar_width = 300 # Approx annual width
+    bar_width = BAR_WIDTH # Approx one period wide
     
     # 2. PLOT STACKED BARS
     for col, label, color in valid_rev:
-        vals = data[col].fillna(0).values
+        vals = metrics[col].fillna(0).values
         vals_plot = np.maximum(vals, 0)
         
         # Add bars with white edges for clarity
@@ -502,8 +579,8 @@ if valid_rev:
         bottom += vals_plot
 
     # 3. TOTAL REVENUE LINE (The "Burden" Envelope)
-    # We use a thick black line to show the overall size of the state
-    ax.plot(dates, bottom, color='black', linewidth=2.5, linestyle='-', marker='o', 
+    # We use a thick black line to show the overall size of the state: the published total, not the bars
+    ax.plot(dates, metrics[col_rev_total_gdp].values, color='black', linewidth=2.5, linestyle='-', marker='o', 
             markersize=5, markerfacecolor='white', markeredgewidth=2, label='Total Revenue')
 
     # 4. LEGEND ORGANIZATION
@@ -518,7 +595,7 @@ if valid_rev:
     finalize_plot(fig, ax, 'State Revenue: The Tax Mix', cit_cols, ylabel='% of GDP')
     
     plt.subplots_adjust(bottom=BOTTOM_MARGIN)
-    plt.savefig('Chart_Revenue_Decomp.png', dpi=300, bbox_inches='tight')
+    plt.savefig(chart_path('Chart_Revenue_Decomp.png'), dpi=300, bbox_inches='tight')
 # -----------------------------------------------------------------------------
 # 5. GDP SECTOR CONTRIB (FINAL: Adjusted Axis & Trimmed Start)
 # -----------------------------------------------------------------------------
@@ -551,20 +628,19 @@ if valid_sectors:
         
         # Positive Stack
         ax.bar(dates, pos_vals, bottom=pos_bottom, label=label, color=color, 
-               width=300, alpha=0.9, edgecolor='white', linewidth=0.4)
+               width=BAR_WIDTH, alpha=0.9, edgecolor='white', linewidth=0.4)
         pos_bottom += pos_vals
         
         # Negative Stack
         ax.bar(dates, neg_vals, bottom=neg_bottom, color=color, 
-               width=300, alpha=0.9, edgecolor='white', linewidth=0.4)
+               width=BAR_WIDTH, alpha=0.9, edgecolor='white', linewidth=0.4)
         neg_bottom += neg_vals
 
     # 3. ZERO LINE
     ax.axhline(0, color='black', linewidth=1.5, zorder=3)
 
     # 4. FIX TOTAL LINE (Trimmed First Year)
-    sector_cols = [s[0] for s in valid_sectors]
-    net_growth_calculated = data[sector_cols].fillna(0).sum(axis=1)
+    net_growth_calculated = metrics['Sector_Net_Growth'].copy()
     
     # REMOVE THE FIRST YEAR VALUE (Set to NaN)
     # This prevents the line from starting at an awkward point if data is noisy
@@ -588,12 +664,12 @@ if valid_sectors:
     
     finalize_plot(fig, ax, 'Sectoral Drivers of GDP', [s[0] for s in valid_sectors], ylabel='Contribution (pp)')
     plt.subplots_adjust(bottom=BOTTOM_MARGIN)
-    plt.savefig('Chart_GDP_Contrib.png', dpi=300, bbox_inches='tight')
+    plt.savefig(chart_path('Chart_GDP_Contrib.png'), dpi=300, bbox_inches='tight')
     
 # 6. PHASE (DEBT vs GROWTH)
-if col_debt_gdp and 'GDP_Growth' in data.columns:
+if col_debt_gdp and metrics.available('GDP_Growth'):
     fig, ax = plt.subplots(figsize=(16, 10))
-    df_clean = data.dropna(subset=[col_debt_gdp, 'GDP_Growth'])
+    df_clean = metrics.table([col_debt_gdp, 'GDP_Growth']).dropna(subset=[col_debt_gdp, 'GDP_Growth'])
     
     if len(df_clean) > 1:
         x = df_clean[col_debt_gdp].values
@@ -604,14 +680,20 @@ if col_debt_gdp and 'GDP_Growth' in data.columns:
         import matplotlib.colors as mcolors
         cmap = mcolors.LinearSegmentedColormap.from_list("TimeFlow", [CLASSIC_COLORS['gold'], CLASSIC_COLORS['navy']])
         
-        for i in range(n - 1):
-            fraction = i / (n - 1)
-            seg_color = cmap(fraction)
-            ax.annotate('', 
-                        xy=(x[i+1], y[i+1]), 
-                        xytext=(x[i], y[i]),
-                        arrowprops=dict(arrowstyle="->", color=seg_color, lw=2, alpha=0.8, connectionstyle="arc3,rad=0.15"),
-                        va='center')
+        if n - 1 > PHASE_ARROW_LIMIT:
+            # One collection instead of thousands of arrow artists
+            from matplotlib.collections import LineCollection
+            segs = np.stack([np.column_stack([x[:-1], y[:-1]]), np.column_stack([x[1:], y[1:]])], axis=1)
+            ax.add_collection(LineCollection(segs, colors=cmap(np.arange(n - 1) / (n - 1)), linewidths=2, alpha=0.8))
+        else:
+            for i in range(n - 1):
+                fraction = i / (n - 1)
+                seg_color = cmap(fraction)
+                ax.annotate('', 
+                            xy=(x[i+1], y[i+1]), 
+                            xytext=(x[i], y[i]),
+                            arrowprops=dict(arrowstyle="->", color=seg_color, lw=2, alpha=0.8, connectionstyle="arc3,rad=0.15"),
+                            va='center')
 
         ax.scatter(x, y, c=np.linspace(0, 1, n), cmap=cmap, s=80, zorder=2, edgecolors='none')
         
@@ -638,7 +720,7 @@ if col_debt_gdp and 'GDP_Growth' in data.columns:
 
         finalize_plot(fig, ax, 'Debt vs Growth Path', [col_debt_gdp, col_real_gdp], xlabel='Debt (% GDP)', ylabel='Growth (%)')
         plt.subplots_adjust(bottom=BOTTOM_MARGIN)
-        plt.savefig('Chart_Phase.png', dpi=300, bbox_inches='tight')
+        plt.savefig(chart_path('Chart_Phase.png'), dpi=300, bbox_inches='tight')
 
 # -----------------------------------------------------------------------------
 # 7. CROWDING (IMPROVED: The Investment Squeeze)
@@ -647,20 +729,24 @@ if col_int_pay_gdp and col_pub_inv_gdp:
     fig, ax = plt.subplots(figsize=(12, 8))
     
     # 1. Plot Lines
-    ax.plot(data['Date'], data[col_int_pay_gdp], color=CLASSIC_COLORS['burgundy'], 
+    keep = thin(data['Date'], data[col_int_pay_gdp], data[col_pub_inv_gdp])
+    x_dates = data['Date'].iloc[keep]
+    y_int_s = data[col_int_pay_gdp].iloc[keep]
+    y_inv_s = data[col_pub_inv_gdp].iloc[keep]
+    ax.plot(x_dates, y_int_s, color=CLASSIC_COLORS['burgundy'], 
             label='Interest Payments', linewidth=3.5)
-    ax.plot(data['Date'], data[col_pub_inv_gdp], color=CLASSIC_COLORS['navy'], 
+    ax.plot(x_dates, y_inv_s, color=CLASSIC_COLORS['navy'], 
             linestyle='--', label='Public Investment', linewidth=3.5)
     
     # 2. Fill Logic (The "Squeeze")
     # Red Zone: Money flowing to creditors instead of infrastructure
-    ax.fill_between(data['Date'], data[col_int_pay_gdp], data[col_pub_inv_gdp], 
-                    where=(data[col_int_pay_gdp] > data[col_pub_inv_gdp]),
+    ax.fill_between(x_dates, y_int_s, y_inv_s, 
+                    where=(y_int_s > y_inv_s),
                     interpolate=True, color=CLASSIC_COLORS['burgundy'], alpha=0.15)
     
     # Blue Zone: Healthy investment surplus
-    ax.fill_between(data['Date'], data[col_int_pay_gdp], data[col_pub_inv_gdp], 
-                    where=(data[col_int_pay_gdp] <= data[col_pub_inv_gdp]),
+    ax.fill_between(x_dates, y_int_s, y_inv_s, 
+                    where=(y_int_s <= y_inv_s),
                     interpolate=True, color=CLASSIC_COLORS['navy'], alpha=0.15)
 
     # 3. CALCULATE AND ANNOTATE THE "MAX SQUEEZE"
@@ -709,18 +795,14 @@ if col_int_pay_gdp and col_pub_inv_gdp:
     ax.set_xlim(right=data['Date'].max() + pd.Timedelta(days=700)) 
     
     plt.subplots_adjust(bottom=BOTTOM_MARGIN)
-    plt.savefig('Chart_Crowding.png', dpi=300, bbox_inches='tight')
+    plt.savefig(chart_path('Chart_Crowding.png'), dpi=300, bbox_inches='tight')
 
 
 # -----------------------------------------------------------------------------
 # NEW CHART 1: Expenditure by Function (COFOG) - SORTED STACK (Big -> Small)
 # -----------------------------------------------------------------------------
 
-# 1. MAPPING
-col_cofog_order = get_col(['Government_expenditures_by_function', 'Public order', 'GDP'])
-col_cofog_env = get_col(['Government_expenditures_by_function', 'Environmental protection', 'GDP'])
-col_cofog_house = get_col(['Government_expenditures_by_function', 'Housing', 'GDP'])
-col_cofog_rec = get_col(['Government_expenditures_by_function', 'Recreation', 'GDP'])
+# 1. MAPPING (resolved with the other columns in section 3)
 
 # 2. DEFINING VARIABLES & COLORS
 # We define the mapping here, but the ORDER will be determined by data magnitude below.
@@ -756,7 +838,7 @@ if valid_cofog_unsorted:
     # 1. Clean Data
     stack_cols = [v[0] for v in valid_cofog_unsorted]
     valid_rows_mask = data[stack_cols].sum(axis=1) > 1.0 
-    plot_data = data.loc[valid_rows_mask].copy()
+    plot_data = data.loc[valid_rows_mask]
     
     # 2. CALCULATE SIZES TO SORT STACK
     # We sum the entire series to find the "Biggest" over the whole period
@@ -814,7 +896,7 @@ if valid_cofog_unsorted:
                   [v[0] for v in valid_cofog_sorted], ylabel='% of GDP')
     
     plt.subplots_adjust(bottom=0.25) 
-    plt.savefig('Chart_Expenditure_Function.png', dpi=300, bbox_inches='tight')
+    plt.savefig(chart_path('Chart_Expenditure_Function.png'), dpi=300, bbox_inches='tight')
 
 place_citation = original_place_citation
 # -----------------------------------------------------------------------------
@@ -832,14 +914,15 @@ valid_eco = [v for v in eco_vars if v[0] in data.columns]
 if valid_eco:
     fig, ax = plt.subplots(figsize=(12, 8))
     
+    keep = thin(data['Date'], *[data[v[0]] for v in valid_eco])
     for col, label, color, style in valid_eco:
-        ax.plot(data['Date'], data[col], label=label, color=color, linestyle=style, linewidth=3)
+        ax.plot(data['Date'].iloc[keep], data[col].iloc[keep], label=label, color=color, linestyle=style, linewidth=3)
         
     ax.legend(loc='upper center', bbox_to_anchor=(0.5, -0.05), frameon=False, fontsize=12, ncol=4)
     
     finalize_plot(fig, ax, 'Budget Rigidities vs Investment', [v[0] for v in valid_eco], ylabel='% of GDP')
     plt.subplots_adjust(bottom=BOTTOM_MARGIN)
-    plt.savefig('Chart_Expenditure_Economic.png', dpi=300, bbox_inches='tight')
+    plt.savefig(chart_path('Chart_Expenditure_Economic.png'), dpi=300, bbox_inches='tight')
 # -----------------------------------------------------------------------------
 # NEW CHART 3: Public Assets (The Depreciation Trap) - NO PEAK LABEL
 # -----------------------------------------------------------------------------
@@ -851,7 +934,7 @@ if col_pub_inv_gdp and col_cap_stock_govt:
     # --- AXIS 1: THE FLOW (Bars) ---
     color_flow = CLASSIC_COLORS['navy']
     bars = ax1.bar(dates, data[col_pub_inv_gdp], color=color_flow, alpha=0.3, 
-                   width=300, label='Public Investment (Flow, Left)')
+                   width=BAR_WIDTH, label='Public Investment (Flow, Left)')
     
     # Highlight "Crisis Lows" (Red Bars)
     threshold = 3.0 
@@ -919,6 +1002,60 @@ if col_pub_inv_gdp and col_cap_stock_govt:
     place_citation(fig, wrapped_cit)
     
     plt.subplots_adjust(bottom=BOTTOM_MARGIN)
-    plt.savefig('Chart_Investment_vs_Stock.png', dpi=300, bbox_inches='tight')
+    plt.savefig(chart_path('Chart_Investment_vs_Stock.png'), dpi=300, bbox_inches='tight')
     
+# -----------------------------------------------------------------------------
+# NEW CHART 4: Lead/Lag - Which Series Move First
+# -----------------------------------------------------------------------------
+# Pairs come precomputed from lead.lag.english.py (growth rates, best lag per pair)
+leadlag = None
+if os.path.exists(LEADLAG_FILE):
+    with open(LEADLAG_FILE, encoding='utf-8') as f:
+        leadlag = json.load(f).get(FREQ)
+
+if leadlag and leadlag['pairs']:
+    pairs = leadlag['pairs'][:15]
+    def short(col):
+        # Keep the category in full; the source title is what gets abbreviated
+        source, _, category = clean_series_name(col).partition(' | ')
+        source = textwrap.shorten(source, width=28, placeholder='...')
+        return f"{source} | {category}" if category else source
+
+    fig, ax = plt.subplots(figsize=(12, 8))
+    labels = [f"{short(p['leader'])} \u2192 {short(p['follower'])} (+{p['lag']})" for p in pairs][::-1]
+    corrs = [p['corr'] for p in pairs][::-1]
+    colors = [CLASSIC_COLORS['navy'] if c > 0 else CLASSIC_COLORS['burgundy'] for c in corrs]
+    ax.barh(range(len(pairs)), corrs, color=colors, alpha=0.85, edgecolor='white')
+    ax.set_yticks(range(len(pairs)))
+    ax.set_yticklabels(labels, fontsize=8)
+    ax.axvline(0, color='black', linewidth=1)
+    ax.set_xlim(-1, 1)
+
+    series = list(dict.fromkeys(s for p in pairs for s in (p['leader'], p['follower'])))
+    finalize_plot(fig, ax, 'Leading Indicators: Strongest Lagged Correlations', series,
+                  xlabel=f"Correlation of growth rates (leader \u2192 follower, lag in {FREQ.lower()} periods)")
+    ax.grid(axis='x', visible=True, linestyle=':', alpha=0.7)
+    ax.grid(axis='y', visible=False)
+    plt.subplots_adjust(bottom=BOTTOM_MARGIN)
+    plt.savefig(chart_path('Chart_LeadLag.png'), dpi=300, bbox_inches='tight')
+
+    # Rolling window: is the lead stable or an artefact of one episode?
+    rolling = [p for p in leadlag['pairs'] if 'rolling' in p][:3]
+    if rolling:
+        fig, ax = plt.subplots(figsize=(12, 8))
+        dates = pd.to_datetime(leadlag['dates'])
+        for p, color in zip(rolling, [CLASSIC_COLORS['navy'], CLASSIC_COLORS['burgundy'], CLASSIC_COLORS['gold']]):
+            values = np.array([np.nan if v is None else v for v in p['rolling']])
+            ax.plot(dates, values, color=color, linewidth=3,
+                    label=f"{short(p['leader'])} \u2192 {short(p['follower'])} (+{p['lag']})")
+        ax.axhline(0, color='black', linewidth=1)
+        ax.set_ylim(-1.05, 1.05)
+        ax.legend(loc='lower left', frameon=False, fontsize=10)
+
+        series = list(dict.fromkeys(s for p in rolling for s in (p['leader'], p['follower'])))
+        finalize_plot(fig, ax, 'Lead/Lag Stability: Rolling Correlation', series,
+                      ylabel=f"{leadlag['window']}-period rolling correlation")
+        plt.subplots_adjust(bottom=BOTTOM_MARGIN)
+        plt.savefig(chart_path('Chart_LeadLag_Rolling.png'), dpi=300, bbox_inches='tight')
+
 print("All charts (including new expenditure series) generated.")
\ No newline at end of file
@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+"""
+SEASONAL ADJUSTMENT (Batch SA of every not-seasonally-adjusted quarterly series)
+All series are decomposed together as one dates x series matrix: a centred 2x4
+moving-average trend, 3x3 seasonal filters per quarter and normalised factors
+(the first pass of X-11; multiplicative when a series is strictly positive).
+STL is available per series when statsmodels is installed. Results are cached
+by each series' content hash, so only new or revised series are recomputed,
+and every computed series with an official SA counterpart is compared with it.
+
+Usage:
+    python seasonal.adjustment.english.py [--method ma|stl] [--workers N] [--out seasonally_adjusted.xlsx]
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import runpy
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+    from statsmodels.tsa.seasonal import STL
+except ImportError:
+    STL = None
+
+# --- 1. CONFIGURATION ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+GITHUB_URL = "https://github.com/TheodorosKourtalis/public.debt.excels.english/raw/main/combined_wide_by_freq.xlsx"
+FILE_NAME = 'combined_wide_by_freq.xlsx'
+BUNDLE_NAME = 'combined_bundle.arrow'
+OUT_NAME = 'seasonally_adjusted.xlsx'
+CACHE_NAME = 'seasonal_cache.json'
+
+METHOD = "ma"               # "ma" (vectorised moving averages) or "stl" (needs statsmodels)
+WORKERS = os.cpu_count() or 1
+MIN_OBS = 12                # Three years of quarters before a series is adjusted
+# Sources whose quarterly values carry no seasonal pattern to remove (rates of change, averages)
+SKIP_SOURCES = ["Growth_rate", "Contribution_to", "Average_duration"]
+
+TREND_WEIGHTS = np.array([1, 2, 2, 2, 1]) / 8      # Centred 2x4 moving average
+SEASONAL_WEIGHTS = np.array([1, 2, 3, 2, 1]) / 9   # 3x3 moving average across years
+
+# === 2. SERIES SELECTION + PAIRING ===
+
+def _text(label):
+    return label.replace('_', ' ').lower()
+
+def is_nsa(label):
+    text = _text(label)
+    if "not seasonally adjusted" in text:
+        return True
+    if "seasonally adjusted" in text:
+        return False
+    return not any(s.lower() in label.lower() for s in SKIP_SOURCES)
+
+def official_key(label):
+    # "GDP_not_seasonally_adjusted_ | X (Current prices)" and "GDP_seasonally_adjusted-2 | X (Current prices)"
+    # share a key; so do the "(Not seasonally adjusted)" / "(Seasonally adjusted)" columns of one file.
+    source, _, series = label.partition('|')
+    source = re.sub(r'(-\d+|_)+$', '', source.strip())
+    return _text(f"{source} | {series.strip()}").replace("not seasonally adjusted", "seasonally adjusted")
+
+def official_pairs(columns):
+    """{NSA column: official SA column} for every NSA series with a published counterpart."""
+    official = {}
+    for c in columns:
+        if not is_nsa(c) and "seasonally adjusted" in _text(c):
+            official.setdefault(official_key(c), c)
+    return {c: official[official_key(c)] for c in columns if is_nsa(c) and official_key(c) in official}
+
+# === 3. DECOMPOSITION ===
+
+def _windows(x, k):
+    pad = np.full((k // 2,) + x.shape[1:], np.nan)
+    return sliding_window_view(np.concatenate([pad, x, pad]), k, axis=0)
+
+def centered_ma(x, weights):
+    # NaN wherever the full window is not available
+    return _windows(x, len(weights)) @ weights
+
+def nan_weighted_ma(x, weights):
+    # Weights renormalised over the finite values in each window (asymmetric filters at the ends)
+    win = _windows(x, len(weights))
+    ok = np.isfinite(win)
+    den = ok @ weights
+    num = np.where(ok, win, 0.0) @ weights
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(den > 0, num / den, np.nan)
+
+def _fill(x):
+    return pd.DataFrame(x).ffill().bfill().to_numpy()
+
+def _span(y):
+    # True from each column's first to its last finite value
+    ok = np.isfinite(y)
+    return np.maximum.accumulate(ok, axis=0) & np.maximum.accumulate(ok[::-1], axis=0)[::-1]
+
+def decompose_ma(y, quarter):
+    """
+    Seasonally adjusts every column of y (consecutive quarters x series) at once.
+    Each column only sees its own first-to-last span, so results do not depend
+    on which other series share the matrix.
+    """
+    positive = np.all((y > 0) | np.isnan(y), axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        z = np.where(positive, np.log(y), y)
+    span = _span(z)
+
+    si = z - centered_ma(z, TREND_WEIGHTS)
+    seasonal = np.full_like(z, np.nan)
+    for q in range(4):
+        rows = quarter == q
+        # Quarters without a seasonal-irregular ratio nearby (series ends) take the nearest factor
+        seasonal[rows] = _fill(nan_weighted_ma(si[rows], SEASONAL_WEIGHTS))
+    seasonal[~span] = np.nan
+    seasonal -= _fill(centered_ma(seasonal, TREND_WEIGHTS))
+
+    sa = z - seasonal
+    with np.errstate(over='ignore'):
+        return np.where(positive, np.exp(sa), sa)
+
+def decompose_stl(y, quarter):
+    out = np.full_like(y, np.nan)
+    for j in range(y.shape[1]):
+        ok = np.flatnonzero(np.isfinite(y[:, j]))
+        span = slice(ok[0], ok[-1] + 1)
+        s = pd.Series(y[span, j]).interpolate().to_numpy()
+        positive = bool((s > 0).all())
+        z = np.log(s) if positive else s
+        sa = z - STL(z, period=4, robust=True).fit().seasonal
+        out[span, j] = np.exp(sa) if positive else sa
+    out[np.isnan(y)] = np.nan
+    return out
+
+METHODS = {"ma": decompose_ma, "stl": decompose_stl}
+
+def adjust_chunk(method, y, quarter):
+    """Worker entry point: one block of columns."""
+    return METHODS[method](y, quarter)
+
+# === 4. BATCH + CACHE ===
+
+def series_hash(method, periods, values):
+    # Content of the first-to-last span: start quarter + values (+ method)
+    ok = np.flatnonzero(np.isfinite(values))
+    span = values[ok[0]:ok[-1] + 1]
+    return hashlib.md5(f"{method}|{periods[ok[0]]}|".encode('utf-8') + span.tobytes()).hexdigest()
+
+def load_cache(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_cache(cache, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f)
+
+def adjust_panel(panel, method=METHOD, workers=1, cache_path=None):
+    """
+    Seasonally adjusts every NSA column of a quarterly panel (indexed by Date).
+    Returns (SA frame on the same index, stats). workers > 1 uses a process pool;
+    that needs this file run as __main__ (runpy callers such as the loader keep 1).
+    """
+    if method == "stl" and STL is None:
+        print("⚠️  statsmodels not installed: falling back to the moving-average method.")
+        method = "ma"
+    periods = pd.PeriodIndex(pd.DatetimeIndex(panel.index), freq='Q')
+    grid = pd.period_range(periods.min(), periods.max(), freq='Q')
+    rows = grid.get_indexer(periods)
+    labels = [str(p) for p in grid]
+
+    columns = [c for c in panel.columns if is_nsa(c) and panel[c].notna().sum() >= MIN_OBS]
+    y = np.full((len(grid), len(columns)), np.nan)
+    y[rows] = panel[columns].to_numpy(dtype='float64')
+
+    cache = load_cache(cache_path) if cache_path else {}
+    hashes = [series_hash(method, labels, y[:, j]) for j in range(len(columns))]
+    todo = [j for j, h in enumerate(hashes) if h not in cache]
+
+    sa = np.full_like(y, np.nan)
+    for j, h in enumerate(hashes):
+        if h in cache:
+            ok = np.flatnonzero(np.isfinite(y[:, j]))
+            sa[ok[0]:ok[0] + len(cache[h]), j] = np.array(cache[h], dtype='float64')
+
+    quarter = grid.quarter.to_numpy() - 1
+    if todo:
+        chunks = [c for c in np.array_split(np.array(todo), max(min(workers, len(todo)), 1)) if len(c)]
+        if len(chunks) > 1:
+            with ProcessPoolExecutor(max_workers=len(chunks)) as pool:
+                results = list(pool.map(adjust_chunk, [method] * len(chunks),
+                                        [y[:, c] for c in chunks], [quarter] * len(chunks)))
+        else:
+            results = [adjust_chunk(method, y[:, chunks[0]], quarter)]
+        for c, res in zip(chunks, results):
+            sa[:, c] = res
+
+    if cache_path:
+        new_cache = {}
+        for j, h in enumerate(hashes):
+            ok = np.flatnonzero(np.isfinite(y[:, j]))
+            span = sa[ok[0]:ok[-1] + 1, j]
+            new_cache[h] = [None if np.isnan(v) else float(v) for v in span]
+        save_cache(new_cache, cache_path)
+
+    out = pd.DataFrame(sa[rows], index=panel.index, columns=columns)
+    return out, {"method": method, "series": len(columns), "computed": len(todo), "cached": len(columns) - len(todo)}
+
+# === 5. OFFICIAL COMPARISON ===
+
+def compare_official(panel, sa):
+    """
+    One row per computed series with a published SA counterpart: mean absolute
+    gap relative to the official level, and correlation of quarter-on-quarter changes.
+    """
+    rows = []
+    for nsa_col, sa_col in official_pairs(sa.columns.tolist() + panel.columns.tolist()).items():
+        if nsa_col not in sa.columns:
+            continue
+        ours, official = sa[nsa_col], panel[sa_col]
+        both = ours.notna() & official.notna()
+        if both.sum() < MIN_OBS:
+            continue
+        ours, official = ours[both], official[both]
+        gap = (ours - official).abs().mean() / official.abs().mean() * 100
+        with np.errstate(invalid='ignore', divide='ignore'):
+            # NaN for constant series (e.g. GDP as a share of GDP)
+            corr = np.corrcoef(ours.diff().iloc[1:], official.diff().iloc[1:])[0, 1]
+        rows.append({"series": nsa_col, "official": sa_col, "points": int(both.sum()),
+                     "level_gap_pct": float(gap), "change_corr": float(corr)})
+    return pd.DataFrame(rows, columns=["series", "official", "points", "level_gap_pct", "change_corr"])
+
+def summarize(report):
+    if report.empty:
+        return "no official SA counterparts in this panel"
+    return (f"{len(report)} series vs official SA: median level gap {report['level_gap_pct'].median():.2f}%, "
+            f"median q/q change correlation {report['change_corr'].median():.3f}")
+
+def save_outputs(sa, report, path):
+    with pd.ExcelWriter(path) as writer:
+        sa.rename_axis('Date').reset_index().to_excel(writer, sheet_name='Quarterly SA', index=False)
+        report.to_excel(writer, sheet_name='Official comparison', index=False)
+
+# === 6. DATA LOADING ===
+
+def load_quarterly():
+    if os.path.exists(BUNDLE_NAME):
+        try:
+            read_bundle = runpy.run_path(os.path.join(SCRIPT_DIR, "unit.views.english.py"))["read_bundle"]
+            return read_bundle(BUNDLE_NAME, ['Quarterly'])['Quarterly']
+        except ImportError:
+            pass
+    source = FILE_NAME if os.path.exists(FILE_NAME) else GITHUB_URL
+    df = pd.read_excel(source, sheet_name='Quarterly', engine='openpyxl')
+    df['Date'] = pd.to_datetime(df['Date'])
+    return df.sort_values('Date').set_index('Date')
+
+# === 7. MAIN ===
+
+def _opt(args, name, default):
+    return type(default)(args[args.index(name) + 1]) if name in args else default
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    method = _opt(args, '--method', METHOD)
+    workers = _opt(args, '--workers', WORKERS)
+    out_path = _opt(args, '--out', OUT_NAME)
+
+    t0 = time.perf_counter()
+    panel = load_quarterly()
+    sa, stats = adjust_panel(panel, method, workers, CACHE_NAME)
+    report = compare_official(panel, sa)
+    save_outputs(sa, report, out_path)
+    print(f"🌦️  {stats['series']} NSA series ({stats['method']}): {stats['computed']} computed, "
+          f"{stats['cached']} from cache in {time.perf_counter() - t0:.2f}s -> {out_path}")
+    print(f"📏 {summarize(report)}")
+    for _, r in report.nlargest(5, 'level_gap_pct').iterrows():
+        print(f"    {r['level_gap_pct']:6.2f}%  {r['change_corr']:.3f}  {r['series']}")
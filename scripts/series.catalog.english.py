@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+SERIES CATALOG (One preview PNG per series, for QA after every data refresh)
+Builds one styled figure per worker (same look and citation block as the plot
+maker's finalize_plot) and only swaps the line data and texts for each series,
+instead of creating and laying out a new figure thousands of times.
+
+Usage:
+    python series.catalog.english.py [Annual|Quarterly|Monthly|all] [--workers N] [--dpi 72] [--out DIR]
+"""
+
+import os
+import re
+import sys
+import time
+import hashlib
+import runpy
+import textwrap
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+# -----------------------------------------------------------------------------
+# 1. SETUP & STYLE: "CLASSIC LUXURY" (same palette as the plot maker)
+# -----------------------------------------------------------------------------
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Palette + rcParams live in chart.style.english.py; the serif set is resolved once per host
+CLASSIC_COLORS = runpy.run_path(os.path.join(SCRIPT_DIR, "chart.style.english.py"))["apply_style"]()
+
+GITHUB_URL = "https://github.com/TheodorosKourtalis/public.debt.excels.english/raw/main/combined_wide_by_freq.xlsx"
+FILE_NAME = 'combined_wide_by_freq.xlsx'
+BUNDLE_NAME = 'combined_bundle.arrow'
+
+OUT_DIR = 'series_catalog'
+PREVIEW_DPI = 72             # Previews only; the chart pack itself stays at 300 dpi
+WORKERS = os.cpu_count() or 1
+TITLE_WIDTH = 70             # Characters per title line (two lines at most)
+
+# -----------------------------------------------------------------------------
+# 2. CITATION HELPERS (shared with the plot maker)
+# -----------------------------------------------------------------------------
+
+# Same names and citations as the plot maker; re-exported for the dashboard and the Monte Carlo
+CITATION = runpy.run_path(os.path.join(SCRIPT_DIR, "citation.english.py"))
+clean_series_name, build_citation = CITATION["clean_series_name"], CITATION["build_citation"]
+
+def file_slug(freq, label):
+    # Readable prefix + short hash: labels are long and may differ only near the end
+    stem = re.sub(r'[^\w.-]+', '_', clean_series_name(label)).strip('_')[:80]
+    return f"{freq}_{stem}_{hashlib.md5(label.encode('utf-8')).hexdigest()[:8]}.png"
+
+# -----------------------------------------------------------------------------
+# 3. FIGURE TEMPLATE
+# -----------------------------------------------------------------------------
+
+class ChartTemplate:
+    """
+    One figure with the finalize_plot styling (spines, grid, citation area).
+    render() only replaces the line data and the texts, then saves.
+    """
+    def __init__(self, dates, dpi=PREVIEW_DPI):
+        self.dpi = dpi
+        self.fig, self.ax = plt.subplots(figsize=(12, 8))
+        ax = self.ax
+        self.line, = ax.plot(dates, np.full(len(dates), np.nan), color=CLASSIC_COLORS['navy'],
+                             linewidth=2.5, marker='o', markersize=3)
+        # Smaller title than the chart pack: no bbox_inches='tight' pass, so it must fit the fixed top margin
+        self.title = ax.set_title('', fontsize=18, fontfamily='serif', fontweight='bold', pad=14, color='black')
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+        ax.spines['bottom'].set_linewidth(1.5)
+        ax.spines['left'].set_linewidth(1.5)
+        ax.grid(axis='y', visible=True, linestyle=':', alpha=0.7)
+        self.citation = self.fig.text(0.1, 0.17, '', ha="left", va="top", fontsize=10,
+                                      color='#333333', fontfamily='serif')
+        plt.subplots_adjust(bottom=0.25, top=0.86)
+
+    def render(self, dates, values, label, path):
+        mask = np.isfinite(values)
+        self.line.set_data(dates[mask], values[mask])
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.title.set_text("\n".join(textwrap.wrap(clean_series_name(label), width=TITLE_WIDTH)[:2]))
+        self.citation.set_text("\n".join(textwrap.wrap(build_citation(label), width=130)))
+        # Fast zlib level: previews are written once and glanced at
+        self.fig.savefig(path, dpi=self.dpi, pil_kwargs={'compress_level': 1})
+
+def render_chunk(freq, dates, columns, out_dir, dpi=PREVIEW_DPI):
+    """Worker entry point: one template for the whole chunk. Returns catalog rows."""
+    template = ChartTemplate(dates, dpi)
+    rows = []
+    for label, values in columns.items():
+        valid = np.flatnonzero(np.isfinite(values))
+        if not len(valid):
+            continue
+        fname = file_slug(freq, label)
+        template.render(dates, values, label, os.path.join(out_dir, fname))
+        rows.append({'file': fname, 'freq': freq, 'series': label, 'points': len(valid),
+                     'first': str(dates[valid[0]])[:10], 'last': str(dates[valid[-1]])[:10]})
+    plt.close(template.fig)
+    return rows
+
+# -----------------------------------------------------------------------------
+# 4. DATA LOADING
+# -----------------------------------------------------------------------------
+
+def load_panels(freqs):
+    if os.path.exists(BUNDLE_NAME):
+        try:
+            read_bundle = runpy.run_path(os.path.join(SCRIPT_DIR, "unit.views.english.py"))["read_bundle"]
+            return {freq: df.reset_index() for freq, df in read_bundle(BUNDLE_NAME, freqs).items()}
+        except ImportError:
+            pass
+    source = FILE_NAME if os.path.exists(FILE_NAME) else GITHUB_URL
+    return pd.read_excel(source, sheet_name=freqs, engine='openpyxl')
+
+# -----------------------------------------------------------------------------
+# 5. MAIN
+# -----------------------------------------------------------------------------
+
+def _opt(args, name, default):
+    return type(default)(args[args.index(name) + 1]) if name in args else default
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    freq_arg = args[0] if args and not args[0].startswith('--') else 'Annual'
+    workers = _opt(args, '--workers', WORKERS)
+    dpi = _opt(args, '--dpi', PREVIEW_DPI)
+    out_dir = _opt(args, '--out', OUT_DIR)
+    os.makedirs(out_dir, exist_ok=True)
+
+    t0 = time.perf_counter()
+    panels = load_panels(None if freq_arg == 'all' else [freq_arg])
+    jobs = []
+    for freq, df in panels.items():
+        df['Date'] = pd.to_datetime(df['Date'])
+        df = df.sort_values('Date')
+        dates = df['Date'].to_numpy(dtype='datetime64[ns]')
+        names = [c for c in df.columns if c != 'Date']
+        # Contiguous chunks, one per worker, so each process styles its figure once
+        for chunk in np.array_split(np.arange(len(names)), max(workers, 1)):
+            if len(chunk):
+                jobs.append((freq, dates, {names[i]: df[names[i]].to_numpy(dtype='float64') for i in chunk}))
+    n_series = sum(len(cols) for _, _, cols in jobs)
+    print(f"📊 {n_series} series across {len(panels)} frequencies, {workers} worker(s) at {dpi} dpi")
+
+    rows = []
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(render_chunk, freq, dates, cols, out_dir, dpi) for freq, dates, cols in jobs]
+            for fut in futures:
+                rows.extend(fut.result())
+    else:
+        for freq, dates, cols in jobs:
+            rows.extend(render_chunk(freq, dates, cols, out_dir, dpi))
+
+    pd.DataFrame(rows).to_csv(os.path.join(out_dir, 'catalog.csv'), index=False)
+    elapsed = time.perf_counter() - t0
+    print(f"✅ {len(rows)} previews in {elapsed:.1f}s ({elapsed / max(len(rows), 1) * 1000:.0f} ms/series) -> {out_dir}")
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""
+LOCAL SERIES QUERY SERVICE (HTTP/JSON over the wide-by-frequency panel)
+Loads combined_wide_by_freq.xlsx once into an in-memory columnar cache and
+answers keyword/frequency/date-range queries in milliseconds.
+
+Endpoints:
+    GET /catalog                       -> {freq: [column, ...]}
+    GET /series?freq=Annual&keywords=Nominal,GDP&start=2000&end=2010[&first=1]
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import hashlib
+import threading
+import urllib.parse
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+import pandas as pd
+
+# --- 1. CONFIGURATION ---
+GITHUB_URL = "https://github.com/TheodorosKourtalis/public.debt.excels.english/raw/main/combined_wide_by_freq.xlsx"
+FILE_NAME = 'combined_wide_by_freq.xlsx'
+HOST = "127.0.0.1"
+PORT = 8765
+CACHE_SIZE = 256  # Max number of derived query results kept (LRU)
+
+# === 2. COLUMNAR PANEL CACHE ===
+
+class PanelCache:
+    """
+    Holds every frequency sheet as a Date vector plus one float64 array per column.
+    Derived query results are kept in an LRU keyed by the normalized query.
+    """
+
+    def __init__(self, path, cache_size=CACHE_SIZE):
+        self.path = path
+        self.cache_size = cache_size
+        self.results = OrderedDict()
+        self.lock = threading.Lock()
+        self.mtime = None
+        self.version = ""
+        self.panels = {}
+        self.load()
+
+    def load(self):
+        t0 = time.perf_counter()
+        source = self.path if os.path.exists(self.path) else GITHUB_URL
+        sheets = pd.read_excel(source, sheet_name=None, engine='openpyxl')
+
+        panels = {}
+        for freq, df in sheets.items():
+            if 'Date' not in df.columns:
+                continue
+            df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+            df = df[df['Date'].notna()].sort_values('Date')
+            columns = {c: df[c].to_numpy(dtype='float64', na_value=np.nan)
+                       for c in df.columns if c != 'Date'}
+            panels[freq] = {
+                'dates': df['Date'].to_numpy(dtype='datetime64[ns]'),
+                'columns': columns,
+                'names': list(columns),
+                'lower': [c.lower() for c in columns],
+            }
+
+        self.panels = panels
+        self.results.clear()
+        self.mtime = os.path.getmtime(self.path) if os.path.exists(self.path) else None
+        self.version = hashlib.md5(f"{source}:{self.mtime}".encode('utf-8')).hexdigest()[:12]
+        n_cols = sum(len(p['names']) for p in panels.values())
+        print(f"📦 Loaded {n_cols} series across {len(panels)} sheets in {time.perf_counter() - t0:.2f}s")
+
+    def refresh_if_changed(self):
+        if os.path.exists(self.path) and os.path.getmtime(self.path) != self.mtime:
+            print("🔄 Panel file changed on disk. Reloading.")
+            self.load()
+
+    @staticmethod
+    def match(panel, keywords):
+        # Same semantics as get_col in the plot maker: every keyword must appear (case-insensitive)
+        kws = [k.lower() for k in keywords]
+        return [name for name, low in zip(panel['names'], panel['lower']) if all(k in low for k in kws)]
+
+    def query(self, freq, keywords, start=None, end=None, first=False):
+        key = (freq, tuple(keywords), start, end, first)
+        # Only the LRU get/put hold the lock; slicing and JSON encoding run concurrently
+        with self.lock:
+            if key in self.results:
+                self.results.move_to_end(key)
+                return self.results[key]
+            panel, version = self.panels[freq], self.version
+
+        names = self.match(panel, keywords)
+        if first:
+            names = names[:1]
+
+        dates = panel['dates']
+        lo = 0 if start is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(start)), side='left')
+        hi = len(dates) if end is None else np.searchsorted(dates, np.datetime64(_end_bound(end)), side='right')
+
+        series = {}
+        for name in names:
+            vals = panel['columns'][name][lo:hi]
+            series[name] = np.where(np.isnan(vals), None, vals).tolist()
+
+        payload = {
+            'freq': freq,
+            'keywords': list(keywords),
+            'version': version,
+            'dates': np.datetime_as_string(dates[lo:hi], unit='D').tolist(),
+            'series': series,
+        }
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+
+        with self.lock:
+            # A reload meanwhile cleared the cache: this result belongs to the old panel
+            if version == self.version:
+                self.results[key] = (body, etag)
+                if len(self.results) > self.cache_size:
+                    self.results.popitem(last=False)
+        return body, etag
+
+    def catalog(self):
+        body = json.dumps({f: p['names'] for f, p in self.panels.items()}, ensure_ascii=False).encode('utf-8')
+        return body, '"' + hashlib.md5(body).hexdigest() + '"'
+
+def _end_bound(end):
+    # "2001", "2001-06" or "2001Q2" mean the whole period: up to its last instant, not its first day
+    text = str(end).strip()
+    if re.fullmatch(r"\d{4}(?:-\d{1,2})?|\d{4}-?[Qq][1-4]", text):
+        return pd.Period(text.replace('-Q', 'Q').upper()).end_time
+    return pd.Timestamp(text)
+
+# === 3. HTTP HANDLER ===
+
+def _parse_keywords(raw):
+    return [k.strip() for k in raw.split(',') if k.strip()]
+
+def _error(status, msg):
+    return status, json.dumps({'error': msg}).encode('utf-8'), None
+
+class SeriesHandler(BaseHTTPRequestHandler):
+    cache = None
+
+    def _send(self, status, body=b"", etag=None, elapsed=None):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        if etag:
+            self.send_header("ETag", etag)
+        if elapsed is not None:
+            self.send_header("X-Query-Time-ms", f"{elapsed * 1000:.2f}")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def do_GET(self):
+        t0 = time.perf_counter()
+        parsed = urllib.parse.urlparse(self.path)
+        params = {k: v[-1] for k, v in urllib.parse.parse_qs(parsed.query).items()}
+
+        # Only a reload and the LRU get/put are serialized; queries and socket writes run concurrently
+        with self.cache.lock:
+            self.cache.refresh_if_changed()
+        status, body, etag = self._resolve(parsed.path, params)
+
+        if status == 200 and self.headers.get("If-None-Match") == etag:
+            status, body = 304, b""
+        self._send(status, body, etag=etag, elapsed=time.perf_counter() - t0)
+
+    def _resolve(self, path, params):
+        cache = self.cache
+        if path == "/catalog":
+            return (200,) + cache.catalog()
+        if path != "/series":
+            return _error(404, "Unknown endpoint. Use /catalog or /series.")
+
+        freq = params.get('freq', 'Annual')
+        if freq not in cache.panels:
+            return _error(404, f"Unknown frequency '{freq}'. Available: {list(cache.panels)}")
+        keywords = _parse_keywords(params.get('keywords', ''))
+        if not keywords:
+            return _error(400, "Parameter 'keywords' is required (comma separated).")
+        try:
+            body, etag = cache.query(freq, keywords, params.get('start'), params.get('end'),
+                                     first=params.get('first', '0') in ('1', 'true'))
+        except ValueError as e:
+            return _error(400, f"Bad date range: {e}")
+        return 200, body, etag
+
+# === 4. MAIN ===
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else PORT
+    SeriesHandler.cache = PanelCache(FILE_NAME)
+    server = ThreadingHTTPServer((HOST, port), SeriesHandler)
+    print(f"🌐 Serving series queries on http://{HOST}:{port}/series")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n=== STOPPED ===")
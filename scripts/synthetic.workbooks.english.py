@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+SYNTHETIC WORKBOOK GENERATOR (Stress-test inputs in the real Greece in Numbers layouts)
+Writes any number of workbooks shaped like the published ones: a Data sheet with
+the two-row category/unit header ("Columns"/"Τιμές Στήλης" + "Metric" + "Date"
+row) or a single header row, annual or quarterly dates in the formats the loader
+recognises, some values as decimal-comma strings, and an Info sheet.
+A filenames.txt list is written alongside for LOADER_FILENAMES.
+
+Usage:
+    python synthetic.workbooks.english.py <out_dir> [n_files] [series_per_file] [n_dates] [seed]
+"""
+
+import os
+import sys
+import time
+import numpy as np
+
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
+# --- 1. CONFIGURATION ---
+N_FILES = 60
+SERIES_PER_FILE = 20
+N_DATES = 120
+SEED = 7
+
+QUARTERLY_SHARE = 0.5      # Share of workbooks with quarterly dates (the rest annual)
+SINGLE_HEADER_SHARE = 0.15 # Share written with one header row (like Nominal_GDP.xlsx)
+DECIMAL_COMMA_SHARE = 0.2  # Share whose values are text like "12.345,6"
+DUPLICATE_SHARE = 0.05     # Share that repeats an earlier workbook's data (exercises dedup)
+LAST_YEAR = 2024
+FIRST_YEAR = 1700          # Keeps annual dates inside the datetime64[ns] range
+
+PLACEHOLDERS = ["Columns", "Τιμές Στήλης"]
+CATEGORIES = [
+    "Gross Domestic Product", "Government revenues", "Government expenditures", "Taxes on income",
+    "Social contributions", "Interest payments", "Public investment", "Capital stock",
+    "Compensation of employees", "Exports", "Imports", "Consumption", "Gross Value Added",
+]
+UNITS = ["Euros", "GDP share", "Constant prices (2020)", "Current prices", "Tax revenue share"]
+QUARTER_STYLES = ["%Y-%m", "%YQ%q", "Τ%q %Y"]
+
+# === 2. LAYOUT HELPERS ===
+
+def date_labels(freq, n_dates, style):
+    if freq == "Annual":
+        n = min(n_dates, LAST_YEAR - FIRST_YEAR + 1)
+        return [str(y) for y in range(LAST_YEAR - n + 1, LAST_YEAR + 1)]
+    quarters = [(LAST_YEAR - (n_dates - 1 - i) // 4, 4 - (n_dates - 1 - i) % 4) for i in range(n_dates)]
+    quarters = [(y, q) for y, q in quarters if y >= FIRST_YEAR]
+    if style == "%Y-%m":
+        return [f"{y}-{q * 3:02d}" for y, q in quarters]
+    if style == "%YQ%q":
+        return [f"{y}Q{q}" for y, q in quarters]
+    return [f"Τ{q} {y}" for y, q in quarters]
+
+def series_header(rng, n_series):
+    # Categories each carry 1-3 units; only the first column of a group names the category (merged look)
+    cats, units = [], []
+    while len(units) < n_series:
+        cat = f"{CATEGORIES[rng.integers(len(CATEGORIES))]} {rng.integers(1, 10_000)}"
+        k = min(int(rng.integers(1, 4)), n_series - len(units))
+        picked = rng.choice(UNITS, size=k, replace=False)
+        cats += [cat] + [None] * (k - 1)
+        units += list(picked)
+    return cats, units
+
+def random_values(rng, n_rows, n_series):
+    # Random walks with a ragged start: later series begin part-way through the sample
+    steps = rng.normal(0.0, 1.0, size=(n_rows, n_series))
+    vals = 100.0 + np.cumsum(steps, axis=0) * rng.uniform(0.5, 5.0, size=n_series)
+    starts = rng.integers(0, max(n_rows // 3, 1), size=n_series)
+    vals[np.arange(n_rows)[:, None] < starts] = np.nan
+    return np.round(vals, 1)
+
+def decimal_comma(v):
+    return f"{v:,.1f}".replace(",", " ").replace(".", ",").replace(" ", ".")
+
+# === 3. WRITER ===
+
+def layout_placeholder(path):
+    # Stable per file, so reruns with the same seed produce identical workbooks
+    return PLACEHOLDERS[sum(map(ord, os.path.basename(path))) % len(PLACEHOLDERS)]
+
+def write_workbook(path, layout, dates, cats, units, vals, as_text):
+    wb = xlsxwriter.Workbook(path, {"constant_memory": True})
+    ws = wb.add_worksheet("Data")
+    if layout == "two_row":
+        ws.write_row(0, 0, [layout_placeholder(path)] + cats)
+        ws.write_row(1, 0, ["Metric"] + units)
+        ws.write(2, 0, "Date")
+        first = 3
+    else:
+        ws.write_row(0, 0, ["Date"] + [f"{c or ''} {u}".strip() for c, u in zip(cats, units)])
+        first = 1
+    for r, (label, row) in enumerate(zip(dates, vals), start=first):
+        ws.write_string(r, 0, label)
+        for c in np.flatnonzero(~np.isnan(row)):
+            if as_text:
+                ws.write_string(r, int(c) + 1, decimal_comma(row[c]))
+            else:
+                ws.write_number(r, int(c) + 1, row[c])
+    info = wb.add_worksheet("Info")
+    info.write_row(0, 0, [None, "Greece in Numbers"])
+    info.write_row(1, 0, ["Title", os.path.basename(path)[:-5].replace("_", " ")])
+    info.write_row(2, 0, ["Attribution", "Synthetic stress-test data"])
+    wb.close()
+
+def generate(out_dir, n_files=N_FILES, series_per_file=SERIES_PER_FILE, n_dates=N_DATES, seed=SEED):
+    """Writes n_files workbooks plus filenames.txt. Returns the file names."""
+    if xlsxwriter is None:
+        sys.exit("xlsxwriter is required to generate synthetic workbooks.")
+    os.makedirs(out_dir, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    names, written = [], []
+    for i in range(n_files):
+        freq = "Quarterly" if rng.random() < QUARTERLY_SHARE else "Annual"
+        layout = "single" if rng.random() < SINGLE_HEADER_SHARE else "two_row"
+        style = QUARTER_STYLES[rng.integers(len(QUARTER_STYLES))]
+        dates = date_labels(freq, n_dates, style)
+        as_text = rng.random() < DECIMAL_COMMA_SHARE
+
+        if written and rng.random() < DUPLICATE_SHARE:
+            freq, layout, dates, cats, units, vals = written[rng.integers(len(written))]
+        else:
+            cats, units = series_header(rng, series_per_file)
+            vals = random_values(rng, len(dates), series_per_file)
+            written.append((freq, layout, dates, cats, units, vals))
+
+        name = f"Synthetic_{i:05d}_{freq.lower()}.xlsx"
+        write_workbook(os.path.join(out_dir, name), layout, dates, cats, units, vals, as_text)
+        names.append(name)
+        # Only the most recent workbooks are candidates for duplication, to bound memory
+        written = written[-50:]
+
+    with open(os.path.join(out_dir, "filenames.txt"), "w", encoding="utf-8") as f:
+        f.write("\n".join(names) + "\n")
+    return names
+
+# === 4. MAIN ===
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit(__doc__)
+    out_dir = sys.argv[1]
+    params = [int(a) for a in sys.argv[2:6]]
+    t0 = time.perf_counter()
+    names = generate(out_dir, *params)
+    size = sum(os.path.getsize(os.path.join(out_dir, n)) for n in names)
+    print(f"✅ {len(names)} workbooks ({size / 1e6:.1f} MB) in {time.perf_counter() - t0:.1f}s -> {out_dir}")
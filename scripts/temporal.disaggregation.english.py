@@ -0,0 +1,373 @@
+# -*- coding: utf-8 -*-
+"""
+TEMPORAL DISAGGREGATION (Annual series -> quarters, for one unified quarterly panel)
+Every annual series gets a quarterly path that adds back to the published annual
+values: Chow-Lin (GLS on a quarterly indicator with AR(1) residuals) when the
+panel has a quarterly series that tracks it, Denton first-difference smoothing
+otherwise. Series sharing a span are solved together as stacked linear systems.
+Euro levels are flows whose quarters sum to the year, stocks (debt, capital stock)
+end at Q4, and only shares, rates and indices average. Each result is checked
+against its published quarterly twin, where one exists, for scale.
+
+Usage:
+    python temporal.disaggregation.english.py [--out quarterly_unified.xlsx]
+"""
+
+import os
+import re
+import sys
+import time
+import runpy
+import numpy as np
+import pandas as pd
+
+# --- 1. CONFIGURATION ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+GITHUB_URL = "https://github.com/TheodorosKourtalis/public.debt.excels.english/raw/main/combined_wide_by_freq.xlsx"
+FILE_NAME = 'combined_wide_by_freq.xlsx'
+BUNDLE_NAME = 'combined_bundle.arrow'
+OUT_NAME = 'quarterly_unified.xlsx'
+
+MIN_YEARS = 3                 # Shorter annual series are left out
+MIN_CORR = 0.9                # Indicator must track the annual changes at least this closely...
+MIN_OVERLAP = 10              # ...over this many annual changes
+RHO_GRID = np.linspace(0.05, 0.95, 19)   # AR(1) coefficients tried by the Chow-Lin likelihood
+
+TWIN_TOL = 0.02               # A quarterly series whose yearly sum, mean or Q4 is mostly this close is the annual's twin
+SCALE_TOL = 0.1               # Disaggregated quarters must sit this close to the twin (median ratio)
+
+# How the four quarters add up to the annual value, matched as whole words (stock first, then average)
+STOCK_WORDS = ["debt", "capital stock"]                        # End-of-year level: Q4
+AVERAGE_WORDS = ["share", "shares", "ratio", "rate", "rates", "index", "indices", "deflator", "growth",
+                 "contribution", "contributions", "duration", "age", "percent", "percentage", "ηλικία"]
+LEVEL_UNITS = ["euro", "euros", "current prices", "constant prices"]   # Money levels: flows unless a stock
+UNIT_VIEWS = runpy.run_path(os.path.join(SCRIPT_DIR, "unit.views.english.py"))
+
+# === 2. SERIES CLASSIFICATION ===
+
+def _words(words):
+    return re.compile(r"\b(?:" + "|".join(re.escape(w) for w in words) + r")\b|%")
+
+STOCK_RE, AVERAGE_RE, LEVEL_RE = _words(STOCK_WORDS), _words(AVERAGE_WORDS), _words(LEVEL_UNITS)
+
+def parse_label(label):
+    """
+    'Source | Category (Unit)' -> (source, category, unit), lower case with '_' as spaces.
+    A numeric "unit" is the workbook's first-value annotation, not a unit: it is dropped
+    and the unit is looked for again ('GDP_per_capita | Euros (current prices) (9770)').
+    """
+    base, unit = UNIT_VIEWS["split_label"](label)
+    if unit and not re.search(r'[^\W\d_]', unit):
+        base, unit = UNIT_VIEWS["split_label"](base)
+    source, _, category = base.partition(' | ')
+    clean = lambda t: re.sub(r'\s+', ' ', t.replace('_', ' ')).strip().lower()
+    return clean(source), clean(category), clean(unit)
+
+def aggregation(label):
+    source, category, unit = parse_label(label)
+    if STOCK_RE.search(f"{source} | {category}"):
+        return "last"
+    if AVERAGE_RE.search(unit) or (not LEVEL_RE.search(unit) and AVERAGE_RE.search(f"{source} | {category}")):
+        return "mean"
+    return "sum"
+
+def unit_family(label):
+    # Ratios only stand in for ratios, levels for levels
+    return "share" if aggregation(label) == "mean" else "level"
+
+def source_key(label):
+    # "X_(annual_data_1995-present)-1 | S" and "X_(quarterly_data_1999-present)_ | S" -> "x | s"
+    source, _, series = label.partition('|')
+    source = re.sub(r'_?\((annual|quarterly)_data[^)]*\)', '', source.strip())
+    source = re.sub(r'(-\d+|_)+$', '', source)
+    return f"{source} | {series.strip()}".lower()
+
+def aggregation_matrix(n_years, kind, n_quarters=None):
+    """(years x quarters) matrix C with C @ quarterly = annual."""
+    C = np.zeros((n_years, n_quarters or 4 * n_years))
+    for y in range(n_years):
+        if kind == "last":
+            C[y, 4 * y + 3] = 1.0
+        else:
+            C[y, 4 * y:4 * y + 4] = 1.0 if kind == "sum" else 0.25
+    return C
+
+def annualize(q, kind):
+    """(4*years x series) complete quarters -> (years x series); NaN for incomplete years."""
+    blocks = q.reshape(-1, 4, q.shape[1])
+    if kind == "last":
+        out = blocks[:, 3, :].copy()
+    else:
+        out = blocks.sum(axis=1) if kind == "sum" else blocks.mean(axis=1)
+    out[np.isnan(blocks).any(axis=1)] = np.nan
+    return out
+
+# === 3. INDICATOR SELECTION ===
+
+def nan_corr(a, b):
+    """Pairwise correlation of the columns of a and b over rows where both are finite."""
+    ma, mb = np.isfinite(a).astype(float), np.isfinite(b).astype(float)
+    a0, b0 = np.nan_to_num(a), np.nan_to_num(b)
+    n = ma.T @ mb
+    sa, sb = a0.T @ mb, ma.T @ b0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = a0.T @ b0 - sa * sb / n
+        va = (a0 ** 2).T @ mb - sa ** 2 / n
+        vb = ma.T @ (b0 ** 2) - sb ** 2 / n
+        return cov / np.sqrt(va * vb), n
+
+def pick_indicators(annual, quarterly, spans, kinds):
+    """
+    {annual column: (quarterly column, corr)}. A same-source quarterly series wins;
+    otherwise the quarterly column in the same unit family whose annual changes
+    correlate best. Either way the indicator must cover the whole annual span.
+    """
+    qcols = list(quarterly.columns)
+    qvals = quarterly.to_numpy(dtype='float64')
+    qfamily = np.array([unit_family(c) for c in qcols])
+    by_key = {}
+    for j, c in enumerate(qcols):
+        by_key.setdefault(source_key(c), j)
+    picks = {}
+    for kind in set(kinds.values()):
+        acols = [c for c in annual.columns if kinds[c] == kind]
+        if not acols:
+            continue
+        qa = annualize(qvals, kind)
+        corr, n = nan_corr(np.diff(annual[acols].to_numpy(dtype='float64'), axis=0), np.diff(qa, axis=0))
+        corr = np.where(n >= MIN_OVERLAP, np.abs(corr), np.nan)
+        complete = np.vstack([np.zeros((1, len(qcols))), np.cumsum(np.isfinite(qa), axis=0)])
+        for i, c in enumerate(acols):
+            first, last = spans[c]
+            covers = complete[last + 1] - complete[first] == last - first + 1
+            row = np.where(covers, corr[i], np.nan)
+            same = by_key.get(source_key(c))
+            if same is not None and covers[same] and np.isfinite(row[same]):
+                picks[c] = (qcols[same], float(row[same]))
+                continue
+            row = np.where(qfamily == unit_family(c), row, np.nan)
+            if np.isfinite(row).any() and np.nanmax(row) >= MIN_CORR:
+                j = int(np.nanargmax(row))
+                picks[c] = (qcols[j], float(row[j]))
+    return picks
+
+# === 4. BATCHED SOLVERS ===
+
+def denton(Y, C):
+    """
+    Additive first-difference Denton without an indicator, for k series at once:
+    min sum (x_t - x_t-1)^2 s.t. C x = y. Y is (k x years); returns (k x quarters).
+    """
+    m, n = C.shape
+    D = np.diff(np.eye(n), axis=0)
+    system = np.block([[D.T @ D, C.T], [C, np.zeros((m, m))]])
+    rhs = np.vstack([np.zeros((n, Y.shape[0])), Y.T])
+    return np.linalg.solve(system, rhs)[:n].T
+
+def chow_lin(Y, X, C):
+    """
+    Chow-Lin with AR(1) residuals for k series at once. Y (k x years), X (k x quarters x regressors).
+    rho is chosen per series by maximum likelihood over RHO_GRID.
+    Returns (k x quarters) paths and the chosen rho per series.
+    """
+    m, n = C.shape
+    Xa = np.einsum('mn,knr->kmr', C, X)
+    lag = np.abs(np.subtract.outer(np.arange(n), np.arange(n)))
+    best_ll = np.full(len(Y), -np.inf)
+    best_x = np.full((len(Y), n), np.nan)
+    best_rho = np.full(len(Y), np.nan)
+    for rho in RHO_GRID:
+        V = rho ** lag / (1 - rho ** 2)
+        W = C @ V @ C.T
+        Winv = np.linalg.inv(W)
+        logdet = np.linalg.slogdet(W)[1]
+        A = np.einsum('kmr,ml,kls->krs', Xa, Winv, Xa)
+        b = np.einsum('kmr,ml,kl->kr', Xa, Winv, Y)
+        beta = np.linalg.solve(A, b[..., None])[..., 0]
+        u = Y - np.einsum('kmr,kr->km', Xa, beta)
+        s2 = np.einsum('km,ml,kl->k', u, Winv, u) / m
+        ll = -0.5 * (m * np.log(s2) + logdet)
+        x = np.einsum('knr,kr->kn', X, beta) + u @ (V @ C.T @ Winv).T
+        better = ll > best_ll
+        best_ll[better], best_x[better], best_rho[better] = ll[better], x[better], rho
+    return best_x, best_rho
+
+# === 5. UNIFIED PANEL ===
+
+def disaggregate(annual, quarterly):
+    """
+    Quarterly paths for every annual column. Both panels are indexed by Date.
+    Returns (unified quarterly panel: quarterly columns + disaggregated annual columns, report).
+    """
+    qperiods = pd.PeriodIndex(pd.DatetimeIndex(quarterly.index), freq='Q')
+    years = np.arange(qperiods.min().year, qperiods.max().year + 1)
+    grid = pd.period_range(f"{years[0]}Q1", f"{years[-1]}Q4", freq='Q')
+    q = pd.DataFrame(np.nan, index=grid, columns=quarterly.columns)
+    q.iloc[grid.get_indexer(qperiods)] = quarterly.to_numpy(dtype='float64')
+
+    a = annual.groupby(pd.DatetimeIndex(annual.index).year).mean().reindex(years)
+    a = a.loc[:, a.notna().sum() >= MIN_YEARS]
+    spans, kinds = {}, {}
+    for c in a.columns:
+        ok = np.flatnonzero(a[c].notna().to_numpy())
+        # Interior gaps would break the aggregation constraints
+        if ok[-1] - ok[0] + 1 == len(ok):
+            spans[c], kinds[c] = (int(ok[0]), int(ok[-1])), aggregation(c)
+    a = a[list(spans)]
+    picks = pick_indicators(a, q, spans, kinds)
+    twins = find_twins(a, q)
+
+    # Chow-Lin paths run on past the last annual value while the indicator lasts
+    qvals = q.to_numpy(dtype='float64')
+    qpos = {c: j for j, c in enumerate(q.columns)}
+    def _extent(c):
+        first, last = spans[c]
+        end = 4 * (last + 1)
+        if c in picks:
+            ind = qvals[end:, qpos[picks[c][0]]]
+            end += len(ind) if np.isfinite(ind).all() else int(np.argmin(np.isfinite(ind)))
+        return first, last, end
+
+    groups = {}
+    for c in a.columns:
+        first, last, end = _extent(c)
+        groups.setdefault((first, last, end, kinds[c], c in picks), []).append(c)
+
+    out = np.full((len(grid), len(a.columns)), np.nan)
+    col = {c: j for j, c in enumerate(a.columns)}
+    report = []
+    for (first, last, end, kind, has_ind), cols in groups.items():
+        n_years = last - first + 1
+        start = 4 * first
+        C = aggregation_matrix(n_years, kind, end - start)
+        Y = a[cols].to_numpy(dtype='float64')[first:last + 1].T
+        if has_ind:
+            ind = np.stack([qvals[start:end, qpos[picks[c][0]]] for c in cols])
+            X = np.stack([np.ones_like(ind), ind], axis=-1)
+            paths, rhos = chow_lin(Y, X, C)
+        else:
+            paths, rhos = denton(Y, C), np.full(len(cols), np.nan)
+        for c, path, rho in zip(cols, paths, rhos):
+            out[start:end, col[c]] = path
+            indicator, corr = picks.get(c, (None, np.nan))
+            twin, ratio = twins.get(c), np.nan
+            if twin is not None:
+                ref = qvals[start:end, qpos[twin]]
+                ok = np.isfinite(ref) & (ref != 0)
+                ratio = float(np.median(path[ok] / ref[ok])) if ok.any() else np.nan
+            report.append({"series": c, "method": "chow-lin" if has_ind else "denton", "aggregation": kind,
+                           "indicator": indicator, "corr": corr, "rho": rho,
+                           "first": int(years[first]), "last": int(years[last]), "quarters": end - start,
+                           "twin": twin, "twin_ratio": ratio})
+
+    dates = grid.asfreq('M', how='end').to_timestamp()
+    unified = pd.concat([q.set_axis(dates), pd.DataFrame(out, index=dates, columns=a.columns)], axis=1)
+    unified = unified.loc[unified.notna().any(axis=1)].rename_axis('Date')
+    return unified, pd.DataFrame(report)
+
+def series_match(a_cols, q_cols):
+    """
+    (annual x quarterly) bool: same source and series, or one category naming the
+    other as whole words ("Total social contributions" / "Social contributions").
+    """
+    key = lambda cols: np.array([source_key(c) for c in cols], dtype=object)
+    cat = lambda cols: [f" {parse_label(c)[1]} " for c in cols]
+    match = key(a_cols)[:, None] == key(q_cols)[None, :]
+    a_cats, q_cats = cat(a_cols), cat(q_cols)
+    for ca in set(a_cats) - {"  "}:
+        rows = [i for i, c in enumerate(a_cats) if c == ca]
+        hits = [j for j, cq in enumerate(q_cats) if cq != "  " and (ca in cq or cq in ca)]
+        match[np.ix_(rows, hits)] = True
+    return match
+
+def find_twins(a, q):
+    """
+    {annual column: quarterly column} for annual series also published quarterly: the
+    quarterly column whose yearly sum, mean or Q4 is within TWIN_TOL of the annual
+    value in most overlapping years. Only the same series with a ratio / level unit like
+    the annual's is a candidate, and constant series (100% totals) twin nothing: their
+    values alone would match any other constant. a is indexed by year, q by the
+    matching quarter grid.
+    """
+    av, qv = a.to_numpy(dtype='float64'), q.to_numpy(dtype='float64')
+    moving = lambda v: np.where(np.isnan(v), -np.inf, v).max(axis=0) > np.where(np.isnan(v), np.inf, v).min(axis=0)
+    # Family from the unit alone, so a flow misread as a mean still finds its twin and fails the scale check
+    family = lambda cols: np.array([bool(AVERAGE_RE.search(parse_label(c)[2])) for c in cols])
+    a_family, q_family = family(a.columns), family(q.columns)
+    allowed = ((a_family[:, None] == q_family[None, :]) & moving(av)[:, None] & moving(qv)[None, :]
+               & series_match(a.columns, q.columns))
+    best = np.full(av.shape[1], 0.5)
+    twin = np.full(av.shape[1], -1)
+    for kind in ("sum", "mean", "last"):
+        qa = annualize(qv, kind)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            gap = np.abs(qa[:, None, :] / av[:, :, None] - 1)
+        n = np.isfinite(gap).sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            close = np.where(allowed & (n >= MIN_YEARS), (gap < TWIN_TOL).sum(axis=0) / n, 0.0)
+        j = np.argmax(close, axis=1)
+        share = close[np.arange(len(j)), j]
+        better = share > best
+        best[better], twin[better] = share[better], j[better]
+    return {a.columns[i]: q.columns[j] for i, j in enumerate(twin) if j >= 0}
+
+def scale_check(report):
+    """Disaggregated series whose quarters sit off their published twin's scale (e.g. each quarter the full year)."""
+    off = report["twin_ratio"].notna() & ((report["twin_ratio"] - 1).abs() > SCALE_TOL)
+    return report.loc[off, ["series", "aggregation", "twin", "twin_ratio"]]
+
+def aggregation_error(unified, annual, report):
+    """Largest |re-aggregated - published| over all disaggregated series, relative to each series' scale."""
+    worst = 0.0
+    years = pd.DatetimeIndex(annual.index).year
+    for r in report.itertuples():
+        path = unified[r.series]
+        block = path[(path.index.year >= r.first) & (path.index.year <= r.last)].to_numpy()
+        back = annualize(block[:, None], r.aggregation)[:, 0]
+        pub = annual[r.series].groupby(years).mean().loc[r.first:r.last].to_numpy()
+        scale = np.nanmax(np.abs(pub))
+        if scale > 0:
+            worst = max(worst, float(np.nanmax(np.abs(back - pub)) / scale))
+    return worst
+
+def save_outputs(unified, report, path):
+    with pd.ExcelWriter(path) as writer:
+        unified.reset_index().to_excel(writer, sheet_name='Quarterly', index=False)
+        report.to_excel(writer, sheet_name='Disaggregation', index=False)
+
+# === 6. DATA LOADING ===
+
+def load_panels():
+    if os.path.exists(BUNDLE_NAME):
+        try:
+            read_bundle = runpy.run_path(os.path.join(SCRIPT_DIR, "unit.views.english.py"))["read_bundle"]
+            return read_bundle(BUNDLE_NAME, ['Annual', 'Quarterly'])
+        except ImportError:
+            pass
+    source = FILE_NAME if os.path.exists(FILE_NAME) else GITHUB_URL
+    sheets = pd.read_excel(source, sheet_name=['Annual', 'Quarterly'], engine='openpyxl')
+    for freq, df in sheets.items():
+        df['Date'] = pd.to_datetime(df['Date'])
+        sheets[freq] = df.sort_values('Date').set_index('Date')
+    return sheets
+
+# === 7. MAIN ===
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    out_path = args[args.index('--out') + 1] if '--out' in args else OUT_NAME
+
+    t0 = time.perf_counter()
+    panels = load_panels()
+    unified, report = disaggregate(panels['Annual'], panels['Quarterly'])
+    elapsed = time.perf_counter() - t0
+    save_outputs(unified, report, out_path)
+    counts = report['method'].value_counts().to_dict()
+    print(f"🧩 {len(report)} annual series -> quarters ({counts.get('chow-lin', 0)} Chow-Lin, "
+          f"{counts.get('denton', 0)} Denton) in {elapsed:.2f}s -> {out_path}")
+    print(f"📏 Unified panel {unified.shape[0]} quarters x {unified.shape[1]} series; "
+          f"max annual re-aggregation error {aggregation_error(unified, panels['Annual'], report):.2e}")
+    off = scale_check(report)
+    print(f"⚖️  {report['twin'].notna().sum()} series have a published quarterly twin; {len(off)} off its scale")
+    for r in off.itertuples():
+        print(f"    ⚠️  {r.series} ({r.aggregation}): {r.twin_ratio:.2f}x {r.twin}")
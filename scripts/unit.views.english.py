@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+"""
+UNIT VIEWS (Levels stored once; GDP shares, duplicates and per-capita derived on demand)
+Every flattened label ends in a "(unit)" suffix. A "GDP share" series whose level
+twin ("Euros" / "Current prices") divided by the frequency's nominal GDP reproduces
+the published values within their rounding is not stored: it becomes a view that
+is computed from the level when asked for. Exact duplicate columns ("Euros.1")
+become aliases. Shares that do not reproduce (e.g. debt ratios on another GDP
+vintage) stay stored as published. Per-capita views divide a level by the
+population implied by nominal GDP and GDP per capita.
+
+Usage:
+    views = runpy.run_path(os.path.join(SCRIPT_DIR, "unit.views.english.py"))
+    spec = views["find_views"](panel, freq)          # {"views": {...}, "denominators": {...}}
+    panels = views["read_bundle"]("combined_bundle.arrow", ["Annual"])
+    debt = views["read_bundle"]("combined_bundle.arrow", ["Annual"],
+                                ["General_Government_Debt_(annual_data_1995-present)-1 | General government (Per capita)"])
+
+    python unit.views.english.py [Annual|Quarterly]  # what would be derived, and the saving
+"""
+
+import re
+import sys
+import json
+import numpy as np
+import pandas as pd
+
+# --- 1. CONFIGURATION ---
+FILE_NAME = 'combined_wide_by_freq.xlsx'
+BUNDLE_NAME = 'combined_bundle.arrow'
+
+SHARE_UNIT = 'GDP share'
+LEVEL_UNITS = ['Euros', 'Current prices']   # Level twin of a share, first match wins
+ALIAS_RE = re.compile(r"^(?P<unit>.*)\.\d+$")  # "Euros.1": pandas' suffix for a repeated header
+MAX_PATCH = 2   # Published points a share view may carry where its inputs are missing (e.g. no GDP for 1995)
+
+# GDP denominators tried in order, per frequency: (key, label prefix, rolling window in periods)
+DENOMINATORS = {
+    'Annual': [('gdp', 'Nominal_GDP | Nominal Gross Domestic Product', 1)],
+    'Quarterly': [('gdp_nsa', 'GDP_not_seasonally_adjusted_ | GDP (Current prices)', 1),
+                  ('gdp_sa', 'GDP_seasonally_adjusted-2 | GDP (Current prices)', 1),
+                  ('gdp_nsa_4q', 'GDP_not_seasonally_adjusted_ | GDP (Current prices)', 4),
+                  ('gdp_sa_4q', 'GDP_seasonally_adjusted-2 | GDP (Current prices)', 4)],
+}
+# Population = nominal GDP (million euros) / GDP per capita (euros), from the Annual panel
+POPULATION = {'gdp': 'Nominal_GDP | Nominal Gross Domestic Product',
+              'per_capita': 'GDP_per_capita | Euros (current prices)',
+              'scale': 1e6}
+PER_CAPITA_UNIT = 'Per capita'
+
+# === 2. LABELS ===
+
+def split_label(label):
+    """'Source | Category (Unit (2020))' -> ('Source | Category', 'Unit (2020)'); unit '' if none."""
+    label = str(label)
+    if not label.endswith(')'):
+        return label, ''
+    depth = 0
+    for i in range(len(label) - 1, -1, -1):
+        depth += {')': 1, '(': -1}.get(label[i], 0)
+        if depth == 0:
+            return label[:i].rstrip(), label[i + 1:-1]
+    return label, ''
+
+def _find(columns, prefix):
+    return next((c for c in columns if str(c).startswith(prefix)), None)
+
+def decimals(values):
+    """Published decimal places per column (0-6), from the values themselves."""
+    out = np.full(values.shape[1], 6)
+    for d in range(6, -1, -1):
+        scaled = values * 10.0 ** d
+        ok = np.all(np.isnan(scaled) | (np.abs(scaled - np.round(scaled)) < 1e-9 * np.maximum(1, np.abs(scaled))), axis=0)
+        out[ok] = d
+    return out
+
+# === 3. FINDING VIEWS ===
+
+def denominator(panel, spec):
+    column, window = spec['column'], spec.get('window', 1)
+    den = panel[column]
+    return (den.rolling(window).sum() if window > 1 else den).to_numpy(dtype='float64')
+
+def find_views(panel, freq):
+    """
+    Columns of one frequency panel that can be derived from others.
+    Returns {"views": {label: view}, "denominators": {key: {"column", "window"}}}, where a
+    view is {"kind": "share", "level": label, "denominator": key, "patch": {date: value}}
+    or {"kind": "alias", "of": label}. Shares published rounded carry "decimals" and are
+    rounded the same way; the patch holds the few published points the derivation
+    cannot produce (None where the published series has no value).
+    """
+    columns = list(panel.columns)
+    present = set(columns)
+    views, used = {}, {}
+
+    # Exact duplicates first, so a share's level twin is never itself a view
+    for label in columns:
+        stem, unit = split_label(label)
+        m = ALIAS_RE.match(unit)
+        base = f"{stem} ({m.group('unit')})" if m else None
+        if base in present and panel[label].equals(panel[base]):
+            views[label] = {"kind": "alias", "of": base}
+
+    shares, levels = [], []
+    for label in columns:
+        stem, unit = split_label(label)
+        if unit != SHARE_UNIT:
+            continue
+        level = next((f"{stem} ({u})" for u in LEVEL_UNITS if f"{stem} ({u})" in present), None)
+        if level and level not in views:
+            shares.append(label)
+            levels.append(level)
+    if not shares:
+        return {"views": views, "denominators": {}}
+
+    published = panel[shares].to_numpy(dtype='float64')
+    level_values = panel[levels].to_numpy(dtype='float64')
+    # Half a unit in the last published digit of the share, the level and GDP
+    share_decimals = decimals(published)
+    share_slack = 0.5 * 10.0 ** -share_decimals
+    rounded = share_decimals < 6
+    scale = 10.0 ** share_decimals
+    level_slack = 0.5 * 10.0 ** -decimals(level_values)
+    pending = np.ones(len(shares), dtype=bool)
+    for key, prefix, window in DENOMINATORS.get(freq, []):
+        column = _find(columns, prefix)
+        if column is None or not pending.any():
+            continue
+        spec = {"column": column, "window": window}
+        den = denominator(panel, spec)[:, None]
+        den_slack = 0.5 * 10.0 ** -decimals(panel[[column]].to_numpy(dtype='float64'))[0] * window
+        with np.errstate(invalid='ignore', divide='ignore'):
+            implied = level_values / den * 100
+            bound = share_slack + (level_slack * 100 + np.abs(implied) * den_slack) / np.abs(den) + 1e-9
+            close = np.isnan(published) | np.isnan(implied) | (np.abs(implied - published) <= bound)
+            off = rounded & ~np.isnan(published) & (np.abs(np.round(implied * scale) / scale - published) > 1e-9 / scale)
+        # Coverage differences and rounding ties are patched point by point, so a view
+        # reproduces every published point exactly
+        differ = (np.isnan(published) != np.isnan(implied)) | off
+        ok = (pending & np.all(close, axis=0) & (differ.sum(axis=0) <= MAX_PATCH)
+              & ~np.all(np.isnan(published), axis=0))
+        dates = pd.DatetimeIndex(panel.index).strftime('%Y-%m-%d')
+        for j in np.flatnonzero(ok):
+            patch = {dates[i]: (None if np.isnan(published[i, j]) else float(published[i, j]))
+                     for i in np.flatnonzero(differ[:, j])}
+            views[shares[j]] = {"kind": "share", "level": levels[j], "denominator": key, "patch": patch}
+            if rounded[j]:
+                views[shares[j]]["decimals"] = int(share_decimals[j])
+            used[key] = spec
+        pending &= ~ok
+    return {"views": views, "denominators": used}
+
+# === 4. DERIVING ===
+
+def required(labels, spec):
+    """Stored columns needed to produce the given labels."""
+    views, dens = spec["views"], spec["denominators"]
+    need = []
+    for label in labels:
+        view = views.get(label)
+        if view is None:
+            need.append(label)
+        elif view["kind"] == "alias":
+            need.append(view["of"])
+        elif view["kind"] == "per_capita":
+            need.append(view["level"])
+        else:
+            need += [view["level"], dens[view["denominator"]]["column"]]
+    return list(dict.fromkeys(need))
+
+def derive(stored, labels, spec, cache=None, pop=None):
+    """
+    {label: values} for the requested views, from a frame holding their stored inputs.
+    Shares are one matrix division per denominator and per-capita views one division
+    by `pop` (see population()); results are kept in `cache` (a dict owned by the
+    caller, one per stored frame) so repeated requests cost nothing.
+    """
+    views, dens = spec["views"], spec["denominators"]
+    cache = {} if cache is None else cache
+    todo = [l for l in dict.fromkeys(labels) if l in views and l not in cache]
+    by_den, heads = {}, []
+    for label in todo:
+        if views[label]["kind"] == "alias":
+            cache[label] = stored[views[label]["of"]].to_numpy(dtype='float64')
+        elif views[label]["kind"] == "per_capita":
+            heads.append(label)
+        else:
+            by_den.setdefault(views[label]["denominator"], []).append(label)
+    if heads:
+        block = per_capita(stored, [views[l]["level"] for l in heads], pop)
+        for j, label in enumerate(heads):
+            cache[label] = block[:, j]
+    dates = pd.DatetimeIndex(stored.index).strftime('%Y-%m-%d') if by_den else None
+    for key, group in by_den.items():
+        den = denominator(stored, dens[key])[:, None]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            block = stored[[views[l]["level"] for l in group]].to_numpy(dtype='float64') / den * 100
+        for j, label in enumerate(group):
+            if "decimals" in views[label]:
+                scale = 10.0 ** views[label]["decimals"]
+                block[:, j] = np.round(block[:, j] * scale) / scale
+            for date, value in views[label].get("patch", {}).items():
+                block[dates == date, j] = np.nan if value is None else value
+            cache[label] = block[:, j]
+    return {label: cache[label] for label in labels if label in views}
+
+def expand(stored, spec, columns=None, cache=None, pop=None):
+    """
+    Stored frame -> frame with the requested columns (every stored column and view
+    by default) in the requested order, views filled in.
+    """
+    views = spec["views"]
+    wanted = list(columns) if columns is not None else list(stored.columns) + list(views)
+    wanted = [c for c in wanted if c in views or c in stored.columns]
+    derived = derive(stored, wanted, spec, cache, pop)
+    position = {c: i for i, c in enumerate(stored.columns)}
+    base = stored.to_numpy(dtype='float64')
+    out = np.empty((len(stored), len(wanted)))
+    for j, c in enumerate(wanted):
+        out[:, j] = derived[c] if c in views else base[:, position[c]]
+    return pd.DataFrame(out, index=stored.index, columns=wanted)
+
+# === 5. PER CAPITA ===
+
+def population(annual):
+    """Persons per year (indexed by year), or None when GDP / GDP per capita are missing."""
+    gdp, per_capita = _find(annual.columns, POPULATION['gdp']), _find(annual.columns, POPULATION['per_capita'])
+    if gdp is None or per_capita is None:
+        return None
+    with np.errstate(invalid='ignore', divide='ignore'):
+        pop = annual[gdp] * POPULATION['scale'] / annual[per_capita]
+    pop.index = pd.DatetimeIndex(annual.index).year
+    return pop.dropna()
+
+def per_capita(panel, levels, pop):
+    """Euro levels (millions) divided by that year's population: euros per person, one column per level."""
+    persons = pop.reindex(pd.DatetimeIndex(panel.index).year).to_numpy(dtype='float64')[:, None]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return panel[levels].to_numpy(dtype='float64') * POPULATION['scale'] / persons
+
+def per_capita_views(columns, labels):
+    """{'Source | Category (Per capita)': view} for the requested labels whose level twin is in `labels`."""
+    present = set(labels)
+    views = {}
+    for label in columns:
+        stem, unit = split_label(label)
+        level = next((f"{stem} ({u})" for u in LEVEL_UNITS if f"{stem} ({u})" in present), None)
+        if unit == PER_CAPITA_UNIT and level:
+            views[label] = {"kind": "per_capita", "level": level}
+    return views
+
+# === 6. BUNDLE READING ===
+
+def bundle_population(source, catalog, cache=None):
+    """Annual population from the bundle's GDP and GDP per capita (None when either is missing)."""
+    annual = catalog['freqs'].get('Annual')
+    if annual is None:
+        return None
+    labels = annual.get('labels', annual['columns'])
+    inputs = [_find(labels, POPULATION[key]) for key in ('gdp', 'per_capita')]
+    if None in inputs:
+        return None
+    return population(read_bundle(source, ['Annual'], inputs, cache)['Annual'])
+
+def read_bundle(source, freqs=None, columns=None, cache=None):
+    """
+    {freq: Date-indexed frame} from the loader's Arrow bundle, views filled in.
+    With `columns`, only their stored inputs are decoded (memory-mapped when local);
+    requested '... (Per capita)' labels are derived from their level twin.
+    """
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    local = isinstance(source, str)
+    catalog = json.loads(pa.ipc.open_file(source if local else pa.BufferReader(source)).schema.metadata[b'catalog'])
+    out, pop = {}, None
+    for freq, info in catalog['freqs'].items():
+        if freqs is not None and freq not in freqs:
+            continue
+        labels = info.get('labels', info['columns'])
+        heads = per_capita_views(columns or [], labels)
+        if heads and pop is None:
+            pop = bundle_population(source, catalog, cache)
+        if pop is None:
+            heads = {}
+        spec = {"views": {**info.get('views', {}), **heads}, "denominators": info.get('denominators', {})}
+        wanted = [c for c in (columns or labels) if c in set(labels) or c in heads]
+        stored = [c for c in required(wanted, spec) if c in set(info['columns'])]
+        table = feather.read_table(source if local else pa.BufferReader(source), columns=['Date'] + stored,
+                                   memory_map=local)
+        frame = table.slice(info['offset'], info['rows']).to_pandas().set_index('Date')
+        # Cached views belong to one bundle version
+        views_cache = None if cache is None else cache.setdefault((freq, catalog.get('created')), {})
+        out[freq] = expand(frame, spec, wanted, views_cache, pop)
+    return out
+
+# === 7. MAIN ===
+
+if __name__ == "__main__":
+    freqs = sys.argv[1:] or ['Annual', 'Quarterly']
+    sheets = pd.read_excel(FILE_NAME, sheet_name=freqs, engine='openpyxl')
+    for freq, df in sheets.items():
+        df['Date'] = pd.to_datetime(df['Date'])
+        panel = df.sort_values('Date').set_index('Date')
+        spec = find_views(panel, freq)
+        kinds = pd.Series([v["kind"] for v in spec["views"].values()]).value_counts().to_dict()
+        stored = panel.drop(columns=list(spec["views"]))
+        rebuilt = expand(stored, spec, list(panel.columns))
+        gap = (rebuilt - panel).abs().max().max()
+        print(f"🧮 {freq}: {panel.shape[1]} columns -> {stored.shape[1]} stored, views {kinds} "
+              f"(denominators: {', '.join(spec['denominators']) or 'none'}), max |view - published| = {gap:.4f}")
+        kept = [c for c in panel.columns if split_label(c)[1] == SHARE_UNIT and c not in spec["views"]]
+        for c in kept:
+            print(f"    stored as published: {c}")
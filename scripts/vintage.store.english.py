@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+VINTAGE STORE (Delta-compressed release history of the wide panels)
+Each loader run records only the cells that changed since the previous release.
+A full snapshot is written every SNAPSHOT_EVERY releases to bound replay cost.
+Sheets missing from a run (failed, quarantined or skipped workbooks) are carried
+forward at their last recorded values instead of being recorded as deletions.
+
+Usage:
+    python vintage.store.english.py list
+    python vintage.store.english.py as-of 2025-06-30 [out.xlsx]
+"""
+
+import os
+import sys
+import json
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+# --- 1. CONFIGURATION ---
+VINTAGE_DIR = "/Users/thodoreskourtales/dyn.macro/project.1/vintages/"
+SNAPSHOT_EVERY = 12
+MANIFEST = "manifest.json"
+SHEETS = "sheets.json"    # "fname::sheet" -> series labels, as last seen
+KEY = ["freq", "Date", "series"]
+
+# === 2. LONG FORMAT HELPERS ===
+
+def to_long(panels):
+    # {freq: wide frame indexed by Date} -> value Series on (freq, Date, series), NaN cells dropped
+    parts = []
+    for freq, wide in panels.items():
+        vals = wide.to_numpy(dtype="float64")
+        r, c = np.nonzero(~np.isnan(vals))
+        parts.append(pd.DataFrame({
+            "freq": freq,
+            "Date": pd.DatetimeIndex(wide.index)[r],
+            "series": np.asarray(wide.columns, dtype=object)[c],
+            "value": vals[r, c],
+        }))
+    if not parts:
+        return pd.Series(dtype="float64", index=pd.MultiIndex.from_arrays([[], [], []], names=KEY))
+    s = pd.concat(parts, ignore_index=True).set_index(KEY)["value"]
+    return s[~s.index.duplicated()]
+
+def to_wide(long):
+    panels = {}
+    for freq, part in long.groupby(level="freq", sort=False):
+        wide = part.droplevel("freq").unstack("series").sort_index()
+        wide.columns.name = None
+        panels[freq] = wide
+    return panels
+
+def _save(long, path):
+    df = long.reset_index()
+    for c in ["freq", "series"]:
+        df[c] = df[c].astype("category")
+    df.to_pickle(path, compression="gzip")
+
+def _load(path):
+    df = pd.read_pickle(path, compression="gzip")
+    for c in ["freq", "series"]:
+        df[c] = df[c].astype(object)
+    return df.set_index(KEY)["value"]
+
+# === 3. MANIFEST + REPLAY ===
+
+def load_manifest(store_dir=VINTAGE_DIR):
+    try:
+        with open(os.path.join(store_dir, MANIFEST), encoding="utf-8") as f: return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+def load_sheets(store_dir=VINTAGE_DIR):
+    try:
+        with open(os.path.join(store_dir, SHEETS), encoding="utf-8") as f: return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def apply_delta(state, delta):
+    # A NaN in the delta marks a cell that disappeared in that release
+    kept = state[~state.index.isin(delta.index)]
+    return pd.concat([kept, delta.dropna()]).sort_index()
+
+def state_at(manifest, pos, store_dir=VINTAGE_DIR):
+    """Replays from the last snapshot at or before manifest[pos]."""
+    start = max(i for i in range(pos + 1) if manifest[i]["kind"] == "snapshot")
+    state = _load(os.path.join(store_dir, manifest[start]["file"]))
+    for entry in manifest[start + 1:pos + 1]:
+        state = apply_delta(state, _load(os.path.join(store_dir, entry["file"])))
+    return state
+
+def record_vintage(panels, sheet_hashes, sheet_columns, store_dir=VINTAGE_DIR, released=None):
+    """
+    Stores one release. Sheets whose dedup content hash equals the previous
+    release are skipped without diffing; the rest are compared cell by cell.
+    Sheets of the previous release that are not in sheet_hashes (the workbook
+    failed or was skipped this run) keep their last values and hash.
+    Returns the manifest entry, or None when nothing changed.
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    manifest = load_manifest(store_dir)
+    released = released or datetime.now().isoformat(timespec="seconds")
+    new = to_long(panels)
+
+    prev_hashes = manifest[-1]["hashes"] if manifest else {}
+    old = state_at(manifest, len(manifest) - 1, store_dir) if manifest else None
+    # Sheets of the last release missing from this run: their series are carried, not deleted
+    absent = sorted(set(prev_hashes) - set(sheet_hashes))
+    prev_sheets = load_sheets(store_dir)
+    present = {lbl for cols in sheet_columns.values() for lbl in cols}
+    carried = {lbl for key in absent for lbl in prev_sheets.get(key, [])}
+    legacy = {key.split("::")[0] for key in absent if key not in prev_sheets}
+    if legacy:
+        # Stores written before the sheet map: labels start with "fname | "
+        carried |= {lbl for lbl in old.index.unique("series") if lbl.split(" | ")[0] in legacy}
+    carried -= present
+
+    if manifest and len(manifest) % SNAPSHOT_EVERY != 0:
+        skip = carried | {lbl for key, h in sheet_hashes.items() if prev_hashes.get(key) == h
+                          for lbl in sheet_columns.get(key, [])}
+        if skip:
+            old = old[~old.index.get_level_values("series").isin(skip)]
+            new = new[~new.index.get_level_values("series").isin(skip)]
+        old, new = old.align(new, join="outer")
+        changed = ~((old == new) | (old.isna() & new.isna()))
+        delta = new[changed]
+        if delta.empty:
+            return None
+        kind, payload = "delta", delta
+    else:
+        # A snapshot must still hold the carried sheets: replay starts from it
+        kind, payload = "snapshot", new
+        if carried:
+            payload = pd.concat([new, old[old.index.get_level_values("series").isin(carried)]]).sort_index()
+
+    fname = f"{len(manifest):05d}_{kind}.pkl.gz"
+    _save(payload, os.path.join(store_dir, fname))
+    hashes = {**{key: prev_hashes[key] for key in absent}, **sheet_hashes}
+    entry = {"released": released, "kind": kind, "file": fname, "cells": int(len(payload)),
+             "hashes": hashes, "carried": absent}
+    manifest.append(entry)
+    with open(os.path.join(store_dir, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    with open(os.path.join(store_dir, SHEETS), "w", encoding="utf-8") as f:
+        json.dump({**{key: prev_sheets[key] for key in absent if key in prev_sheets}, **sheet_columns},
+                  f, ensure_ascii=False)
+    return entry
+
+def panel_as_of(as_of, store_dir=VINTAGE_DIR):
+    """{freq: wide frame} exactly as it was published at date as_of (None if before the first release)."""
+    manifest = load_manifest(store_dir)
+    cutoff = pd.Timestamp(as_of)
+    hits = [i for i, e in enumerate(manifest) if pd.Timestamp(e["released"]) <= cutoff]
+    if not hits:
+        return None
+    return to_wide(state_at(manifest, hits[-1], store_dir))
+
+# === 4. MAIN ===
+
+if __name__ == "__main__":
+    cmd = sys.argv[1] if len(sys.argv) > 1 else "list"
+    if cmd == "list":
+        for e in load_manifest():
+            carried = f"  ({len(e['carried'])} sheets carried)" if e.get("carried") else ""
+            print(f"{e['released']}  {e['kind']:<8} {e['cells']:>8} cells  {e['file']}{carried}")
+    elif cmd == "as-of" and len(sys.argv) > 2:
+        panels = panel_as_of(sys.argv[2])
+        if panels is None:
+            sys.exit(f"No release on or before {sys.argv[2]}.")
+        for freq, wide in panels.items():
+            print(f"   {freq}: {wide.shape[0]} rows x {wide.shape[1]} series")
+        if len(sys.argv) > 3:
+            with pd.ExcelWriter(sys.argv[3], engine="openpyxl") as writer:
+                for freq, wide in panels.items():
+                    wide.rename_axis("Date").reset_index().to_excel(writer, sheet_name=freq, index=False)
+            print(f"✅ Saved: {sys.argv[3]}")
+    else:
+        sys.exit(__doc__)